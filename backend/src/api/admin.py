@@ -1,13 +1,16 @@
 import sys
 
-from fastapi import APIRouter, Body
+from fastapi import APIRouter, Body, Query, Request, Response
 from pathlib import Path
 
 from src.dependencies.auth import UserRoleDep, PaginationDep
-from src.dependencies.db import DBDep
+from src.dependencies.db import DBDep, DBReadDep
+from src.schemas.auth import PasswordHasherStats
 from src.schemas.products import Product, ProductPatch
+from src.services.auth import AuthService
 from src.services.products import ProductService
 from src.services.reviews import ReviewsService
+from src.utils.etag import apply_etag
 
 sys.path.append(str(Path(__file__).parent.parent))
 
@@ -17,12 +20,34 @@ router = APIRouter(prefix="/admin", tags=["Админка"])
 @router.get("/reviews")
 async def get_reviews(
     is_super: UserRoleDep,
-    db: DBDep,
+    db: DBReadDep,
     pagination: PaginationDep,
 ):
     return await ReviewsService().admin_get_reviews(is_super, db, pagination)
 
 
+@router.get(
+    "/reviews/search",
+    summary="Полнотекстовый поиск по всем отзывам",
+    description="То же, что /reviews/search, но без фильтра по экзамену и только для "
+    "суперпользователя. Курсор следующей страницы - в заголовке X-Next-Cursor",
+)
+async def search_reviews(
+    is_super: UserRoleDep,
+    db: DBReadDep,
+    pagination: PaginationDep,
+    response: Response,
+    q: str = Query(min_length=1, max_length=200),
+    cursor: str | None = Query(None),
+):
+    reviews, next_cursor = await ReviewsService().admin_search_reviews(
+        q, is_super, db, pagination, cursor
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return reviews
+
+
 @router.delete(
     "/reviews/{review_id}",
     summary="Удаление отзыва",
@@ -43,14 +68,21 @@ async def delete_review(
     responses={
         404: {"description": "Продукты не найдены"},
         200: {"description": "Список продуктов"},
+        304: {"description": "Каталог не изменился (If-None-Match)"},
     },
 )
-async def get_products(is_super: UserRoleDep, db: DBDep):
+async def get_products(
+    is_super: UserRoleDep, db: DBReadDep, request: Request, response: Response
+):
+    etag = await ProductService().get_products_etag(is_super=is_super, db=db)
+    not_modified = apply_etag(request, response, etag, "private, no-cache")
+    if not_modified:
+        return not_modified
     return await ProductService().get_products(is_super=is_super, db=db)
 
 
 @router.get("/products/{slug}", summary="Определенный продукт")
-async def get_product(is_super: UserRoleDep, db: DBDep, slug: str):
+async def get_product(is_super: UserRoleDep, db: DBReadDep, slug: str):
     return await ProductService().get_product(slug=slug, is_super=is_super, db=db)
 
 
@@ -120,3 +152,15 @@ async def update_product(
     return await ProductService().edit_product(
         data=data, slug=slug, is_super=is_super, db=db
     )
+
+
+@router.get(
+    "/metrics/password-hasher",
+    response_model=PasswordHasherStats,
+    summary="Метрики пула хеширования паролей",
+    description="Размер пула bcrypt, число выполняющихся и ожидающих вызовов, "
+    "счётчики успешных, упавших и отклонённых при переполнении вызовов и среднее "
+    "время успешного вызова с момента запуска процесса. Только для суперпользователя",
+)
+async def get_password_hasher_stats(is_super: UserRoleDep):
+    return AuthService().get_password_hasher_stats(is_super)
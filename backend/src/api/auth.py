@@ -21,11 +21,16 @@ register = APIRouter(prefix="/auth/register", tags=["Регистрация"])
 reset = APIRouter(prefix="/auth/reset", tags=["Сброс пароля"])
 
 
+def get_client_ip(request: Request) -> str | None:
+    return request.client.host if request.client else None
+
+
 @register.post(
     "/phone_code", summary="Отправка кода подтверждения регистрации на телефон"
 )
 async def send_phone_code(
     db: DBDep,
+    request: Request,
     data: PhoneInput = Body(
         openapi_examples={
             "reg_phone_example_1": {
@@ -39,7 +44,9 @@ async def send_phone_code(
         }
     ),
 ):
-    await AuthService().send_registration_phone_code(data=data, db=db)
+    await AuthService().send_registration_phone_code(
+        data=data, db=db, client_ip=get_client_ip(request)
+    )
     return {"status": "Ok, код отправлен"}
 
 
@@ -48,6 +55,7 @@ async def send_phone_code(
 )
 async def send_email_code(
     db: DBDep,
+    request: Request,
     data: EmailInput = Body(
         openapi_examples={
             "reg_email_example_1": {
@@ -61,7 +69,9 @@ async def send_email_code(
         }
     ),
 ):
-    await AuthService().send_registration_email_code(data=data, db=db)
+    await AuthService().send_registration_email_code(
+        data=data, db=db, client_ip=get_client_ip(request)
+    )
     return {"status": "Ok, код отправлен"}
 
 
@@ -114,6 +124,7 @@ async def verify_register(
 )
 async def send_reset_code(
     db: DBDep,
+    request: Request,
     data: PhoneInput = Body(
         openapi_examples={
             "send_code_for_phone_reset": {
@@ -125,7 +136,9 @@ async def send_reset_code(
         }
     ),
 ):
-    await AuthService().send_reset_phone_code(data, db=db)
+    await AuthService().send_reset_phone_code(
+        data, db=db, client_ip=get_client_ip(request)
+    )
     return {"status": "Ok, код сброса пароля отправлен"}
 
 
@@ -1,9 +1,13 @@
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Query, Request
 from fastapi.responses import JSONResponse
 
 from src.dependencies.auth import UserIdDep
 from src.dependencies.db import DBDep
-from src.schemas.payments import CreatePaymentRequest, CreatePaymentResponse
+from src.schemas.payments import (
+    CreatePaymentRequest,
+    CreatePaymentResponse,
+    PaymentStatusResponse,
+)
 from src.services.payments import PaymentsService
 
 router = APIRouter(prefix="/payments", tags=["Платежи"])
@@ -19,6 +23,22 @@ async def create_payment_endpoint(
     return data
 
 
+@router.get(
+    "/{payment_id}/status",
+    response_model=PaymentStatusResponse,
+    summary="Статус платежа и ссылка на оплату",
+)
+async def get_payment_status(
+    payment_id: str,
+    db: DBDep,
+    user_id: UserIdDep,
+    wait: int = Query(0, ge=0, le=30, description="Сколько секунд ждать ссылку"),
+):
+    return await PaymentsService().get_payment_status(
+        payment_id=payment_id, user_id=user_id, db=db, wait=wait
+    )
+
+
 @router.post("/webhook")
 async def yookassa_webhook(request: Request, db: DBDep):
     payload = await request.json()
@@ -1,11 +1,12 @@
 import sys
 from pathlib import Path
 
-from fastapi import APIRouter, Body
+from fastapi import APIRouter, Body, Request, Response
 
 from src.dependencies.auth import UserIdDep
-from src.dependencies.db import DBDep
+from src.dependencies.db import DBDep, DBReadDep
 from src.schemas.users import UserUpdate
+from src.utils.etag import apply_etag
 
 # Импорты для возвращаемых эндпоинтов
 from src.services.reviews import ReviewsService
@@ -22,13 +23,21 @@ router = APIRouter(prefix="/me", tags=["Персональная информа
 @router.get(
     "/info",
     summary="Получение данных о пользователе",
-    description="Получение всех данных о пользователе в личном кабинете: id, имя, телефон, почта, роль",
+    description="Получение всех данных о пользователе в личном кабинете: id, имя, телефон, почта, роль. "
+    "При совпадении If-None-Match с ETag возвращается 304 без тела",
 )
 async def get_me(
-    db: DBDep,
+    db: DBReadDep,
     user_id: UserIdDep,
+    request: Request,
+    response: Response,
 ):
-    return await InfoService().get_user_info(user_id=user_id, db=db)
+    user = await InfoService().get_user_info(user_id=user_id, db=db)
+    etag = InfoService.get_user_info_etag(user)
+    not_modified = apply_etag(request, response, etag, "private, no-cache")
+    if not_modified:
+        return not_modified
+    return user
 
 
 @router.patch("/info", summary="Изменение данных о пользователе")
@@ -55,13 +64,24 @@ async def update_data(
     summary="Получение отзывов авторизованного пользователя",
     description="Получает отзывы авторизованного пользователя.",
 )
-async def get_current_user_reviews(db: DBDep, user_id: UserIdDep):
+async def get_current_user_reviews(db: DBReadDep, user_id: UserIdDep):
     return await ReviewsService().get_my_reviews(user_id=user_id, db=db)
 
 
 # Возвращаем эндпоинт для получения покупок пользователя
-@router.get("/purchases", summary="Получение всех покупок пользователя")
-async def get_user_purchases(user_id: UserIdDep, db: DBDep):
+@router.get(
+    "/purchases",
+    summary="Получение всех покупок пользователя",
+    description="ETag считается по индексу покупок и версии каталога продуктов; "
+    "при совпадении If-None-Match возвращается 304 до основного запроса",
+)
+async def get_user_purchases(
+    user_id: UserIdDep, db: DBReadDep, request: Request, response: Response
+):
+    etag = await PaymentsService().get_purchases_etag(user_id=user_id, db=db)
+    not_modified = apply_etag(request, response, etag, "private, no-cache")
+    if not_modified:
+        return not_modified
     return await PaymentsService().get_purchases(user_id=user_id, db=db)
 
 
@@ -70,6 +90,6 @@ async def get_user_purchases(user_id: UserIdDep, db: DBDep):
     "/purchases/{slug}",
     summary="Получение информации о купленном продукте (проверка покупки)",
 )
-async def get_purchased_product_info(slug: str, db: DBDep, user_id: UserIdDep):
+async def get_purchased_product_info(slug: str, db: DBReadDep, user_id: UserIdDep):
     # Этот метод в InfoService проверяет, что продукт куплен, и возвращает информацию о продукте
     return await InfoService().get_product(slug=slug, user_id=user_id, db=db)
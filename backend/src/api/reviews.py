@@ -1,32 +1,91 @@
 import sys
 
-from fastapi import APIRouter, Body
+from fastapi import APIRouter, Body, Query, Request, Response
 from pathlib import Path
 
 from src.dependencies.auth import UserIdDep, PaginationDep
-from src.dependencies.db import DBDep
+from src.dependencies.db import DBDep, DBReadDep
 from src.schemas.reviews import (
     ReviewAddRequest,
     ReviewPatch,
+    ReviewStats,
 )
 from src.services.reviews import ReviewsService
+from src.utils.etag import apply_etag
 
 sys.path.append(str(Path(__file__).parent.parent))
 
 router = APIRouter(prefix="/reviews", tags=["Отзывы"])
 
 
+@router.get(
+    "/search",
+    summary="Полнотекстовый поиск по отзывам",
+    description="Ищет по тексту отзывов (морфология русского языка, синтаксис как в "
+    "поисковиках: фразы в кавычках, OR, исключение через минус). Результаты "
+    "упорядочены по релевантности. Параметр exam_type (ege или oge) опционален. "
+    "Следующая страница запрашивается по курсору из заголовка X-Next-Cursor, "
+    "параметр page не используется",
+)
+async def search_reviews(
+    db: DBReadDep,
+    pagination: PaginationDep,
+    response: Response,
+    q: str = Query(min_length=1, max_length=200),
+    exam_type: str | None = Query(None),
+    cursor: str | None = Query(None),
+):
+    reviews, next_cursor = await ReviewsService().search_reviews(
+        q, db, pagination, cursor, exam_type
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return reviews
+
+
 @router.get(
     "/{exam_type}",
     summary="Получение отзывов всех пользователей по типу экзамена",
     description="Принимает на вход тип экзамена (например, ЕГЭ или ОГЭ) как часть пути. "
     "Также принимает параметры пагинации per_page и page. "
-    "Эти параметры опциональны, но на фронте мы реализуем именно такой механизм",
+    "Эти параметры опциональны, но на фронте мы реализуем именно такой механизм. "
+    "Если страница заполнена, в заголовке X-Next-Cursor возвращается курсор следующей страницы. "
+    "При передаче cursor параметр page игнорируется, а выборка идёт по ключу (created_at, id) "
+    "без OFFSET, поэтому глубокая прокрутка не замедляется. "
+    "Ответ содержит слабый ETag; при совпадении If-None-Match возвращается 304 "
+    "без обращения к БД. Промах кэша читается с основной БД, чтобы ответ не был "
+    "старше версии в ETag; с реплики список читается, только пока Redis недоступен",
 )
 async def get_reviews_by_exam_type(
-    exam_type: str, db: DBDep, pagination: PaginationDep
+    exam_type: str,
+    db: DBReadDep,
+    pagination: PaginationDep,
+    request: Request,
+    response: Response,
+    cursor: str | None = Query(None),
 ):
-    return await ReviewsService().get_reviews(exam_type, db, pagination)
+    etag = await ReviewsService().get_reviews_etag(exam_type, pagination, cursor)
+    not_modified = apply_etag(request, response, etag)
+    if not_modified:
+        return not_modified
+    reviews = await ReviewsService().get_reviews(
+        exam_type, db, pagination, cursor, etag_issued=etag is not None
+    )
+    next_cursor = ReviewsService.get_next_cursor(reviews, pagination)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return reviews
+
+
+@router.get(
+    "/{exam_type}/stats",
+    response_model=ReviewStats,
+    summary="Статистика отзывов по типу экзамена",
+    description="Количество отзывов, средний результат и распределение результатов. "
+    "Читается из заранее посчитанного агрегата, а не из таблицы отзывов",
+)
+async def get_reviews_stats(exam_type: str, db: DBReadDep):
+    return await ReviewsService().get_stats(exam_type, db)
 
 
 @router.post(
@@ -28,23 +28,76 @@ class _SettingsStore:
                 DB_PASS: str
                 DB_HOST: str
                 DB_PORT: int
+                DB_REPLICA_HOST: str | None = None
+                DB_REPLICA_PORT: int | None = None
+                DB_POOL_SIZE: int = 5
+                DB_MAX_OVERFLOW: int = 10
+                DB_POOL_TIMEOUT: int = 30
+                DB_POOL_RECYCLE: int = 1800
+                DB_POOL_PRE_PING: bool = True
+                DB_STATEMENT_CACHE_SIZE: int = 100
+                DB_STATEMENT_TIMEOUT_MS: int = 0  # 0 - без ограничения
+                DB_MAPPER_VALIDATE: bool = False  # полная валидация строк из БД
+                DB_BULK_CHUNK_SIZE: int = 1000
 
                 REDIS_HOST: str = "localhost"
                 REDIS_PORT: int = 6379
+                REDIS_MAX_CONNECTIONS: int = 50
+                REDIS_POOL_TIMEOUT: float = 5.0
+                REDIS_SOCKET_TIMEOUT: float = 2.0
+                REDIS_CONNECT_TIMEOUT: float = 2.0
+                REDIS_HEALTH_CHECK_INTERVAL: int = 30
+                REDIS_RETRIES: int = 1
+                REVIEWS_CACHE_EXPIRE_SECONDS: int = 300
+                REVIEW_STATS_RECONCILE_SECONDS: int = 3600  # 0 - не сверять
+                PRODUCTS_CACHE_EXPIRE_SECONDS: int = 60
+                PASSWORD_HASH_WORKERS: int = 2
+                PASSWORD_HASH_MAX_PENDING: int = 32
                 JWT_SECRET_KEY: str = "default_jwt_secret"
                 JWT_ALGORITHM: str = "HS256"
+                JWT_CACHE_SIZE: int = 10000
                 ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
                 JWT_REFRESH_SECRET_KEY: str = "default_jwt_refresh_secret"
                 REFRESH_TOKEN_EXPIRE_DAYS: int = 7
                 YOOKASSA_SHOP_ID: str = "default_shop_id"
                 YOOKASSA_SECRET_KEY: str = "default_yookassa_secret"
                 YOOKASSA_API_URL: str = "https://api.yookassa.ru/v3/payments"
+                YOOKASSA_TIMEOUT: float = 10.0
+                YOOKASSA_CONNECT_TIMEOUT: float = 5.0
+                YOOKASSA_MAX_CONNECTIONS: int = 20
+                YOOKASSA_MAX_KEEPALIVE_CONNECTIONS: int = 10
+                YOOKASSA_RETRIES: int = 2
+                YOOKASSA_RETRY_BACKOFF: float = 0.5
+                YOOKASSA_HTTP2: bool = False  # требует пакет h2 (httpx[http2])
+                PAYMENT_WORKERS_IN_PROCESS: bool = True
+                PAYMENT_OUTBOX_BATCH_SIZE: int = 10
+                PAYMENT_OUTBOX_POLL_INTERVAL: float = 1.0
+                PAYMENT_OUTBOX_MAX_ATTEMPTS: int = 5
+                PAYMENT_OUTBOX_LEASE_SECONDS: int = 60
+                PAYMENT_WEBHOOK_BATCH_SIZE: int = 50
+                PAYMENT_WEBHOOK_MAX_ATTEMPTS: int = 10
                 SMSRU_API_ID: int = 0
+                AUTH_CODE_QUOTA: int = 5
+                AUTH_CODE_IP_QUOTA: int = 20
+                AUTH_CODE_QUOTA_WINDOW_SECONDS: int = 3600
+                RATE_LIMIT_ENABLED: bool = True
+                RATE_LIMIT_DEFAULT_CAPACITY: int = 120
+                RATE_LIMIT_DEFAULT_PERIOD_SECONDS: int = 60
+                FRONTEND_SOURCE_DIR: str = "../frontend"
+                FRONTEND_DIST_DIR: str = "static_dist"  # без сборки фронт не раздаётся
 
                 @property
                 def DB_URL(self) -> str:
                     return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASS}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+                @property
+                def DB_REPLICA_URL(self) -> str | None:
+                    # Реплика необязательна: без неё чтение идёт в основную БД
+                    if self.DB_REPLICA_HOST is None:
+                        return None
+                    port = self.DB_REPLICA_PORT or self.DB_PORT
+                    return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASS}@{self.DB_REPLICA_HOST}:{port}/{self.DB_NAME}"
+
                 @property
                 def REDIS_URL(self) -> str:
                     return f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}"
@@ -1,17 +1,155 @@
+import time
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
 import redis.asyncio as redis
+from redis.asyncio.retry import Retry
+from redis.backoff import ExponentialBackoff
+from redis.exceptions import ConnectionError, TimeoutError
+
+# KEYS: ключ кулдауна, ключ кода, ключ квоты (zset), [ключ квоты IP (zset)]
+# ARGV: код, TTL кода, кулдаун, лимит квоты, окно квоты (мс), текущее время (мс),
+#       id события, [лимит квоты IP]
+# Возвращает {статус, секунд до следующей попытки}. Событие учитывается в квотах
+# только вместе с сохранением кода: отклонённый запрос не тратит ни одну квоту
+ACQUIRE_AND_STORE_CODE_SCRIPT = """
+local now = tonumber(ARGV[6])
+local window = tonumber(ARGV[5])
+local function window_retry(key, limit)
+    redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+    if redis.call('ZCARD', key) < limit then
+        return 0
+    end
+    local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+    return math.max(1, math.ceil((tonumber(oldest[2]) + window - now) / 1000))
+end
+local ttl = redis.call('TTL', KEYS[1])
+if ttl > 0 then
+    return {1, ttl}
+end
+local retry = window_retry(KEYS[3], tonumber(ARGV[4]))
+if retry > 0 then
+    return {1, retry}
+end
+if #KEYS > 3 then
+    retry = window_retry(KEYS[4], tonumber(ARGV[8]))
+    if retry > 0 then
+        return {2, retry}
+    end
+end
+for i = 3, #KEYS do
+    redis.call('ZADD', KEYS[i], now, ARGV[7])
+    redis.call('PEXPIRE', KEYS[i], window)
+end
+redis.call('SET', KEYS[1], '1', 'EX', ARGV[3])
+redis.call('SET', KEYS[2], ARGV[1], 'EX', ARGV[2])
+return {0, 0}
+"""
+
+# KEYS: ключ кода, ключ отметки о подтверждении
+# ARGV: введённый код, TTL отметки
+VERIFY_AND_MARK_SCRIPT = """
+local stored = redis.call('GET', KEYS[1])
+if not stored then
+    return -1
+end
+if stored ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[2], 'true', 'EX', ARGV[2])
+return 1
+"""
+
+# KEYS: ключ bucket (hash tokens/ts)
+# ARGV: ёмкость, скорость пополнения (токенов в мс), текущее время (мс)
+# Возвращает {разрешено (0/1), остаток токенов, мс до следующего токена}
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    retry_after = math.ceil((1 - tokens) / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate))
+return {allowed, math.floor(tokens), retry_after}
+"""
+
+CODE_NOT_FOUND = -1
+CODE_INVALID = 0
+CODE_VERIFIED = 1
+
+CODE_STORED = 0
+CODE_RATE_LIMITED = 1
+CODE_IP_RATE_LIMITED = 2
 
 
 # абстрактный класс
 class RedisManager:
-    def __init__(self, host: str, port: int):
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        max_connections: int = 50,
+        pool_timeout: float = 5.0,
+        socket_timeout: float = 2.0,
+        connect_timeout: float = 2.0,
+        health_check_interval: int = 30,
+        retries: int = 1,
+    ):
         self.host = host
         self.port = port
+        self.max_connections = max_connections
+        self.pool_timeout = pool_timeout
+        self.socket_timeout = socket_timeout
+        self.connect_timeout = connect_timeout
+        self.health_check_interval = health_check_interval
+        self.retries = retries
+        self.pool = None
         self.redis = None
+        self.pubsub_redis = None
 
     async def connect(self):
-        self.redis = await redis.Redis(
-            host=self.host, port=self.port, decode_responses=True
+        # BlockingConnectionPool ждёт свободное соединение не дольше pool_timeout,
+        # а таймауты сокета не дают зависшему Redis подвесить запрос
+        self.pool = redis.BlockingConnectionPool(
+            host=self.host,
+            port=self.port,
+            decode_responses=True,
+            max_connections=self.max_connections,
+            timeout=self.pool_timeout,
+            socket_timeout=self.socket_timeout,
+            socket_connect_timeout=self.connect_timeout,
+            health_check_interval=self.health_check_interval,
+            retry=Retry(ExponentialBackoff(cap=1, base=0.05), self.retries),
+            retry_on_error=[ConnectionError, TimeoutError],
+        )
+        self.redis = redis.Redis(connection_pool=self.pool)
+        # Подписка молчит сколько угодно долго, поэтому у неё свой клиент без
+        # socket_timeout: иначе listen() падает с TimeoutError на тихом канале
+        self.pubsub_redis = redis.Redis(
+            host=self.host,
+            port=self.port,
+            decode_responses=True,
+            socket_timeout=None,
+            socket_connect_timeout=self.connect_timeout,
+            health_check_interval=self.health_check_interval,
+        )
+        await self.redis.ping()
+        self._acquire_and_store_code = self.redis.register_script(
+            ACQUIRE_AND_STORE_CODE_SCRIPT
         )
+        self._verify_and_mark = self.redis.register_script(VERIFY_AND_MARK_SCRIPT)
+        self._token_bucket = self.redis.register_script(TOKEN_BUCKET_SCRIPT)
 
     async def set(self, key: str, value: str, expire: int = None):
         if expire:
@@ -19,9 +157,38 @@ class RedisManager:
         else:
             await self.redis.set(key, value)
 
+    async def set_if_absent(self, key: str, value: str) -> bool:
+        return bool(await self.redis.set(key, value, nx=True))
+
     async def get(self, key: str):
         return await self.redis.get(key)
 
+    async def mget(self, *keys: str) -> list[str | None]:
+        if not keys:
+            return []
+        return await self.redis.mget(keys)
+
+    async def mset(self, mapping: dict[str, str], expire: int = None):
+        """Записывает несколько ключей за один запрос; с expire - через pipeline."""
+        if not mapping:
+            return
+        if not expire:
+            await self.redis.mset(mapping)
+            return
+        async with self.pipeline() as pipe:
+            for key, value in mapping.items():
+                pipe.set(key, value, ex=expire)
+
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = True):
+        """
+        Команды внутри блока копятся и отправляются одним запросом при выходе
+        (в MULTI/EXEC, если transaction=True). При исключении ничего не отправляется.
+        """
+        async with self.redis.pipeline(transaction=transaction) as pipe:
+            yield pipe
+            await pipe.execute()
+
     async def ttl(self, key: str) -> int:
         """
         Возвращает оставшееся время жизни ключа в секундах.
@@ -30,9 +197,93 @@ class RedisManager:
         """
         return await self.redis.ttl(key)
 
+    async def incr(self, key: str) -> int:
+        return await self.redis.incr(key)
+
     async def delete(self, key: str):
         await self.redis.delete(key)
 
+    async def delete_many(self, *keys: str):
+        if keys:
+            await self.redis.delete(*keys)
+
+    async def acquire_and_store_code(
+        self,
+        limit_key: str,
+        code_key: str,
+        quota_key: str,
+        code: str,
+        code_expire: int,
+        cooldown: int,
+        quota_limit: int,
+        quota_window: int,
+        ip_quota_key: str | None = None,
+        ip_quota_limit: int = 0,
+    ) -> tuple[int, int]:
+        """
+        Атомарно проверяет кулдаун, квоту идентификатора и, если передан
+        ip_quota_key, квоту IP в том же окне, после чего сохраняет код.
+        Возвращает (CODE_STORED, 0) или (CODE_RATE_LIMITED | CODE_IP_RATE_LIMITED,
+        число секунд до следующей попытки).
+        """
+        now_ms = int(time.time() * 1000)
+        keys = [limit_key, code_key, quota_key]
+        args = [
+            code,
+            code_expire,
+            cooldown,
+            quota_limit,
+            quota_window * 1000,
+            now_ms,
+            f"{now_ms}:{uuid4().hex}",
+        ]
+        if ip_quota_key is not None:
+            keys.append(ip_quota_key)
+            args.append(ip_quota_limit)
+        status, retry_after = await self._acquire_and_store_code(keys=keys, args=args)
+        return int(status), int(retry_after)
+
+    async def verify_and_mark(
+        self, code_key: str, verified_key: str, code: str, expire: int
+    ) -> int:
+        """
+        Сверяет код и при совпадении ставит отметку о подтверждении за один запрос.
+        Возвращает CODE_VERIFIED, CODE_INVALID или CODE_NOT_FOUND.
+        """
+        return int(
+            await self._verify_and_mark(
+                keys=[code_key, verified_key], args=[code, expire]
+            )
+        )
+
+    async def token_bucket(
+        self, key: str, capacity: int, refill_per_second: float
+    ) -> tuple[bool, int, float]:
+        """
+        Забирает один токен из bucket ёмкостью capacity.
+        Возвращает (разрешено, остаток токенов, секунд до следующего токена).
+        """
+        allowed, remaining, retry_after_ms = await self._token_bucket(
+            keys=[key],
+            args=[capacity, refill_per_second / 1000, int(time.time() * 1000)],
+        )
+        return bool(allowed), int(remaining), int(retry_after_ms) / 1000
+
+    async def publish(self, channel: str, message: str) -> int:
+        return await self.redis.publish(channel, message)
+
+    async def subscribe(self, channel: str):
+        if self.pubsub_redis is None:
+            raise ConnectionError("Redis is not connected")
+        pubsub = self.pubsub_redis.pubsub()
+        await pubsub.subscribe(channel)
+        return pubsub
+
     async def close(self):
         if self.redis:
-            await self.redis.close()
+            await self.redis.aclose()
+            await self.pool.disconnect()
+            self.redis = None
+        if self.pubsub_redis:
+            await self.pubsub_redis.aclose()
+            self.pubsub_redis = None
@@ -0,0 +1,90 @@
+import asyncio
+
+import httpx
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class YooKassaClient:
+    """
+    Общий httpx.AsyncClient для API ЮKassa с пулом keep-alive соединений.
+    Все запросы к ЮKassa отправляются с Idempotence-Key, поэтому их безопасно
+    повторять при сетевых ошибках и ответах 429/5xx.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        shop_id: str,
+        secret_key: str,
+        timeout: float,
+        connect_timeout: float,
+        max_connections: int,
+        max_keepalive_connections: int,
+        retries: int,
+        retry_backoff: float,
+        http2: bool = False,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.base_url = base_url
+        self.shop_id = shop_id
+        self.secret_key = secret_key
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.http2 = http2
+        self.transport = transport
+        self.client: httpx.AsyncClient | None = None
+
+    async def connect(self):
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                auth=(self.shop_id, self.secret_key),
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+                transport=self.transport,
+            )
+
+    async def close(self):
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    async def _post(self, url: str, json: dict, idempotence_key: str) -> httpx.Response:
+        if self.client is None:
+            await self.connect()
+        headers = {
+            "Content-Type": "application/json",
+            "Idempotence-Key": idempotence_key,
+        }
+        for attempt in range(self.retries + 1):
+            is_last_attempt = attempt == self.retries
+            try:
+                response = await self.client.post(url, json=json, headers=headers)
+            except httpx.TransportError:
+                if is_last_attempt:
+                    raise
+            else:
+                if (
+                    response.status_code not in RETRYABLE_STATUS_CODES
+                    or is_last_attempt
+                ):
+                    return response
+            await asyncio.sleep(self.retry_backoff * 2**attempt)
+
+    async def create_payment(
+        self, payload: dict, idempotence_key: str
+    ) -> httpx.Response:
+        return await self._post(self.base_url, payload, idempotence_key)
+
+    async def capture_payment(
+        self, payment_id: str, idempotence_key: str
+    ) -> httpx.Response:
+        return await self._post(
+            f"{self.base_url}/{payment_id}/capture", {}, idempotence_key
+        )
@@ -1,4 +1,6 @@
+import asyncio
 from functools import lru_cache
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     async_sessionmaker,
@@ -11,14 +13,57 @@ from sqlalchemy.pool.impl import NullPool
 from src.config import settings
 
 
+def get_connect_args() -> dict:
+    connect_args = {"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        connect_args["server_settings"] = {
+            "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)
+        }
+    return connect_args
+
+
+def create_pooled_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=get_connect_args(),
+    )
+
+
 @lru_cache(maxsize=1)
 def get_engine() -> AsyncEngine:
-    return create_async_engine(settings.DB_URL)
+    return create_pooled_engine(settings.DB_URL)
+
+
+@lru_cache(maxsize=1)
+def get_replica_engine() -> AsyncEngine:
+    if settings.DB_REPLICA_URL is None:
+        return get_engine()
+    return create_pooled_engine(settings.DB_REPLICA_URL)
 
 
 @lru_cache(maxsize=1)
 def get_engine_null_pool() -> AsyncEngine:
-    return create_async_engine(settings.DB_URL, poolclass=NullPool)
+    return create_async_engine(
+        settings.DB_URL, poolclass=NullPool, connect_args=get_connect_args()
+    )
+
+
+async def warm_up_engine(engine: AsyncEngine, connections: int) -> None:
+    """
+    Открывает connections соединений пула одновременно и возвращает их в пул,
+    чтобы первые запросы не платили за установку соединения.
+    """
+
+    async def probe():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(probe() for _ in range(connections)))
 
 
 @lru_cache(maxsize=1)
@@ -26,6 +71,11 @@ def get_async_session_maker() -> async_sessionmaker[AsyncSession]:
     return async_sessionmaker(bind=get_engine(), expire_on_commit=False)
 
 
+@lru_cache(maxsize=1)
+def get_async_session_maker_replica() -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(bind=get_replica_engine(), expire_on_commit=False)
+
+
 @lru_cache(maxsize=1)
 def get_async_session_maker_null_pool() -> async_sessionmaker[AsyncSession]:
     return async_sessionmaker(bind=get_engine_null_pool(), expire_on_commit=False)
@@ -14,14 +14,18 @@ class PaginationParams(BaseModel):
 PaginationDep = Annotated[PaginationParams, Depends()]
 
 
-def get_current_user_dp(dp: str):
-    async def dependency(
-        request: Request,
-        response: Response,
-        auth_service: AuthService = Depends(AuthService),
-    ):
-        payload: dict = await auth_service.get_current_user_payload(request, response)
+async def get_current_user_payload(
+    request: Request,
+    response: Response,
+    auth_service: AuthService = Depends(AuthService),
+) -> dict:
+    return await auth_service.get_current_user_payload(request, response)
+
 
+def get_current_user_dp(dp: str):
+    # FastAPI кэширует get_current_user_payload в рамках запроса,
+    # поэтому UserIdDep и UserRoleDep в одном эндпоинте разбирают токен один раз
+    async def dependency(payload: dict = Depends(get_current_user_payload)):
         return payload[dp]
 
     return dependency
@@ -1,8 +1,9 @@
 from typing import Annotated
 from fastapi import Depends
 
+from src.config import settings
 from src.utils.db_manager import DBManager
-from src.database import get_async_session_maker
+from src.database import get_async_session_maker, get_async_session_maker_replica
 
 
 async def get_db():
@@ -11,4 +12,18 @@ async def get_db():
         yield db
 
 
+async def get_db_read():
+    """Сессия на реплике для эндпоинтов, которые только читают данные."""
+    if settings.DB_REPLICA_URL is None:
+        async with DBManager(session_factory=get_async_session_maker()) as db:
+            yield db
+        return
+    async with DBManager(
+        session_factory=get_async_session_maker_replica(),
+        primary_session_factory=get_async_session_maker(),
+    ) as db:
+        yield db
+
+
 DBDep = Annotated[DBManager, Depends(get_db)]
+DBReadDep = Annotated[DBManager, Depends(get_db_read)]
@@ -23,3 +23,11 @@ class PurchaseNotFoundException(ObjectNotFoundException):
 
 class ProductNotFoundException(ObjectNotFoundException):
     detail = "Продукт не найден"
+
+
+class PaymentOutboxTaskNotFoundException(ObjectNotFoundException):
+    detail = "Задача на создание платежа не найдена"
+
+
+class PaymentWebhookEventNotFoundException(ObjectNotFoundException):
+    detail = "Уведомление о платеже не найдено"
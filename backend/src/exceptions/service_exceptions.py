@@ -23,6 +23,11 @@ class ReviewWrongFormatServiceException(MadRussianServiceException):
     detail = "Неверный формат: продукты должны быть только ОГЭ или ЕГЭ"
 
 
+class ReviewCursorInvalidServiceException(MadRussianServiceException):
+    status_code = 400
+    detail = "Неверный курсор пагинации"
+
+
 class ReviewIsExistingServiceException(MadRussianServiceException):
     status_code = 409
     detail = "Отзыв уже существует"
@@ -101,6 +106,11 @@ class AuthRateLimitServiceException(MadRussianServiceException):
         super().__init__(detail=detail)
 
 
+class AuthOverloadedServiceException(MadRussianServiceException):
+    status_code = 503
+    detail = "Сервис авторизации перегружен, попробуйте позже"
+
+
 class UserAlreadyExistsServiceException(MadRussianServiceException):
     status_code = 409
     detail = "Пользователь с такими данными уже существует"
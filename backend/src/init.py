@@ -1,11 +1,55 @@
+from passlib.context import CryptContext
 from yookassa import Configuration
 
 from src.connectors.redis_connector import RedisManager
+from src.connectors.yookassa_connector import YooKassaClient
 from src.config import settings
+from src.utils.cache import VersionedCache
+from src.utils.products_cache import ProductsCatalogCache
+from src.utils.password_hasher import PasswordHasher
+from src.utils.rate_limit import RateLimiter
+from src.utils.token_cache import TokenPayloadCache
 
 redis_manager = RedisManager(
     host=settings.REDIS_HOST,
     port=settings.REDIS_PORT,
+    max_connections=settings.REDIS_MAX_CONNECTIONS,
+    pool_timeout=settings.REDIS_POOL_TIMEOUT,
+    socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+    health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+    retries=settings.REDIS_RETRIES,
+)
+
+reviews_cache = VersionedCache(
+    redis_manager,
+    namespace="reviews",
+    expire=settings.REVIEWS_CACHE_EXPIRE_SECONDS,
+)
+
+products_cache = ProductsCatalogCache(expire=settings.PRODUCTS_CACHE_EXPIRE_SECONDS)
+
+password_hasher = PasswordHasher(
+    CryptContext(schemes=["bcrypt"], deprecated="auto"),
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
+
+token_payload_cache = TokenPayloadCache(maxsize=settings.JWT_CACHE_SIZE)
+
+rate_limiter = RateLimiter(redis_manager)
+
+yookassa_client = YooKassaClient(
+    base_url=settings.YOOKASSA_API_URL,
+    shop_id=settings.YOOKASSA_SHOP_ID,
+    secret_key=settings.YOOKASSA_SECRET_KEY,
+    timeout=settings.YOOKASSA_TIMEOUT,
+    connect_timeout=settings.YOOKASSA_CONNECT_TIMEOUT,
+    max_connections=settings.YOOKASSA_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.YOOKASSA_MAX_KEEPALIVE_CONNECTIONS,
+    retries=settings.YOOKASSA_RETRIES,
+    retry_backoff=settings.YOOKASSA_RETRY_BACKOFF,
+    http2=settings.YOOKASSA_HTTP2,
 )
 
 
@@ -2,8 +2,8 @@ import sys
 from pathlib import Path
 from dotenv import load_dotenv
 import os
-from contextlib import asynccontextmanager
-import asyncpg
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 from fastapi_cache import FastAPICache
@@ -24,8 +24,23 @@ from src.api.auth import (
     reset as users_reset,
 )
 from src.api.personal_info import router as personal_info_router
-from src.init import redis_manager, init_yookassa
+from src.init import (
+    redis_manager,
+    products_cache,
+    password_hasher,
+    yookassa_client,
+    init_yookassa,
+    rate_limiter,
+)
+from src.middlewares.rate_limit import RateLimitMiddleware
+from src.utils.rate_limit import RateLimit, RateLimitRule
+from src.utils.static_build import MANIFEST_NAME
+from src.utils.static_files import PrecompressedStaticFiles
+from src.workers.payment_outbox import payment_outbox_worker
+from src.workers.payment_webhooks import payment_webhook_worker
+from src.workers.review_stats import run_review_stats_reconciler
 from src.config import settings
+from src.database import get_engine, get_replica_engine, warm_up_engine
 
 
 # Инициализация окружения и путей
@@ -49,10 +64,9 @@ early_setup()
 async def lifespan(app: FastAPI):
     # print(f"DEBUG: Attempting to connect to database with URL: {settings.DB_URL}")
     try:
-        conn_url = settings.DB_URL.replace("+asyncpg", "")
-        conn = await asyncpg.connect(conn_url)
-        await conn.execute("SELECT 1")
-        await conn.close()
+        await warm_up_engine(get_engine(), settings.DB_POOL_SIZE)
+        if settings.DB_REPLICA_URL is not None:
+            await warm_up_engine(get_replica_engine(), settings.DB_POOL_SIZE)
         # print("DEBUG: Database connection successful.")
     except Exception as e:
         print(
@@ -62,8 +76,28 @@ async def lifespan(app: FastAPI):
     await redis_manager.connect()
     FastAPICache.init(RedisBackend(redis_manager.redis), prefix="fastapi-cache")
     init_yookassa(settings.YOOKASSA_SHOP_ID, settings.YOOKASSA_SECRET_KEY)
+    await yookassa_client.connect()
+    products_cache_listener = asyncio.create_task(
+        products_cache.listen_for_invalidation(redis_manager)
+    )
+    background_tasks = [products_cache_listener]
+    if settings.PAYMENT_WORKERS_IN_PROCESS:
+        for worker in (payment_outbox_worker, payment_webhook_worker):
+            background_tasks.append(asyncio.create_task(worker.run()))
+    if settings.REVIEW_STATS_RECONCILE_SECONDS:
+        background_tasks.append(
+            asyncio.create_task(
+                run_review_stats_reconciler(settings.REVIEW_STATS_RECONCILE_SECONDS)
+            )
+        )
     yield
+    for task in background_tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    await yookassa_client.close()
     await redis_manager.close()
+    password_hasher.shutdown()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -72,6 +106,28 @@ app.add_exception_handler(
     MadRussianServiceException, mad_russian_service_exception_handler
 )
 
+# Добавляется до CORS, чтобы ответы 429 тоже получали CORS-заголовки
+app.add_middleware(
+    RateLimitMiddleware,
+    limiter=rate_limiter,
+    rules=[
+        RateLimitRule("POST", "/auth/login", RateLimit(10, 60)),
+        RateLimitRule("POST", "/auth/refresh", RateLimit(30, 60)),
+        RateLimitRule("GET", "/reviews/search", RateLimit(30, 60)),
+        RateLimitRule("GET", "/reviews/{exam_type}", RateLimit(60, 60)),
+        RateLimitRule("POST", "/payments", RateLimit(10, 60)),
+        RateLimitRule("GET", "/payments/{payment_id}/status", RateLimit(60, 60)),
+        RateLimitRule("POST", "/payments/webhook", RateLimit(300, 60)),
+        # Статика фронтенда кэшируется браузером и не ограничивается
+        RateLimitRule("GET", "/assets/{path:path}", None),
+    ],
+    default=RateLimit(
+        settings.RATE_LIMIT_DEFAULT_CAPACITY,
+        settings.RATE_LIMIT_DEFAULT_PERIOD_SECONDS,
+    ),
+    enabled=settings.RATE_LIMIT_ENABLED,
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -84,6 +140,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        "ETag",
+        "X-Next-Cursor",
+        "X-RateLimit-Limit",
+        "X-RateLimit-Remaining",
+        "Retry-After",
+    ],
 )
 
 app.include_router(root_router)
@@ -95,6 +158,19 @@ app.include_router(users_router)
 app.include_router(users_reset)
 app.include_router(users_register_router)
 
+# Монтируется последним: всё, что не совпало с API, ищется в сборке фронтенда
+if (Path(settings.FRONTEND_DIST_DIR) / MANIFEST_NAME).is_file():
+    app.mount(
+        "/",
+        PrecompressedStaticFiles(directory=settings.FRONTEND_DIST_DIR),
+        name="frontend",
+    )
+else:
+    print(
+        f"WARNING: Frontend build not found in {settings.FRONTEND_DIST_DIR}, "
+        "run python -m src.utils.static_build"
+    )
+
 
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", reload=True)
@@ -0,0 +1,86 @@
+import math
+from typing import Sequence
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.exceptions.service_exceptions import MadRussianServiceException
+from src.services.auth import AuthService
+from src.utils.rate_limit import RateLimit, RateLimiter, RateLimitRule
+
+
+class RateLimitMiddleware:
+    """
+    Ограничивает частоту запросов token bucket'ом на пару (маршрут, клиент).
+    Клиент - id пользователя из access token, иначе IP. Лимит берётся из первого
+    подходящего правила, иначе используется default; правило с limit=None
+    отключает ограничение для маршрута.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiter: RateLimiter,
+        rules: Sequence[RateLimitRule],
+        default: RateLimit | None = None,
+        enabled: bool = True,
+    ):
+        self.app = app
+        self.limiter = limiter
+        self.rules = rules
+        self.default = default
+        self.enabled = enabled
+
+    def match(self, method: str, path: str) -> tuple[str, RateLimit | None]:
+        for rule in self.rules:
+            if rule.matches(method, path):
+                return f"{rule.method or '*'}:{rule.path}", rule.limit
+        return "default", self.default
+
+    @staticmethod
+    def client_key(request: Request) -> str:
+        access_token = request.cookies.get("access_token")
+        if access_token:
+            try:
+                payload = AuthService().decode_access_token(access_token)
+                return f"user:{payload['id']}"
+            except (MadRussianServiceException, KeyError):
+                pass
+        return f"ip:{request.client.host if request.client else 'unknown'}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        route_key, limit = self.match(request.method, request.url.path)
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        result = await self.limiter.hit(
+            f"{route_key}:{self.client_key(request)}", limit
+        )
+        headers = {
+            "X-RateLimit-Limit": str(limit.capacity),
+            "X-RateLimit-Remaining": str(result.remaining),
+        }
+        if not result.allowed:
+            headers["Retry-After"] = str(math.ceil(result.retry_after))
+            response = JSONResponse(
+                status_code=429,
+                content={"detail": "Слишком много запросов, попробуйте позже"},
+                headers=headers,
+            )
+            await response(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).update(headers)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
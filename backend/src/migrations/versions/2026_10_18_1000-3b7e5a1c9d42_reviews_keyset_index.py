@@ -0,0 +1,33 @@
+"""reviews keyset index.
+
+Revision ID: 3b7e5a1c9d42
+Revises: c9bcac112ef3
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3b7e5a1c9d42"
+down_revision: Union[str, None] = "c9bcac112ef3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_reviews_exam_created_at_id",
+        "reviews",
+        ["exam", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_reviews_exam_created_at_id", table_name="reviews")
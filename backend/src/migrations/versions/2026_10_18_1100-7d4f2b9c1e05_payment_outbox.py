@@ -0,0 +1,64 @@
+"""payment outbox.
+
+Revision ID: 7d4f2b9c1e05
+Revises: 3b7e5a1c9d42
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7d4f2b9c1e05"
+down_revision: Union[str, None] = "3b7e5a1c9d42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "payments",
+        sa.Column("confirmation_url", sa.String(length=500), nullable=True),
+    )
+    op.create_table(
+        "payment_outbox",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("payment_id", sa.String(length=255), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("last_error", sa.String(length=1000), nullable=True),
+        sa.Column(
+            "available_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["payment_id"], ["payments.payment_id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("payment_id"),
+    )
+    op.create_index(
+        "ix_payment_outbox_status_available_at",
+        "payment_outbox",
+        ["status", "available_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_payment_outbox_status_available_at", table_name="payment_outbox")
+    op.drop_table("payment_outbox")
+    op.drop_column("payments", "confirmation_url")
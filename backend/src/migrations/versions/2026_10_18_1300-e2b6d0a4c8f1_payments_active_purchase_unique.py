@@ -0,0 +1,47 @@
+"""payments active purchase unique.
+
+Revision ID: e2b6d0a4c8f1
+Revises: a5c8e31f6b27
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e2b6d0a4c8f1"
+down_revision: Union[str, None] = "a5c8e31f6b27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Дубли активных покупок не дадут создать индекс: в каждой паре
+    # (user_id, product_slug) оставляем оплаченную, а среди равных - самую
+    # новую, остальные переводим в Canceled
+    op.execute(
+        "UPDATE payments SET status = 'Canceled' WHERE id IN ("
+        "SELECT id FROM ("
+        "SELECT id, row_number() OVER ("
+        "PARTITION BY user_id, product_slug "
+        "ORDER BY status = 'Paid' DESC, created_at DESC NULLS LAST, id DESC"
+        ") AS rn FROM payments WHERE status IN ('Created', 'Paid')"
+        ") ranked WHERE rn > 1)"
+    )
+    op.create_index(
+        "uq_payments_user_product_active",
+        "payments",
+        ["user_id", "product_slug"],
+        unique=True,
+        postgresql_where=sa.text("status IN ('Created', 'Paid')"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("uq_payments_user_product_active", table_name="payments")
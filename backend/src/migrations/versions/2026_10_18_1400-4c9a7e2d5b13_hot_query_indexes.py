@@ -0,0 +1,44 @@
+"""hot query indexes.
+
+Revision ID: 4c9a7e2d5b13
+Revises: e2b6d0a4c8f1
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4c9a7e2d5b13"
+down_revision: Union[str, None] = "e2b6d0a4c8f1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Поиск отзыва пользователя по экзамену (ReviewsService.create_review)
+    op.create_index(
+        "ix_reviews_user_id_exam",
+        "reviews",
+        ["user_id", "exam"],
+        unique=False,
+    )
+    # Купленные продукты пользователя (PurchasesRepository.get_bought_products)
+    # и проверки покупки по статусу; product_slug в INCLUDE для JOIN без чтения строк
+    op.create_index(
+        "ix_payments_user_id_status_paid_at",
+        "payments",
+        ["user_id", "status", "paid_at"],
+        unique=False,
+        postgresql_include=["product_slug"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_payments_user_id_status_paid_at", table_name="payments")
+    op.drop_index("ix_reviews_user_id_exam", table_name="reviews")
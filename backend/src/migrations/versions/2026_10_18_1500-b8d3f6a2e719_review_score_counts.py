@@ -0,0 +1,39 @@
+"""review score counts.
+
+Revision ID: b8d3f6a2e719
+Revises: 4c9a7e2d5b13
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b8d3f6a2e719"
+down_revision: Union[str, None] = "4c9a7e2d5b13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "review_score_counts",
+        sa.Column("exam", sa.String(), nullable=False),
+        sa.Column("result", sa.Integer(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("exam", "result"),
+    )
+    op.execute(
+        "INSERT INTO review_score_counts (exam, result, count) "
+        "SELECT exam, result, count(*) FROM reviews GROUP BY exam, result"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("review_score_counts")
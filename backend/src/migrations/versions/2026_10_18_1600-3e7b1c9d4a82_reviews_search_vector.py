@@ -0,0 +1,47 @@
+"""reviews search vector.
+
+Revision ID: 3e7b1c9d4a82
+Revises: b8d3f6a2e719
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3e7b1c9d4a82"
+down_revision: Union[str, None] = "b8d3f6a2e719"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Генерируемая колонка заполняется для существующих строк при добавлении
+    op.add_column(
+        "reviews",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('russian', coalesce(review, ''))", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_reviews_search_vector",
+        "reviews",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_reviews_search_vector", table_name="reviews")
+    op.drop_column("reviews", "search_vector")
@@ -0,0 +1,33 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, Integer, DateTime, JSON, ForeignKey, Index, func
+from datetime import datetime
+
+from src.database import Base
+
+
+class PaymentOutboxOrm(Base):
+    """
+    Транзакционный outbox: задача на создание платежа в ЮKassa пишется в одной
+    транзакции с покупкой и выполняется фоновым воркером вне запроса.
+    """
+
+    __tablename__ = "payment_outbox"
+    __table_args__ = (
+        Index("ix_payment_outbox_status_available_at", "status", "available_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    payment_id: Mapped[str] = mapped_column(
+        String(255), ForeignKey("payments.payment_id"), nullable=False, unique=True
+    )
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="Pending")
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_error: Mapped[str | None] = mapped_column(String(1000), nullable=True)
+
+    available_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
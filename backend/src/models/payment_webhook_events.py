@@ -0,0 +1,35 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, Integer, DateTime, JSON, Index, func
+from datetime import datetime
+
+from src.database import Base
+
+
+class PaymentWebhookEventOrm(Base):
+    """
+    Входящие уведомления ЮKassa. Уникальный event_key отсекает повторные
+    доставки, обработку выполняет фоновый воркер.
+    """
+
+    __tablename__ = "payment_webhook_events"
+    __table_args__ = (
+        Index(
+            "ix_payment_webhook_events_status_available_at", "status", "available_at"
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    event_key: Mapped[str] = mapped_column(String(255), nullable=False, unique=True)
+    event: Mapped[str] = mapped_column(String(100), nullable=False)
+    payment_id: Mapped[str] = mapped_column(String(255), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="Pending")
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_error: Mapped[str | None] = mapped_column(String(1000), nullable=True)
+
+    available_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
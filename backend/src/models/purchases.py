@@ -1,12 +1,32 @@
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import String, DateTime, JSON, ForeignKey
+from sqlalchemy import String, DateTime, JSON, ForeignKey, Index, text
 from datetime import datetime, timezone
 
 from src.database import Base
 
+# Статусы, при которых у пользователя не может быть второй покупки того же продукта
+ACTIVE_PURCHASE_STATUSES = ("Created", "Paid")
+ACTIVE_PURCHASE_CONDITION = "status IN ('Created', 'Paid')"
+
 
 class PaymentOrm(Base):
     __tablename__ = "payments"
+    __table_args__ = (
+        Index(
+            "uq_payments_user_product_active",
+            "user_id",
+            "product_slug",
+            unique=True,
+            postgresql_where=text(ACTIVE_PURCHASE_CONDITION),
+        ),
+        Index(
+            "ix_payments_user_id_status_paid_at",
+            "user_id",
+            "status",
+            "paid_at",
+            postgresql_include=["product_slug"],
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
@@ -27,4 +47,5 @@ class PaymentOrm(Base):
         nullable=True,
     )
     fiscal_receipt_url: Mapped[str | None] = mapped_column(nullable=True)
+    confirmation_url: Mapped[str | None] = mapped_column(String(500), nullable=True)
     raw_webhook_data: Mapped[dict | None] = mapped_column(JSON, nullable=True)
@@ -0,0 +1,18 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, Integer
+
+from src.database import Base
+
+
+class ReviewScoreCountsOrm(Base):
+    """
+    Число отзывов с данным результатом по экзамену. Обновляется сервисом
+    отзывов при каждом изменении и периодически сверяется с таблицей reviews.
+    Строк на экзамен не больше, чем возможных баллов.
+    """
+
+    __tablename__ = "review_score_counts"
+
+    exam: Mapped[str] = mapped_column(String, primary_key=True)
+    result: Mapped[int] = mapped_column(Integer, primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import ForeignKey, DateTime
+from sqlalchemy import ForeignKey, DateTime, Index, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from datetime import datetime, timezone
 
 from src.database import Base
@@ -7,6 +8,11 @@ from src.database import Base
 
 class ReviewsOrm(Base):
     __tablename__ = "reviews"
+    __table_args__ = (
+        Index("ix_reviews_exam_created_at_id", "exam", "created_at", "id"),
+        Index("ix_reviews_user_id_exam", "user_id", "exam"),
+        Index("ix_reviews_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
@@ -14,6 +20,11 @@ class ReviewsOrm(Base):
     exam: Mapped[str] = mapped_column()
     result: Mapped[int] = mapped_column()
     review: Mapped[str] = mapped_column()
+    # Заполняется самой БД, в схемы и маппер не попадает
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('russian', coalesce(review, ''))", persisted=True),
+    )
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
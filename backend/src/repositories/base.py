@@ -1,11 +1,24 @@
-from sqlalchemy import select, insert, update, delete
+from typing import Iterator, Sequence
+
+from sqlalchemy import select, insert, update, delete, bindparam
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import NoResultFound
 from pydantic import BaseModel
 
+from src.config import settings
 from src.repositories.mappers.base import DataMapper
 from src.exceptions.db_exceptions import ObjectNotFoundException
 
 
+def chunked(items: Sequence, size: int) -> Iterator[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def dump_rows(data: Sequence[BaseModel | dict]) -> list[dict]:
+    return [row.model_dump() if isinstance(row, BaseModel) else row for row in data]
+
+
 class BaseRepository:
     model = None
     schema: BaseModel = None
@@ -15,42 +28,56 @@ class BaseRepository:
     def __init__(self, session):
         self.session = session
 
-    async def get_all(self, *args, **kwargs):
-        query = select(self.model).filter_by(**kwargs)
+    def _select(self, load_entity: bool = False):
+        """
+        По умолчанию выбираются только колонки схемы маппера: без загрузки
+        ORM-объектов в identity map и без лишних полей (hashed_password, JSON).
+        load_entity=True загружает ORM-объекты целиком.
+        """
+        if load_entity:
+            return select(self.model)
+        return select(*self.mapper.columns())
+
+    @staticmethod
+    def _rows(result, load_entity: bool = False):
+        return result.scalars() if load_entity else result
+
+    async def get_all(self, *args, load_entity: bool = False, **kwargs):
+        query = self._select(load_entity).filter_by(**kwargs)
         result = await self.session.execute(query)
         answer = [
-            self.mapper.map_to_domain_entity(model) for model in result.scalars().all()
+            self.mapper.map_to_domain_entity(row)
+            for row in self._rows(result, load_entity).all()
         ]
         if not answer:
             raise self.not_found_exception
         return answer
 
-    async def get_one_or_none(self, **filter_by):
-        query = select(self.model).filter_by(**filter_by)
+    async def get_one_or_none(self, *, load_entity: bool = False, **filter_by):
+        query = self._select(load_entity).filter_by(**filter_by)
         result = await self.session.execute(query)
-        model = result.scalars().one_or_none()
-        if model is None:
+        row = self._rows(result, load_entity).one_or_none()
+        if row is None:
             return None
-        return self.mapper.map_to_domain_entity(model)
+        return self.mapper.map_to_domain_entity(row)
 
-    async def get_one(self, **filter_by):
-        query = select(self.model).filter_by(**filter_by)
+    async def get_one(self, *, load_entity: bool = False, **filter_by):
+        query = self._select(load_entity).filter_by(**filter_by)
         result = await self.session.execute(query)
         try:
-            model = result.scalar_one()
+            row = self._rows(result, load_entity).one()
         except NoResultFound:
             raise self.not_found_exception
-        return self.mapper.map_to_domain_entity(model)
+        return self.mapper.map_to_domain_entity(row)
 
     async def add(self, data: BaseModel):
         dumped_data = data.model_dump()
         # В UsersRepository.add мы уже нормализуем 'phone', если это он
         add_data_stmt_returning_model = (
-            insert(self.model).values(**dumped_data).returning(self.model)
+            insert(self.model).values(**dumped_data).returning(*self.mapper.columns())
         )
         result_model = await self.session.execute(add_data_stmt_returning_model)
-        created_model_instance = result_model.scalars().one()
-        return self.mapper.map_to_domain_entity(created_model_instance)
+        return self.mapper.map_to_domain_entity(result_model.one())
 
     async def edit(
         self, data: BaseModel | dict, exclude_unset_for_model: bool = True, **filter_by
@@ -79,12 +106,17 @@ class BaseRepository:
             print(
                 f"DEBUG (BaseRepository.edit): Нет данных для обновления по фильтру: {filter_by}."
             )
+            # Обновлять нечего, но об отсутствии записи всё равно сообщаем
+            await self.get_one(**filter_by)
             return
 
         update_stmt = (
             update(self.model).filter_by(**filter_by).values(**values_to_update)
         )
-        await self.session.execute(update_stmt)
+        result = await self.session.execute(update_stmt)
+        # Существование записи проверяется самим UPDATE, без отдельного SELECT
+        if result.rowcount == 0:
+            raise self.not_found_exception
 
     async def delete(self, **filter_by):
         if not filter_by:
@@ -98,3 +130,79 @@ class BaseRepository:
             )
         query = delete(self.model).filter_by(**filter_by)
         await self.session.execute(query)
+
+    async def add_bulk(
+        self, data: Sequence[BaseModel | dict], chunk_size: int | None = None
+    ) -> None:
+        """Вставка пачками: один executemany на chunk_size строк."""
+        stmt = insert(self.model)
+        rows = dump_rows(data)
+        for chunk in chunked(rows, chunk_size or settings.DB_BULK_CHUNK_SIZE):
+            await self.session.execute(stmt, chunk)
+
+    async def upsert_bulk(
+        self,
+        data: Sequence[BaseModel | dict],
+        conflict_keys: Sequence[str],
+        update_fields: Sequence[str] | None = None,
+        chunk_size: int | None = None,
+    ) -> None:
+        """
+        INSERT ... ON CONFLICT (conflict_keys) DO UPDATE для пачки строк.
+        По умолчанию обновляются все переданные поля, кроме ключа; пустой
+        update_fields означает DO NOTHING. chunk_size * число колонок не должно
+        превышать лимит параметров asyncpg (32767).
+        """
+        rows = dump_rows(data)
+        if not rows:
+            return
+        if update_fields is None:
+            update_fields = [key for key in rows[0] if key not in conflict_keys]
+        for chunk in chunked(rows, chunk_size or settings.DB_BULK_CHUNK_SIZE):
+            stmt = pg_insert(self.model).values(list(chunk))
+            if update_fields:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=list(conflict_keys),
+                    set_={field: stmt.excluded[field] for field in update_fields},
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=list(conflict_keys))
+            await self.session.execute(stmt)
+
+    async def edit_bulk(
+        self,
+        data: Sequence[BaseModel | dict],
+        key: str = "id",
+        chunk_size: int | None = None,
+    ) -> None:
+        """
+        Обновляет строки по ключу key одним executemany на пачку. Все строки
+        должны содержать key и одинаковый набор обновляемых полей.
+        """
+        rows = dump_rows(data)
+        if not rows:
+            return
+        table = self.model.__table__
+        fields = [field for field in rows[0] if field != key]
+        # Имена параметров не должны совпадать с именами колонок в UPDATE
+        stmt = (
+            update(table)
+            .where(table.c[key] == bindparam(f"_{key}"))
+            .values({field: bindparam(f"_{field}") for field in fields})
+        )
+        params = [{f"_{name}": value for name, value in row.items()} for row in rows]
+        for chunk in chunked(params, chunk_size or settings.DB_BULK_CHUNK_SIZE):
+            await self.session.execute(stmt, chunk)
+
+    async def delete_bulk(
+        self, ids: Sequence, key: str = "id", chunk_size: int | None = None
+    ) -> int:
+        """Удаляет строки, у которых key входит в ids. Возвращает число удалённых."""
+        column = getattr(self.model, key)
+        deleted = 0
+        for chunk in chunked(list(ids), chunk_size or settings.DB_BULK_CHUNK_SIZE):
+            result = await self.session.execute(
+                delete(self.model).where(column.in_(chunk))
+            )
+            deleted += result.rowcount
+        return deleted
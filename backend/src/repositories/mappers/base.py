@@ -1,20 +1,69 @@
-from typing import TypeVar
+from functools import lru_cache
+from typing import Any, Mapping, TypeVar
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
+from src.config import settings
 from src.database import Base
 
 SchemaType = TypeVar("SchemaType", bound=BaseModel)
 DBModelType = TypeVar("DBModelType", bound=Base)
 
 
+def construct_trusted(schema: type[SchemaType], values: Mapping[str, Any]):
+    """
+    Собирает схему из строки нашей же БД без повторной валидации.
+    При DB_MAPPER_VALIDATE=True выполняется полная валидация pydantic (для отладки).
+    """
+    if settings.DB_MAPPER_VALIDATE:
+        return schema.model_validate(values)
+    return schema.model_construct(**values)
+
+
 class DataMapper:
     db_model: type[DBModelType] = None
     schema: type[SchemaType] = None
+    # Поля, которые в быстром режиме всё равно приводятся к типу схемы
+    # (например, PhoneNumber форматирует номер). Результат кэшируется по значению.
+    validated_fields: dict[str, Any] = {}
+    _field_validators: dict[str, Any] = {}
+    _columns: tuple = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._field_validators = {
+            name: lru_cache(maxsize=4096)(TypeAdapter(annotation).validate_python)
+            for name, annotation in cls.validated_fields.items()
+        }
+        if cls.db_model is not None and cls.schema is not None:
+            table_columns = cls.db_model.__table__.columns.keys()
+            cls._columns = tuple(
+                getattr(cls.db_model, name)
+                for name in cls.schema.model_fields
+                if name in table_columns
+            )
+
+    @classmethod
+    def columns(cls) -> tuple:
+        """Только те колонки таблицы, которые нужны схеме: select(*mapper.columns())."""
+        return cls._columns
 
     @classmethod
     def map_to_domain_entity(cls, db_model):
-        return cls.schema.model_validate(db_model, from_attributes=True)
+        # db_model - ORM-объект или Row из select(*mapper.columns())
+        if settings.DB_MAPPER_VALIDATE:
+            return cls.schema.model_validate(db_model, from_attributes=True)
+        values = {}
+        for name in cls.schema.model_fields:
+            try:
+                value = getattr(db_model, name)
+            except AttributeError:
+                continue
+            validator = cls._field_validators.get(name)
+            if validator is not None and value is not None:
+                value = validator(value)
+            values[name] = value
+        return cls.schema.model_construct(**values)
 
     @classmethod
     def map_to_persistence_entity(cls, schema):
@@ -1,17 +1,28 @@
+from pydantic_extra_types.phone_numbers import PhoneNumber
+
 from src.models.reviews import ReviewsOrm
 from src.repositories.mappers.base import DataMapper
 from src.schemas.reviews import ReviewPatch, ReviewWithId, Review
 from src.models.users import UsersOrm
-from src.schemas.users import User
+from src.schemas.users import User, UserWithHashedPassword
 from src.models.products import ProductsOrm
 from src.models.purchases import PaymentOrm
+from src.models.payment_outbox import PaymentOutboxOrm
+from src.models.payment_webhook_events import PaymentWebhookEventOrm
 from src.schemas.products import Product
-from src.schemas.payments import Purchase
+from src.schemas.payments import Purchase, PaymentOutboxTask, PaymentWebhookEvent
 
 
 class UsersMapper(DataMapper):
     schema = User
     db_model = UsersOrm
+    validated_fields = {"phone": PhoneNumber}
+
+
+class UsersWithPasswordMapper(DataMapper):
+    schema = UserWithHashedPassword
+    db_model = UsersOrm
+    validated_fields = {"phone": PhoneNumber}
 
 
 class ReviewsIdMapper(DataMapper):
@@ -37,3 +48,13 @@ class ProductsMapper(DataMapper):
 class PurchasesMapper(DataMapper):
     db_model = PaymentOrm
     schema = Purchase
+
+
+class PaymentOutboxMapper(DataMapper):
+    db_model = PaymentOutboxOrm
+    schema = PaymentOutboxTask
+
+
+class PaymentWebhookEventMapper(DataMapper):
+    db_model = PaymentWebhookEventOrm
+    schema = PaymentWebhookEvent
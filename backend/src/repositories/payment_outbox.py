@@ -0,0 +1,12 @@
+from src.exceptions.db_exceptions import PaymentOutboxTaskNotFoundException
+from src.repositories.queue import QueueRepository
+from src.models.payment_outbox import PaymentOutboxOrm
+from src.repositories.mappers.mappers import PaymentOutboxMapper
+from src.schemas.payments import PaymentOutboxTask
+
+
+class PaymentOutboxRepository(QueueRepository):
+    model = PaymentOutboxOrm
+    schema = PaymentOutboxTask
+    mapper = PaymentOutboxMapper
+    not_found_exception = PaymentOutboxTaskNotFoundException
@@ -0,0 +1,25 @@
+from sqlalchemy.dialects.postgresql import insert
+
+from src.exceptions.db_exceptions import PaymentWebhookEventNotFoundException
+from src.repositories.queue import QueueRepository
+from src.models.payment_webhook_events import PaymentWebhookEventOrm
+from src.repositories.mappers.mappers import PaymentWebhookEventMapper
+from src.schemas.payments import PaymentWebhookEvent, PaymentWebhookEventAdd
+
+
+class PaymentWebhookEventsRepository(QueueRepository):
+    model = PaymentWebhookEventOrm
+    schema = PaymentWebhookEvent
+    mapper = PaymentWebhookEventMapper
+    not_found_exception = PaymentWebhookEventNotFoundException
+
+    async def add_if_absent(self, data: PaymentWebhookEventAdd) -> bool:
+        """Сохраняет событие; повторная доставка того же события ничего не делает."""
+        stmt = (
+            insert(self.model)
+            .values(**data.model_dump())
+            .on_conflict_do_nothing(index_elements=[self.model.event_key])
+            .returning(self.model.id)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none() is not None
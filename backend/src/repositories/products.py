@@ -1,4 +1,9 @@
+from typing import Callable
+
+from sqlalchemy import select
+
 from src.exceptions.db_exceptions import ProductNotFoundException
+from src.init import products_cache
 from src.repositories.base import BaseRepository
 from src.models.products import ProductsOrm
 from src.repositories.mappers.mappers import ProductsMapper
@@ -10,3 +15,34 @@ class ProductsRepository(BaseRepository):
     schema = Product
     mapper = ProductsMapper
     not_found_exception = ProductNotFoundException
+
+    def __init__(self, session, catalog_session: Callable[[], object] | None = None):
+        super().__init__(session)
+        self.catalog_session = catalog_session or (lambda: self.session)
+
+    async def get_one(self, **filter_by) -> Product:
+        # Поиск по slug или name обслуживается из кэша каталога, при промахе идём в БД
+        if len(filter_by) == 1 and filter_by.keys() & {"slug", "name"}:
+            ((field, value),) = filter_by.items()
+            await self._ensure_catalog()
+            product = products_cache.get(field, value)
+            if product is not None:
+                return product
+        return await super().get_one(**filter_by)
+
+    async def get_catalog(self) -> list[Product]:
+        await self._ensure_catalog()
+        return products_cache.all()
+
+    async def get_catalog_version(self) -> str:
+        """Версия каталога для ETag; при загруженном каталоге БД не читается."""
+        await self._ensure_catalog()
+        return products_cache.version
+
+    async def _ensure_catalog(self) -> None:
+        if products_cache.is_expired():
+            products_cache.replace(await self._load_catalog())
+
+    async def _load_catalog(self) -> list[Product]:
+        result = await self.catalog_session().execute(select(*self.mapper.columns()))
+        return [self.mapper.map_to_domain_entity(row) for row in result.all()]
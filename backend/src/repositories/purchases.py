@@ -1,10 +1,20 @@
-from sqlalchemy import update
+from datetime import datetime
+
+from sqlalchemy import select, update, text, func
+from sqlalchemy.dialects.postgresql import insert
 
 from src.exceptions.db_exceptions import PurchaseNotFoundException
 from src.repositories.base import BaseRepository
-from src.models.purchases import PaymentOrm
+from src.models.purchases import (
+    PaymentOrm,
+    ACTIVE_PURCHASE_STATUSES,
+    ACTIVE_PURCHASE_CONDITION,
+)
+from src.models.products import ProductsOrm
+from src.repositories.mappers.base import construct_trusted
 from src.repositories.mappers.mappers import PurchasesMapper
 from src.schemas.payments import Purchase, PaymentWebhookData
+from src.schemas.personal_info import BoughtProduct
 
 
 class PurchasesRepository(BaseRepository):
@@ -26,3 +36,85 @@ class PurchasesRepository(BaseRepository):
             )
         )
         await self.session.execute(update_stmt)
+
+    async def add_if_not_active(self, data: Purchase) -> str | None:
+        """
+        Добавляет покупку одним INSERT ... ON CONFLICT по частичному уникальному
+        индексу uq_payments_user_product_active. Возвращает None, если покупка
+        добавлена, иначе статус уже существующей активной покупки.
+        """
+        stmt = (
+            insert(self.model)
+            .values(**data.model_dump())
+            .on_conflict_do_nothing(
+                index_elements=[self.model.user_id, self.model.product_slug],
+                index_where=text(ACTIVE_PURCHASE_CONDITION),
+            )
+            .returning(self.model.id)
+        )
+        result = await self.session.execute(stmt)
+        if result.scalar_one_or_none() is not None:
+            return None
+        query = select(self.model.status).filter(
+            self.model.user_id == data.user_id,
+            self.model.product_slug == data.product_slug,
+            self.model.status.in_(ACTIVE_PURCHASE_STATUSES),
+        )
+        # Конкурирующая покупка могла уже перейти в Failed: тогда считаем её Created
+        return (await self.session.execute(query)).scalar_one_or_none() or "Created"
+
+    async def set_confirmation_url(self, payment_id: str, confirmation_url: str):
+        stmt = (
+            update(self.model)
+            .filter_by(payment_id=payment_id)
+            .values(confirmation_url=confirmation_url)
+        )
+        await self.session.execute(stmt)
+
+    async def set_status(self, payment_id: str, status: str):
+        stmt = update(self.model).filter_by(payment_id=payment_id).values(status=status)
+        await self.session.execute(stmt)
+
+    async def update_from_webhook(self, payment_id: str, **values) -> bool:
+        """Точечно обновляет покупку по уведомлению. False, если покупки нет."""
+        stmt = (
+            update(self.model)
+            .filter_by(payment_id=payment_id)
+            .values(**values)
+            .returning(self.model.id)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none() is not None
+
+    async def get_bought_version(self, user_id: int) -> tuple[int, datetime | None]:
+        """
+        (количество, последний paid_at) оплаченных покупок пользователя для ETag.
+        Читается только из индекса ix_payments_user_id_status_paid_at.
+        """
+        query = select(func.count(), func.max(self.model.paid_at)).filter(
+            self.model.user_id == user_id, self.model.status == "Paid"
+        )
+        result = await self.session.execute(query)
+        return tuple(result.one())
+
+    async def get_bought_products(self, user_id: int) -> list[BoughtProduct]:
+        """Оплаченные продукты пользователя одним запросом payments JOIN products."""
+        query = (
+            select(
+                ProductsOrm.name,
+                ProductsOrm.price,
+                ProductsOrm.download_link,
+                ProductsOrm.description,
+                self.model.paid_at,
+            )
+            .join(ProductsOrm, ProductsOrm.slug == self.model.product_slug)
+            .filter(self.model.user_id == user_id, self.model.status == "Paid")
+            .order_by(self.model.paid_at)
+        )
+        result = await self.session.execute(query)
+        answer = [
+            construct_trusted(BoughtProduct, row._mapping) for row in result.all()
+        ]
+        if not answer:
+            raise self.not_found_exception
+        return answer
@@ -0,0 +1,79 @@
+from datetime import timedelta
+
+from sqlalchemy import select, update, func
+
+from src.repositories.base import BaseRepository
+
+
+class QueueRepository(BaseRepository):
+    """
+    Таблица-очередь для фоновых воркеров. Модель должна иметь поля
+    id, status, attempts, last_error и available_at.
+    """
+
+    async def claim_batch(self, limit: int, lease: int, max_attempts: int) -> list:
+        """
+        Забирает до limit готовых задач и продлевает их available_at на lease секунд.
+        Задачи, исчерпавшие max_attempts, больше не выдаются.
+        SKIP LOCKED позволяет нескольким воркерам работать параллельно, а аренда
+        вместо долгой блокировки не держит транзакцию на время внешних запросов:
+        если воркер упадёт, задача снова станет доступна после истечения аренды.
+        """
+        ready_ids = (
+            select(self.model.id)
+            .filter(self.model.status == "Pending")
+            .filter(self.model.available_at <= func.now())
+            .filter(self.model.attempts < max_attempts)
+            .order_by(self.model.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(self.model)
+            .where(self.model.id.in_(ready_ids))
+            .values(
+                attempts=self.model.attempts + 1,
+                available_at=func.now() + timedelta(seconds=lease),
+            )
+            .returning(*self.mapper.columns())
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(stmt)
+        tasks = [self.mapper.map_to_domain_entity(row) for row in result.all()]
+        return sorted(tasks, key=lambda task: task.id)
+
+    async def fail_expired(self, max_attempts: int) -> list:
+        """
+        Помечает Failed задачи, у которых истекла аренда последней попытки:
+        воркер забрал их и не отчитался (упал или был остановлен). Иначе такие
+        задачи навсегда остаются в Pending, потому что claim_batch их не выдаёт.
+        """
+        stmt = (
+            update(self.model)
+            .filter(self.model.status == "Pending")
+            .filter(self.model.available_at <= func.now())
+            .filter(self.model.attempts >= max_attempts)
+            .values(status="Failed", last_error="Lease of the last attempt expired")
+            .returning(*self.mapper.columns())
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(stmt)
+        return [self.mapper.map_to_domain_entity(row) for row in result.all()]
+
+    async def mark_done(self, task_id: int) -> None:
+        stmt = (
+            update(self.model)
+            .filter_by(id=task_id)
+            .values(status="Done", last_error=None)
+        )
+        await self.session.execute(stmt)
+
+    async def mark_failed(self, task_id: int, error: str, retry_in: float | None):
+        """Откладывает задачу на retry_in секунд или окончательно помечает Failed."""
+        values = {"last_error": error[:1000]}
+        if retry_in is None:
+            values["status"] = "Failed"
+        else:
+            values["available_at"] = func.now() + timedelta(seconds=retry_in)
+        stmt = update(self.model).filter_by(id=task_id).values(**values)
+        await self.session.execute(stmt)
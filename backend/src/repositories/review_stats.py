@@ -0,0 +1,75 @@
+from sqlalchemy import select, delete, func, exists, text
+from sqlalchemy.dialects.postgresql import insert
+
+from src.models.review_stats import ReviewScoreCountsOrm
+from src.models.reviews import ReviewsOrm
+from src.schemas.reviews import ReviewStats
+
+# Ключ pg_advisory_xact_lock, чтобы сверку одновременно выполнял один воркер
+RECONCILE_LOCK_ID = 702201
+
+
+class ReviewStatsRepository:
+    model = ReviewScoreCountsOrm
+
+    def __init__(self, session):
+        self.session = session
+
+    async def adjust(self, exam: str, result: int, delta: int) -> None:
+        stmt = insert(self.model).values(exam=exam, result=result, count=delta)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[self.model.exam, self.model.result],
+            set_={"count": self.model.count + delta},
+        )
+        await self.session.execute(stmt)
+
+    async def get(self, exam: str) -> ReviewStats:
+        query = (
+            select(self.model.result, self.model.count)
+            .filter(self.model.exam == exam, self.model.count > 0)
+            .order_by(self.model.result)
+        )
+        result = await self.session.execute(query)
+        distribution = {row.result: row.count for row in result.all()}
+        count = sum(distribution.values())
+        total = sum(score * n for score, n in distribution.items())
+        return ReviewStats(
+            exam=exam,
+            count=count,
+            average=round(total / count, 2) if count else None,
+            distribution=distribution,
+        )
+
+    async def reconcile(self) -> bool:
+        """
+        Пересчитывает агрегат по таблице reviews. Возвращает False, если сверку
+        прямо сейчас выполняет другой процесс. Запись отзывов на время сверки
+        блокируется.
+        """
+        locked = await self.session.execute(
+            text("SELECT pg_try_advisory_xact_lock(:id)"), {"id": RECONCILE_LOCK_ID}
+        )
+        if not locked.scalar():
+            return False
+        # SHARE ждёт незавершённые записи в reviews и не пускает новые до конца
+        # транзакции: их adjust уже зафиксирован или выполнится после сверки,
+        # поэтому перезапись счётчиков снимком не теряет инкременты
+        await self.session.execute(text("LOCK TABLE reviews IN SHARE MODE"))
+        actual = select(
+            ReviewsOrm.exam, ReviewsOrm.result, func.count().label("count")
+        ).group_by(ReviewsOrm.exam, ReviewsOrm.result)
+        upsert = insert(self.model).from_select(["exam", "result", "count"], actual)
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[self.model.exam, self.model.result],
+            set_={"count": upsert.excluded.count},
+        )
+        await self.session.execute(upsert)
+        await self.session.execute(
+            delete(self.model).where(
+                ~exists().where(
+                    ReviewsOrm.exam == self.model.exam,
+                    ReviewsOrm.result == self.model.result,
+                )
+            )
+        )
+        return True
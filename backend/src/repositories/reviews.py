@@ -1,5 +1,8 @@
-from sqlalchemy import select, update
+from datetime import datetime
+
+from sqlalchemy import select, update, delete, tuple_, func
 from sqlalchemy.exc import NoResultFound
+from sqlalchemy.orm import aliased
 
 from src.repositories.base import BaseRepository
 from src.models.reviews import ReviewsOrm
@@ -22,66 +25,142 @@ class ReviewsRepository(BaseRepository):
     not_found_exception = ReviewNotFoundException
 
     async def get_all(self, exam, limit, offset) -> list[Review]:
-        query = select(ReviewsOrm).filter_by(exam=exam)
+        query = self._select().filter_by(exam=exam)
         query = query.limit(limit).offset(offset)
-        # print(query.compile(compile_kwargs={"literal_binds": True}))
         result = await self.session.execute(query)
-        answer = [
-            self.mapper.map_to_domain_entity(review)
-            for review in result.scalars().all()
-        ]
+        answer = [self.mapper.map_to_domain_entity(review) for review in result.all()]
         if not answer:
             raise self.not_found_exception
         return answer
 
     async def get_all_with_id(self, limit, offset, **filter_by) -> list[ReviewWithId]:
-        query = select(ReviewsOrm).filter_by(**filter_by)
+        query = select(*ReviewsIdMapper.columns()).filter_by(**filter_by)
         query = query.limit(limit).offset(offset)
-        # print(query.compile(compile_kwargs={"literal_binds": True}))
         result = await self.session.execute(query)
         answer = [
-            ReviewsIdMapper.map_to_domain_entity(review)
-            for review in result.scalars().all()
+            ReviewsIdMapper.map_to_domain_entity(review) for review in result.all()
         ]
         if not answer:
             raise self.not_found_exception
         return answer
 
-    async def get_all_filtered(self, limit, offset, **filter_by) -> list[ReviewWithId]:
-        query = select(ReviewsOrm).filter_by(**filter_by).limit(limit).offset(offset)
-        print(query.compile(compile_kwargs={"literal_binds": True}))
+    async def get_all_filtered(
+        self,
+        limit,
+        offset=None,
+        cursor: tuple[datetime, int] | None = None,
+        **filter_by,
+    ) -> list[ReviewWithId]:
+        """
+        Отзывы от новых к старым. Если передан cursor (created_at, id) последнего
+        отзыва предыдущей страницы, используется keyset-пагинация по индексу
+        (exam, created_at, id) вместо OFFSET.
+        """
+        query = (
+            select(*ReviewsIdMapper.columns())
+            .filter_by(**filter_by)
+            .order_by(ReviewsOrm.created_at.desc(), ReviewsOrm.id.desc())
+        )
+        if cursor is not None:
+            query = query.filter(
+                tuple_(ReviewsOrm.created_at, ReviewsOrm.id) < tuple_(*cursor)
+            )
+        elif offset:
+            query = query.offset(offset)
+        query = query.limit(limit)
         result = await self.session.execute(query)
         answer = [
-            ReviewsIdMapper.map_to_domain_entity(review)
-            for review in result.scalars().all()
+            ReviewsIdMapper.map_to_domain_entity(review) for review in result.all()
         ]
         if not answer:
             raise self.not_found_exception
         return answer
 
+    async def search(
+        self,
+        text: str,
+        limit: int,
+        cursor: tuple[float, int] | None = None,
+        **filter_by,
+    ) -> list[tuple[ReviewWithId, float]]:
+        """
+        Полнотекстовый поиск по GIN-индексу search_vector (конфигурация russian).
+        Результаты упорядочены по релевантности, затем по id; cursor (rank, id)
+        последнего результата предыдущей страницы задаёт keyset-пагинацию.
+        """
+        ts_query = func.websearch_to_tsquery("russian", text)
+        rank = func.ts_rank(self.model.search_vector, ts_query)
+        query = (
+            select(*ReviewsIdMapper.columns(), rank.label("rank"))
+            .filter_by(**filter_by)
+            .filter(self.model.search_vector.op("@@")(ts_query))
+            .order_by(rank.desc(), self.model.id.desc())
+        )
+        if cursor is not None:
+            query = query.filter(tuple_(rank, self.model.id) < tuple_(*cursor))
+        result = await self.session.execute(query.limit(limit))
+        return [
+            (ReviewsIdMapper.map_to_domain_entity(row), row.rank)
+            for row in result.all()
+        ]
+
     async def get_one_with_id(self, **filter_by) -> ReviewWithId | None:
-        query = select(ReviewsOrm).filter_by(**filter_by)
+        query = select(*ReviewsIdMapper.columns()).filter_by(**filter_by)
         result = await self.session.execute(query)
         try:
-            result = result.scalar_one()
+            result = result.one()
         except NoResultFound:
             raise self.not_found_exception
         return ReviewsIdMapper.map_to_domain_entity(result)
 
-    async def edit(
-        self, data: ReviewPatch, exclude_unset: bool = False, **filter_by
-    ) -> None:
-        stmt = select(self.model).filter_by(**filter_by)
+    async def delete(self, **filter_by) -> ReviewWithId | None:
+        """
+        DELETE ... RETURNING: возвращает удалённый отзыв или None, если строка
+        не подошла под фильтр (в том числе уже удалена параллельным запросом).
+        """
+        if not filter_by:
+            raise ValueError(
+                "Критерии фильтрации для операции delete не могут быть пустыми."
+            )
+        stmt = (
+            delete(self.model)
+            .filter_by(**filter_by)
+            .returning(*ReviewsIdMapper.columns())
+        )
         result = await self.session.execute(stmt)
-        try:
-            result.scalar_one()
-        except NoResultFound:
-            raise self.not_found_exception
+        row = result.one_or_none()
+        if row is None:
+            return None
+        return ReviewsIdMapper.map_to_domain_entity(row)
 
+    async def edit(
+        self,
+        data: ReviewPatch,
+        exclude_unset: bool = False,
+        edited_before: datetime | None = None,
+        **filter_by,
+    ) -> tuple[ReviewWithId, int]:
+        """
+        Обновляет отзыв одним UPDATE ... RETURNING и возвращает новую версию
+        отзыва и прежний result (для статистики). edited_before дополнительно
+        требует, чтобы отзыв не редактировался позже этого момента. Если ни одна
+        строка не подошла под условия, выбрасывается ReviewNotFoundException.
+        """
+        # Самосоединение отдаёт в RETURNING значения строки до обновления
+        previous = aliased(self.model)
         update_stmt = (
             update(self.model)
             .filter_by(**filter_by)
+            .where(self.model.id == previous.id)
             .values(**data.model_dump(exclude_unset=exclude_unset))
+            .returning(
+                *ReviewsIdMapper.columns(), previous.result.label("previous_result")
+            )
         )
-
-        await self.session.execute(update_stmt)
+        if edited_before is not None:
+            update_stmt = update_stmt.where(self.model.edited_at <= edited_before)
+        result = await self.session.execute(update_stmt)
+        row = result.one_or_none()
+        if row is None:
+            raise self.not_found_exception
+        return ReviewsIdMapper.map_to_domain_entity(row), row.previous_result
@@ -5,7 +5,7 @@ from pydantic_extra_types.phone_numbers import PhoneNumber as PydanticPhoneNumbe
 
 from src.repositories.base import BaseRepository
 from src.models.users import UsersOrm
-from src.repositories.mappers.mappers import UsersMapper
+from src.repositories.mappers.mappers import UsersMapper, UsersWithPasswordMapper
 from src.schemas.users import (
     UserWithHashedPassword,
     User,
@@ -23,12 +23,12 @@ class UsersRepository(BaseRepository):
     async def get_user_with_hashed_password(
         self, phone: str
     ) -> UserWithHashedPassword | None:
-        query = select(self.model).filter_by(phone=phone)
+        query = select(*UsersWithPasswordMapper.columns()).filter_by(phone=phone)
         result = await self.session.execute(query)
-        db_model = result.scalars().one_or_none()
-        if db_model is None:
+        row = result.one_or_none()
+        if row is None:
             return None
-        return UserWithHashedPassword.model_validate(db_model, from_attributes=True)
+        return UsersWithPasswordMapper.map_to_domain_entity(row)
 
     async def add(self, data: UserAdd) -> User:
         phone_to_save = None
@@ -51,7 +51,10 @@ class UsersRepository(BaseRepository):
         if phone_to_save:
             data_dict_for_db["phone"] = phone_to_save
 
-        stmt = insert(self.model).values(**data_dict_for_db).returning(self.model)
+        stmt = (
+            insert(self.model)
+            .values(**data_dict_for_db)
+            .returning(*self.mapper.columns())
+        )
         result_model = await self.session.execute(stmt)
-        created_model_instance = result_model.scalars().one()
-        return self.mapper.map_to_domain_entity(created_model_instance)
+        return self.mapper.map_to_domain_entity(result_model.one())
@@ -10,3 +10,13 @@ class JWTPayload(BaseModel):
     type: str = Field(
         default="access", pattern="^(access|refresh)$"
     )  # "access" or "refresh"
+
+
+class PasswordHasherStats(BaseModel):
+    workers: int
+    in_flight: int
+    queued: int
+    completed: int
+    failed: int
+    rejected: int
+    avg_seconds: float  # среднее время успешного вызова
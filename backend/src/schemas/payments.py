@@ -10,7 +10,12 @@ class CreatePaymentRequest(BaseModel):
 
 class CreatePaymentResponse(BaseModel):
     payment_id: str
-    payment_url: HttpUrl
+    status: str
+    payment_url: Optional[HttpUrl] = None
+
+
+class PaymentStatusResponse(CreatePaymentResponse):
+    pass
 
 
 class PaymentWebhookData(BaseModel):
@@ -28,3 +33,26 @@ class Purchase(BaseModel):
     status: str
     paid_at: Optional[datetime] = None
     fiscal_receipt_url: Optional[str] = None
+    confirmation_url: Optional[str] = None
+
+
+class PaymentOutboxAdd(BaseModel):
+    payment_id: str
+    payload: dict
+
+
+class PaymentOutboxTask(PaymentOutboxAdd):
+    id: int
+    attempts: int
+
+
+class PaymentWebhookEventAdd(BaseModel):
+    event_key: str
+    event: str
+    payment_id: str
+    payload: dict
+
+
+class PaymentWebhookEvent(PaymentWebhookEventAdd):
+    id: int
+    attempts: int
@@ -65,6 +65,13 @@ class ReviewPatch(BaseModel):
     model_config = ConfigDict(extra="ignore")
 
 
+class ReviewStats(BaseModel):
+    exam: str
+    count: int
+    average: float | None = None
+    distribution: dict[int, int]
+
+
 class ReviewsGetBySuperUser(ReviewBase):
     user_id: int
     id: int
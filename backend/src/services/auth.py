@@ -1,7 +1,6 @@
 from datetime import datetime, timezone, timedelta
 
 from fastapi import Request, Response
-from passlib.context import CryptContext
 import jwt
 import phonenumbers
 from pydantic import EmailStr
@@ -13,7 +12,15 @@ from jwt import ExpiredSignatureError, DecodeError
 
 from src.dependencies.db import DBDep
 from src.config import settings
-from src.init import redis_manager
+from src.init import redis_manager, password_hasher, token_payload_cache
+from src.connectors.redis_connector import (
+    CODE_NOT_FOUND,
+    CODE_INVALID,
+    CODE_STORED,
+    CODE_IP_RATE_LIMITED,
+)
+from src.utils.password_hasher import PasswordHasherOverloadedError
+from src.schemas.auth import PasswordHasherStats
 from src.schemas.users import (
     UserLogin,
     UserAdd,
@@ -26,7 +33,9 @@ from src.schemas.users import (
 )
 from src.exceptions.db_exceptions import UserNotFoundException
 from src.exceptions.service_exceptions import (
+    AdminNoRightsServiceException,
     AuthRateLimitServiceException,
+    AuthOverloadedServiceException,
     UserAlreadyExistsServiceException,
     UserNotFoundAuthServiceException,
     AuthCodeInvalidServiceException,
@@ -46,7 +55,7 @@ phone_code_storage = {}
 
 
 class AuthService:
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    pwd_context = password_hasher.pwd_context
 
     def __init__(self):
         self.redis = redis_manager
@@ -77,50 +86,69 @@ class AuthService:
     async def test_send_mail(self, email: EmailStr, code: int):
         print(f"[TEST MAIL] Отправляем код {code} на email {email}")
 
-    async def send_phone_code(self, phone_obj: phonenumbers.PhoneNumber, action: str):
-        phone_e164 = phonenumbers.format_number(
-            phone_obj, phonenumbers.PhoneNumberFormat.E164
+    async def acquire_and_store_code(
+        self, identifier: str, action: str, client_ip: str | None = None
+    ) -> int:
+        code = randint(1000, 9999)
+        # Квота IP проверяется тем же скриптом после кулдауна: запрос, отклонённый
+        # кулдауном или квотой идентификатора, не расходует квоту адреса
+        status, retry_after = await self.redis.acquire_and_store_code(
+            limit_key=f"rate_limit_{action}:{identifier}",
+            code_key=f"{action}:code:{identifier}",
+            quota_key=f"quota_{action}:{identifier}",
+            code=str(code),
+            code_expire=120,
+            cooldown=120,
+            quota_limit=settings.AUTH_CODE_QUOTA,
+            quota_window=settings.AUTH_CODE_QUOTA_WINDOW_SECONDS,
+            ip_quota_key=f"quota_{action}:ip:{client_ip}" if client_ip else None,
+            ip_quota_limit=settings.AUTH_CODE_IP_QUOTA,
         )
-        key_limit = f"rate_limit_{action}:{phone_e164}"
-        ttl = await self.redis.ttl(key_limit)
-        if ttl > 0:
+        if status == CODE_IP_RATE_LIMITED:
             raise AuthRateLimitServiceException(
-                detail=f"Отправить код снова вы можете не ранее, чем через {ttl} секунд."
+                detail=f"Слишком много запросов кода с вашего адреса. Повторите через {retry_after} секунд."
             )
-        await self.redis.set(key_limit, "1", expire=120)  # Это для rate limit
-
-        code = randint(1000, 9999)
-        # Ключ, по которому будет храниться код
-        key_for_code = f"{action}:code:{phone_e164}"
-
-        # Исправленный вызов: (ключ, значение, время жизни)
-        await self.redis.set(key_for_code, str(code), expire=120)
+        if status != CODE_STORED:
+            raise AuthRateLimitServiceException(
+                detail=f"Отправить код снова вы можете не ранее, чем через {retry_after} секунд."
+            )
+        return code
 
+    async def send_phone_code(
+        self,
+        phone_obj: phonenumbers.PhoneNumber,
+        action: str,
+        client_ip: str | None = None,
+    ):
+        phone_e164 = phonenumbers.format_number(
+            phone_obj, phonenumbers.PhoneNumberFormat.E164
+        )
+        # Кулдаун, квоты и сохранение кода - один атомарный запрос в Redis
+        code = await self.acquire_and_store_code(phone_e164, action, client_ip)
         await self.test_send_sms(phone_e164, code)
         return {"status": "Ok"}
 
-    async def send_email_code(self, email: EmailStr, action: str):
-        key_limit = f"rate_limit_{action}:{email}"
-        ttl = await self.redis.ttl(key_limit)
-        if ttl > 0:
-            raise AuthRateLimitServiceException(
-                detail=f"Отправить код снова вы можете не ранее, чем через {ttl} секунд."
-            )
-        await self.redis.set(key_limit, "1", expire=120)
-        code = randint(1000, 9999)
-        key = f"{action}:code:{email}"
-        await self.redis.set(key, str(code), expire=120)
+    async def send_email_code(
+        self, email: EmailStr, action: str, client_ip: str | None = None
+    ):
+        code = await self.acquire_and_store_code(email, action, client_ip)
         await self.test_send_mail(email, code)
         return {"status": "Ok"}
 
-    async def send_registration_email_code(self, data: EmailInput, db: DBDep):
+    async def send_registration_email_code(
+        self, data: EmailInput, db: DBDep, client_ip: str | None = None
+    ):
         existing_user = await db.users.get_one_or_none(email=data.email)
         if existing_user:
             raise UserAlreadyExistsServiceException
-        result = await self.send_email_code(data.email, action="registration")
+        result = await self.send_email_code(
+            data.email, action="registration", client_ip=client_ip
+        )
         return result
 
-    async def send_registration_phone_code(self, data: PhoneInput, db: DBDep):
+    async def send_registration_phone_code(
+        self, data: PhoneInput, db: DBDep, client_ip: str | None = None
+    ):
         valid_phone_obj = await self.validate_russian_phone(data.phone)
         phone_e164 = phonenumbers.format_number(
             valid_phone_obj, phonenumbers.PhoneNumberFormat.E164
@@ -131,10 +159,12 @@ class AuthService:
         if existing_user:
             raise UserAlreadyExistsServiceException
 
-        result = await self.send_phone_code(valid_phone_obj, "registration")
+        result = await self.send_phone_code(valid_phone_obj, "registration", client_ip)
         return result
 
-    async def send_reset_phone_code(self, data: PhoneInput, db: DBDep):
+    async def send_reset_phone_code(
+        self, data: PhoneInput, db: DBDep, client_ip: str | None = None
+    ):
         valid_phone_obj = await self.validate_russian_phone(data.phone)
         phone_e164 = phonenumbers.format_number(
             valid_phone_obj, phonenumbers.PhoneNumberFormat.E164
@@ -143,7 +173,7 @@ class AuthService:
             await db.users.get_one(phone=phone_e164)
         except UserNotFoundException:
             raise UserNotFoundAuthServiceException
-        result = await self.send_phone_code(valid_phone_obj, "reset")
+        result = await self.send_phone_code(valid_phone_obj, "reset", client_ip)
         return result
 
     async def verify_code_phone(
@@ -152,48 +182,33 @@ class AuthService:
         phone_e164 = phonenumbers.format_number(
             phone_obj, phonenumbers.PhoneNumberFormat.E164
         )
-        key = f"{action}:code:{phone_e164}"
-
-        stored_code_value = await self.redis.get(key)
+        result = await self.redis.verify_and_mark(
+            f"{action}:code:{phone_e164}",
+            f"{action}:code_verified:{phone_e164}",
+            str(code_input),
+            expire=300,
+        )
 
-        if not stored_code_value:
+        if result == CODE_NOT_FOUND:
             raise AuthCodeExpiredServiceException(
                 detail="Код подтверждения истек или не был найден."
             )
-
-        stored_code_str = (
-            stored_code_value.decode("utf-8")
-            if isinstance(stored_code_value, bytes)
-            else str(stored_code_value)
-        )
-        input_code_str = str(code_input)
-
-        if stored_code_str != input_code_str:
+        if result == CODE_INVALID:
             raise AuthCodeInvalidServiceException(detail="Неверный код подтверждения.")
-
-        key_verified = f"{action}:code_verified:{phone_e164}"
-        await self.redis.set(key_verified, "true", expire=300)
         return {"status": "Код подтверждён"}
 
     async def verify_code_email(self, email: EmailStr, code_input: int, action: str):
-        key = f"{action}:code:{email}"
-        key_verified = f"{action}:code_verified:{email}"
-        stored_code_bytes = await self.redis.get(key)
-
-        if not stored_code_bytes:
-            raise AuthCodeExpiredServiceException
-
-        stored_code_str = (
-            stored_code_bytes.decode("utf-8")
-            if isinstance(stored_code_bytes, bytes)
-            else str(stored_code_bytes)
+        result = await self.redis.verify_and_mark(
+            f"{action}:code:{email}",
+            f"{action}:code_verified:{email}",
+            str(code_input),
+            expire=300,
         )
-        input_code_str = str(code_input)
 
-        if stored_code_str != input_code_str:
+        if result == CODE_NOT_FOUND:
+            raise AuthCodeExpiredServiceException
+        if result == CODE_INVALID:
             raise AuthCodeInvalidServiceException
-
-        await self.redis.set(key_verified, "true", expire=300)
         return {"status": "Код подтверждён"}
 
     async def verify_registration(self, data: RegistrationInput, db: DBDep):
@@ -243,7 +258,7 @@ class AuthService:
             user_identifier_dict["email"] = data.email
 
         self.validate_password_strength(data.password)
-        hashed_password = self.hash_password(data.password)
+        hashed_password = await self.hash_password(data.password)
 
         new_user_data_dict = {
             "hashed_password": hashed_password,
@@ -283,14 +298,12 @@ class AuthService:
         )
         key_verified = f"{action}:code_verified:{phone_e164}"
         key_code = f"{action}:code:{phone_e164}"
-        await self.redis.delete(key_verified)
-        await self.redis.delete(key_code)
+        await self.redis.delete_many(key_verified, key_code)
 
     async def delete_verified_email_code(self, email: EmailStr, action: str):
         key_verified = f"{action}:code_verified:{email}"
         key_code = f"{action}:code:{email}"
-        await self.redis.delete(key_verified)
-        await self.redis.delete(key_code)
+        await self.redis.delete_many(key_verified, key_code)
 
     async def set_password_after_reset(
         self, data: SetNewPasswordAfterResetInput, db: DBDep
@@ -307,27 +320,15 @@ class AuthService:
             )
 
         self.validate_password_strength(data.new_password)
-        hashed_password = self.hash_password(data.new_password)
+        hashed_password = await self.hash_password(data.new_password)
 
         try:
-            user = await db.users.get_one(phone=phone_e164)
-            updated_user_data = UserAdd(
-                phone=PydanticPhoneNumber(phone_e164),
-                email=user.email,
-                name=user.name,
-                surname=user.surname,
-                grade=user.grade,
-                is_super_user=user.is_super_user,
-                hashed_password=hashed_password,
-            )
             await db.users.edit(
-                user_id=user.id,
-                data_changes=updated_user_data.model_dump(exclude_unset=True),
+                data={"hashed_password": hashed_password}, phone=phone_e164
             )
             await db.commit()
 
-            await self.redis.delete(key_verified)
-            await self.redis.delete(f"reset:code:{phone_e164}")
+            await self.redis.delete_many(key_verified, f"reset:code:{phone_e164}")
 
         except UserNotFoundException:
             raise UserNotFoundAuthServiceException(
@@ -349,11 +350,11 @@ class AuthService:
                 detail="Пользователь не найден для смены пароля."
             )
 
-        if not self.verify_password(data.current_password, user.hashed_password):
+        if not await self.verify_password(data.current_password, user.hashed_password):
             raise IncorrectPasswordServiceException()
 
         self.validate_password_strength(data.new_password)
-        hashed_new_password = self.hash_password(data.new_password)
+        hashed_new_password = await self.hash_password(data.new_password)
 
         await db.users.edit(id=user_id, data={"hashed_password": hashed_new_password})
         await db.commit()
@@ -370,11 +371,22 @@ class AuthService:
         if errors:
             raise AuthPasswordTooWeakServiceException
 
-    def hash_password(self, password: str) -> str:
-        return self.pwd_context.hash(password)
+    async def hash_password(self, password: str) -> str:
+        try:
+            return await password_hasher.hash(password)
+        except PasswordHasherOverloadedError:
+            raise AuthOverloadedServiceException
+
+    async def verify_password(self, plain_password, hashed_password) -> bool:
+        try:
+            return await password_hasher.verify(plain_password, hashed_password)
+        except PasswordHasherOverloadedError:
+            raise AuthOverloadedServiceException
 
-    def verify_password(self, plain_password, hashed_password):
-        return self.pwd_context.verify(plain_password, hashed_password)
+    def get_password_hasher_stats(self, is_super: bool) -> PasswordHasherStats:
+        if not is_super:
+            raise AdminNoRightsServiceException
+        return PasswordHasherStats(**password_hasher.stats())
 
     async def get_current_user_payload(
         self, request: Request, response: Response
@@ -437,8 +449,11 @@ class AuthService:
         )
 
     def decode_access_token(self, token: str):
+        cached_payload = token_payload_cache.get("access", token)
+        if cached_payload is not None:
+            return cached_payload
         try:
-            return jwt.decode(
+            payload = jwt.decode(
                 token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
             )
         except ExpiredSignatureError:
@@ -447,10 +462,15 @@ class AuthService:
             raise AuthTokenInvalidServiceException(token_type="Access")
         except Exception:
             raise AuthTokenInvalidServiceException(token_type="Access")
+        token_payload_cache.set("access", token, payload)
+        return payload
 
     def decode_refresh_token(self, token: str):
+        cached_payload = token_payload_cache.get("refresh", token)
+        if cached_payload is not None:
+            return cached_payload
         try:
-            return jwt.decode(
+            payload = jwt.decode(
                 token,
                 settings.JWT_REFRESH_SECRET_KEY,
                 algorithms=[settings.JWT_ALGORITHM],
@@ -461,6 +481,8 @@ class AuthService:
             raise AuthTokenInvalidServiceException(token_type="Refresh")
         except Exception:
             raise AuthTokenInvalidServiceException(token_type="Refresh")
+        token_payload_cache.set("refresh", token, payload)
+        return payload
 
     async def login_user(self, data: UserLogin, db: DBDep):
         try:
@@ -486,7 +508,7 @@ class AuthService:
         user = await db.users.get_user_with_hashed_password(phone=phone_e164_for_search)
         if not user:
             raise UserNotFoundServiceException
-        if not AuthService().verify_password(data.password, user.hashed_password):
+        if not await self.verify_password(data.password, user.hashed_password):
             raise IncorrectPasswordServiceException
 
         payload = {"id": user.id, "is_super_user": user.is_super_user}
@@ -1,8 +1,7 @@
-import uuid
-from datetime import datetime
+import asyncio
+import time
 
 from uuid import uuid4
-import httpx
 
 from src.exceptions.db_exceptions import (
     PurchaseNotFoundException,
@@ -15,101 +14,30 @@ from src.exceptions.service_exceptions import (
     PaymentValidationServiceException,
     PaymentAlreadyCreatedServiceException,
     PaymentAlreadyPaidServiceException,
-    YooKassaServiceException,
     UserNotAuthenticatedServiceException,
 )
 from src.dependencies.auth import UserIdDep
 from src.dependencies.db import DBDep
-from src.config import settings
 from src.schemas.payments import (
     CreatePaymentRequest,
     CreatePaymentResponse,
+    PaymentStatusResponse,
     Purchase,
-    PaymentWebhookData,
+    PaymentOutboxAdd,
+    PaymentWebhookEventAdd,
 )
-from src.schemas.personal_info import BoughtProduct
+from src.utils.etag import make_etag
+from src.workers.payment_outbox import payment_outbox_worker
+from src.workers.payment_webhooks import payment_webhook_worker
+
+PAYMENT_STATUS_POLL_INTERVAL = 0.5
 
 
 class PaymentsService:
     async def test_create_payment(
         self, data: CreatePaymentRequest, db: DBDep
     ) -> CreatePaymentResponse:
-        if data.email is None:
-            raise PaymentValidationServiceException(detail="Email is required")
-        if data.product_slug is None:
-            raise PaymentValidationServiceException(detail="Product slug is required")
-
-        try:
-            product = await db.products.get_one(slug=data.product_slug)
-        except ProductNotFoundException:
-            raise ProductNotFoundServiceException
-
-        existing_created_purchase = await db.purchases.get_one_or_none(
-            user_id=1, product_slug=data.product_slug, status="Created"
-        )
-        if existing_created_purchase:
-            raise PaymentAlreadyCreatedServiceException
-
-        existing_paid_purchase = await db.purchases.get_one_or_none(
-            user_id=1, product_slug=data.product_slug, status="Paid"
-        )
-        if existing_paid_purchase:
-            raise PaymentAlreadyPaidServiceException
-        payment_id = str(uuid4())
-
-        headers = {"Content-Type": "application/json", "Idempotence-Key": payment_id}
-
-        payload = {
-            "amount": {"value": f"{product.price:.2f}", "currency": "RUB"},
-            "confirmation": {
-                "type": "redirect",
-                "return_url": "http://localhost:3000/pages/profile/standart.html",
-            },
-            "description": product.name,
-            "metadata": {"invoice_id": payment_id},
-        }
-        await db.purchases.add(
-            Purchase(
-                user_id=1,
-                product_slug=data.product_slug,
-                email=data.email,
-                payment_id=payment_id,
-                status="Created",
-            )
-        )
-        await db.commit()
-        async with httpx.AsyncClient(
-            auth=(settings.YOOKASSA_SHOP_ID, settings.YOOKASSA_SECRET_KEY)
-        ) as client:
-            response = await client.post(
-                settings.YOOKASSA_API_URL, json=payload, headers=headers
-            )
-        if response.status_code == 200 or response.status_code == 201:
-            resp_json = response.json()
-            confirmation_url = resp_json["confirmation"]["confirmation_url"]
-            return CreatePaymentResponse(
-                payment_id=payment_id, payment_url=confirmation_url
-            )
-        else:
-            raise YooKassaServiceException(
-                detail=f"ЮKassa error: {response.status_code}, {response.text}"
-            )
-
-    async def confirm_payment(self, payment_id: str):
-        url = f"{settings.YOOKASSA_API_URL}/{payment_id}/capture"
-        idempotence_key = str(uuid.uuid4())
-
-        headers = {"Idempotence-Key": idempotence_key}
-
-        async with httpx.AsyncClient(
-            auth=(settings.YOOKASSA_SHOP_ID, settings.YOOKASSA_SECRET_KEY)
-        ) as client:
-            response = await client.post(url, headers=headers, json={})
-
-        if response.status_code not in (200, 201):
-            raise YooKassaServiceException(
-                detail=f"Failed to capture payment: {response.status_code}, {response.text}"
-            )
+        return await self.create_payment(data=data, db=db, user_id=1)
 
     async def create_payment(
         self,
@@ -117,6 +45,10 @@ class PaymentsService:
         db: DBDep,
         user_id: UserIdDep,
     ) -> CreatePaymentResponse:
+        """
+        Сохраняет покупку и задачу outbox в одной транзакции. Запрос к ЮKassa
+        выполняет воркер, ссылку на оплату клиент получает через get_payment_status.
+        """
         if data.email is None:
             raise PaymentValidationServiceException(detail="Email is required")
         if data.product_slug is None:
@@ -126,21 +58,8 @@ class PaymentsService:
         except ProductNotFoundException:
             raise ProductNotFoundServiceException
 
-        existing_created_purchase = await db.purchases.get_one_or_none(
-            user_id=user_id, product_slug=data.product_slug, status="Created"
-        )
-        if existing_created_purchase:
-            raise PaymentAlreadyCreatedServiceException
-
-        existing_paid_purchase = await db.purchases.get_one_or_none(
-            user_id=user_id, product_slug=data.product_slug, status="Paid"
-        )
-        if existing_paid_purchase:
-            raise PaymentAlreadyPaidServiceException
         payment_id = str(uuid4())
 
-        headers = {"Content-Type": "application/json", "Idempotence-Key": payment_id}
-
         payload = {
             "amount": {"value": f"{product.price:.2f}", "currency": "RUB"},
             "confirmation": {
@@ -150,7 +69,7 @@ class PaymentsService:
             "description": product.name,
             "metadata": {"invoice_id": payment_id},
         }
-        await db.purchases.add(
+        active_status = await db.purchases.add_if_not_active(
             Purchase(
                 user_id=user_id,
                 product_slug=data.product_slug,
@@ -159,95 +78,84 @@ class PaymentsService:
                 status="Created",
             )
         )
+        if active_status == "Paid":
+            raise PaymentAlreadyPaidServiceException
+        if active_status is not None:
+            raise PaymentAlreadyCreatedServiceException
+        await db.payment_outbox.add(
+            PaymentOutboxAdd(payment_id=payment_id, payload=payload)
+        )
         await db.commit()
-        async with httpx.AsyncClient(
-            auth=(settings.YOOKASSA_SHOP_ID, settings.YOOKASSA_SECRET_KEY)
-        ) as client:
-            response = await client.post(
-                settings.YOOKASSA_API_URL, json=payload, headers=headers
-            )
-        if response.status_code == 200 or response.status_code == 201:
-            resp_json = response.json()
-            confirmation_url = resp_json["confirmation"]["confirmation_url"]
-            return CreatePaymentResponse(
-                payment_id=payment_id, payment_url=confirmation_url
-            )
-        else:
-            raise YooKassaServiceException(
-                detail=f"ЮKassa error: {response.status_code}, {response.text}"
+        payment_outbox_worker.notify()
+        return CreatePaymentResponse(payment_id=payment_id, status="Pending")
+
+    async def get_payment_status(
+        self, payment_id: str, user_id: UserIdDep, db: DBDep, wait: int = 0
+    ) -> PaymentStatusResponse:
+        """
+        Статус платежа пользователя. Пока воркер не получил ссылку от ЮKassa,
+        статус Pending; при wait > 0 ответ ждёт ссылку до wait секунд (long polling).
+        """
+        if user_id is None:
+            raise UserNotAuthenticatedServiceException
+        deadline = time.monotonic() + wait
+        while True:
+            purchase = await db.purchases.get_one_or_none(
+                payment_id=payment_id, user_id=user_id
             )
+            if purchase is None:
+                raise PurchaseNotFoundServiceException
+            pending = purchase.status == "Created" and purchase.confirmation_url is None
+            if not pending or time.monotonic() >= deadline:
+                break
+            # Отпускаем соединение, чтобы следующий опрос увидел свежие данные
+            await db.rollback()
+            await asyncio.sleep(PAYMENT_STATUS_POLL_INTERVAL)
+        return PaymentStatusResponse(
+            payment_id=payment_id,
+            status="Pending" if pending else purchase.status,
+            payment_url=purchase.confirmation_url,
+        )
 
     async def process_webhook(self, payload: dict, db: DBDep):
+        """
+        Сохраняет уведомление и сразу отвечает ЮKassa. Повторная доставка
+        события отсекается уникальным ключом, обработку выполняет воркер.
+        """
         event = payload.get("event")
         obj = payload.get("object", {})
 
         payment_id = obj.get("metadata", {}).get("invoice_id")
-        if not payment_id:
+        # Без object.id воркер не сможет ни подтвердить платёж, ни отличить повтор
+        if not event or not payment_id or not obj.get("id"):
             raise WebhookWrongFormatServiceException
-        try:
-            purchase_orm_object = await db.purchases.get_one(payment_id=payment_id)
-        except PurchaseNotFoundException:
-            raise PurchaseNotFoundServiceException
 
-        purchase_update_data = PaymentWebhookData(
-            payment_id=purchase_orm_object.payment_id,
-            status=purchase_orm_object.status,
-            paid_at=purchase_orm_object.paid_at,
-            fiscal_receipt_url=purchase_orm_object.fiscal_receipt_url,
+        is_new = await db.payment_webhook_events.add_if_absent(
+            PaymentWebhookEventAdd(
+                event_key=f"{event}:{obj['id']}",
+                event=event,
+                payment_id=payment_id,
+                payload=payload,
+            )
         )
-
-        if event == "payment.succeeded":
-            purchase_update_data.status = "Paid"
-            paid_at_str = obj.get("paid_at")
-            if paid_at_str:
-                try:
-                    purchase_update_data.paid_at = datetime.fromisoformat(
-                        paid_at_str.replace("Z", "+00:00").split(".")[0]
-                    )
-                except ValueError:
-                    try:
-                        purchase_update_data.paid_at = datetime.fromisoformat(
-                            paid_at_str
-                        )
-                    except ValueError:
-                        print(
-                            f"Warning: Could not parse paid_at_str from webhook: {paid_at_str}"
-                        )
-                        pass
-
-            receipt_object = obj.get("receipt")
-            if receipt_object and receipt_object.get("status") == "succeeded":
-                pass
-
-        elif event == "payment.canceled":
-            purchase_update_data.status = "Canceled"
-        elif event == "payment.waiting_for_capture":
-            await self.confirm_payment(obj["id"])
-            return {"status": "capturing"}
-        else:
-            return {"status": "ignored", "reason": f"Unhandled event: {event}"}
-
-        try:
-            await db.purchases.edit(purchase_update_data, payment_id=payment_id)
-        except PurchaseNotFoundException:
-            raise PurchaseNotFoundServiceException
         await db.commit()
-        return {"status": "ok"}
+        if not is_new:
+            return {"status": "duplicate"}
+        payment_webhook_worker.notify()
+        return {"status": "accepted"}
+
+    async def get_purchases_etag(self, user_id: UserIdDep, db: DBDep) -> str:
+        if user_id is None:
+            raise UserNotAuthenticatedServiceException
+        count, last_paid_at = await db.purchases.get_bought_version(user_id)
+        # В ответ входят поля продуктов, поэтому учитывается и версия каталога
+        catalog_version = await db.products.get_catalog_version()
+        return make_etag("purchases", user_id, count, last_paid_at, catalog_version)
 
     async def get_purchases(self, user_id: UserIdDep, db: DBDep):
         try:
             if user_id is None:
                 raise UserNotAuthenticatedServiceException
-            purchases = await db.purchases.get_all(user_id=user_id, status="Paid")
+            return await db.purchases.get_bought_products(user_id=user_id)
         except PurchaseNotFoundException:
             raise PurchaseNotFoundServiceException
-        answer = []
-        for p in purchases:
-            try:
-                product_model = await db.products.get_one(slug=p.product_slug)
-                answer.append(
-                    BoughtProduct(**(product_model.model_dump()), paid_at=p.paid_at)
-                )
-            except ProductNotFoundException:
-                pass
-        return answer
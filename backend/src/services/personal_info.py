@@ -1,6 +1,7 @@
 from src.dependencies.auth import UserIdDep
 from src.dependencies.db import DBDep
 from src.schemas.users import UserUpdate, User
+from src.utils.etag import make_etag
 from src.exceptions.db_exceptions import (
     UserNotFoundException,
     ProductNotFoundException,
@@ -21,14 +22,19 @@ class InfoService:
             raise UserNotFoundServiceException
         return user
 
+    @staticmethod
+    def get_user_info_etag(user: User) -> str:
+        # Строка пользователя читается по первичному ключу, отдельной версии
+        # у неё нет; при совпадении экономится сериализация и передача тела
+        return make_etag("user", *user.model_dump().values())
+
     async def update_user_info(
         self, new_data: UserUpdate, user_id: UserIdDep, db: DBDep
     ):
         try:
-            await db.users.get_one(id=user_id)
+            await db.users.edit(data=new_data, exclude_unset_for_model=True, id=user_id)
         except UserNotFoundException:
             raise UserNotFoundServiceException
-        await db.users.edit(data=new_data, exclude_unset_for_model=True, id=user_id)
         await db.commit()
         return {"status": "User info updated"}
 
@@ -1,5 +1,6 @@
 from src.dependencies.auth import UserRoleDep
 from src.dependencies.db import DBDep
+from src.init import products_cache, redis_manager
 from src.schemas.products import Product, ProductPatch
 from src.exceptions.service_exceptions import (
     AdminNoRightsServiceException,
@@ -7,17 +8,24 @@ from src.exceptions.service_exceptions import (
     ProductAlreadyExistsServiceException,
 )
 from src.exceptions.db_exceptions import ProductNotFoundException
+from src.utils.etag import make_etag
 
 
 class ProductService:
     async def get_products(self, is_super: UserRoleDep, db: DBDep):
         if not is_super:
             raise AdminNoRightsServiceException
-        try:
-            result = await db.products.get_all()
-            return result
-        except ProductNotFoundException:
+        # Тот же снимок каталога, из которого считается ETag: список с реплики
+        # мог бы отставать от версии, уже отданной клиенту
+        result = await db.products.get_catalog()
+        if not result:
             raise ProductNotFoundServiceException
+        return result
+
+    async def get_products_etag(self, is_super: UserRoleDep, db: DBDep) -> str:
+        if not is_super:
+            raise AdminNoRightsServiceException
+        return make_etag("products", await db.products.get_catalog_version())
 
     async def get_product(self, slug: str, is_super: UserRoleDep, db: DBDep):
         if not is_super:
@@ -42,6 +50,7 @@ class ProductService:
 
             await db.products.add(data)
             await db.commit()
+            await products_cache.invalidate_everywhere(redis_manager)
             return {"status": "Ok, product is added"}
         except ProductNotFoundException:
             raise ProductNotFoundServiceException
@@ -52,11 +61,9 @@ class ProductService:
         if not is_super:
             raise AdminNoRightsServiceException
         try:
-            product = await db.products.get_one_or_none(slug=slug)
-            if product is None:
-                raise ProductNotFoundServiceException
             await db.products.edit(data, exclude_unset_for_model=True, slug=slug)
             await db.commit()
+            await products_cache.invalidate_everywhere(redis_manager)
             return {"status": "Ok, product is edited"}
         except ProductNotFoundException:
             raise ProductNotFoundServiceException
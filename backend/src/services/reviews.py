@@ -1,7 +1,10 @@
 from datetime import datetime, timezone, timedelta
 
+from pydantic import TypeAdapter
+
 from src.dependencies.auth import PaginationDep, UserRoleDep
 from src.dependencies.db import DBDep
+from src.init import reviews_cache
 
 from src.exceptions.db_exceptions import (
     ReviewNotFoundException,
@@ -17,8 +20,24 @@ from src.exceptions.service_exceptions import (
     ProductNotFoundServiceException,
     ReviewEditConflictServiceException,
     AdminNoRightsServiceException,
+    ReviewCursorInvalidServiceException,
+)
+from src.schemas.reviews import (
+    ReviewAdd,
+    ReviewAddRequest,
+    ReviewPatch,
+    ReviewStats,
+    ReviewWithId,
 )
-from src.schemas.reviews import ReviewAdd, ReviewAddRequest, ReviewPatch
+from src.utils.etag import make_etag
+from src.utils.pagination import (
+    encode_cursor,
+    decode_cursor,
+    encode_rank_cursor,
+    decode_rank_cursor,
+)
+
+reviews_list_adapter = TypeAdapter(list[ReviewWithId])
 
 
 class ReviewsService:
@@ -27,28 +46,119 @@ class ReviewsService:
         exam_from_api: str,
         db: DBDep,
         pagination: PaginationDep,
+        cursor: str | None = None,
+        etag_issued: bool = True,
     ):
-        db_exam_value_for_filter = ""
-        if exam_from_api == "ege":
-            db_exam_value_for_filter = "ЕГЭ"
-        elif exam_from_api == "oge":
-            db_exam_value_for_filter = "ОГЭ"
-        else:
-            raise ReviewWrongFormatServiceException(
-                detail=f"Недопустимый тип экзамена в URL: {exam_from_api}. Ожидается 'ege' или 'oge'."
-            )
+        """
+        etag_issued - ушёл ли клиенту ETag с версией кэша. Тогда промах читается
+        с основной БД: реплика может ещё не видеть запись, из-за которой
+        сменилась версия. Без ETag и без Redis ответ ни к какой версии не
+        привязан, и список читается с реплики.
+        """
+        db_exam_value_for_filter = self.exam_from_api(exam_from_api)
 
         per_page = pagination.per_page or 5
+        keyset = None
+        if cursor:
+            try:
+                keyset = decode_cursor(cursor)
+            except ValueError:
+                raise ReviewCursorInvalidServiceException
+        cache_key = f"{pagination.page}:{per_page}:{cursor or ''}"
+        cache_version, cached = await reviews_cache.get(
+            db_exam_value_for_filter, cache_key
+        )
+        if cached is not None:
+            return reviews_list_adapter.validate_json(cached)
+        # Версия есть - результат уйдёт в кэш под ней; ETag - версия уже у клиента
+        reader = db.primary if cache_version is not None or etag_issued else db
         try:
-            data = await db.reviews.get_all_filtered(
+            data = await reader.reviews.get_all_filtered(
                 limit=per_page,
                 offset=per_page * (pagination.page - 1),
+                cursor=keyset,
                 exam=db_exam_value_for_filter,
             )
         except ReviewNotFoundException:
             raise ReviewNotFoundServiceException
+        await reviews_cache.set(
+            db_exam_value_for_filter,
+            cache_version,
+            cache_key,
+            reviews_list_adapter.dump_json(data).decode("utf-8"),
+        )
         return data
 
+    async def get_reviews_etag(
+        self,
+        exam_from_api: str,
+        pagination: PaginationDep,
+        cursor: str | None = None,
+    ) -> str | None:
+        """
+        ETag списка отзывов из версии тега reviews_cache, которая растёт при
+        каждом изменении отзывов экзамена. БД не читается; без Redis - None.
+        """
+        exam = self.exam_from_api(exam_from_api)
+        version = await reviews_cache.version(exam)
+        if version is None:
+            return None
+        return make_etag(
+            "reviews", exam, version, pagination.page, pagination.per_page, cursor
+        )
+
+    async def get_stats(self, exam_from_api: str, db: DBDep) -> ReviewStats:
+        return await db.review_stats.get(self.exam_from_api(exam_from_api))
+
+    @staticmethod
+    def exam_from_api(exam_from_api: str) -> str:
+        if exam_from_api == "ege":
+            return "ЕГЭ"
+        if exam_from_api == "oge":
+            return "ОГЭ"
+        raise ReviewWrongFormatServiceException(
+            detail=f"Недопустимый тип экзамена в URL: {exam_from_api}. Ожидается 'ege' или 'oge'."
+        )
+
+    @staticmethod
+    def get_next_cursor(
+        reviews: list[ReviewWithId], pagination: PaginationDep
+    ) -> str | None:
+        # Неполная страница означает, что дальше отзывов нет
+        if len(reviews) < (pagination.per_page or 5):
+            return None
+        last = reviews[-1]
+        return encode_cursor(last.created_at, last.id)
+
+    async def search_reviews(
+        self,
+        text: str,
+        db: DBDep,
+        pagination: PaginationDep,
+        cursor: str | None = None,
+        exam_from_api: str | None = None,
+    ) -> tuple[list[ReviewWithId], str | None]:
+        """
+        Возвращает страницу найденных отзывов и курсор следующей страницы.
+        Поиск ранжированный, поэтому страницы листаются только курсором.
+        """
+        filter_by = {}
+        if exam_from_api is not None:
+            filter_by["exam"] = self.exam_from_api(exam_from_api)
+        per_page = pagination.per_page or 5
+        keyset = None
+        if cursor:
+            try:
+                keyset = decode_rank_cursor(cursor)
+            except ValueError:
+                raise ReviewCursorInvalidServiceException
+        found = await db.reviews.search(text, per_page, keyset, **filter_by)
+        next_cursor = None
+        if len(found) == per_page:
+            last_review, last_rank = found[-1]
+            next_cursor = encode_rank_cursor(last_rank, last_review.id)
+        return [review for review, _ in found], next_cursor
+
     async def get_reviews_with_id(
         self,
         db: DBDep,
@@ -115,7 +225,9 @@ class ReviewsService:
 
         # Добавляем отзыв, где data.exam это "ЕГЭ" или "ОГЭ"
         await db.reviews.add(data)
+        await db.review_stats.adjust(data.exam, data.result, 1)
         await db.commit()
+        await reviews_cache.invalidate(data.exam)
         return {"status": "Ok"}
 
     async def edit_review(
@@ -125,37 +237,51 @@ class ReviewsService:
         review_id: int,
         review_data: ReviewPatch,
     ):
+        now_utc = datetime.now(timezone.utc)
+        # Права и интервал редактирования проверяет сам UPDATE; отзыв читаем
+        # только если он не обновился, чтобы вернуть точную ошибку
         try:
-            review = await db.reviews.get_one_with_id(id=review_id)
+            review, previous_result = await db.reviews.edit(
+                review_data,
+                exclude_unset=True,
+                edited_before=now_utc - timedelta(hours=1),
+                id=review_id,
+                user_id=user_id,
+            )
         except ReviewNotFoundException:
-            raise ReviewNotFoundServiceException
-
-        if review.user_id != user_id:
-            raise ReviewNoRightsServiceException
-
-        now_utc = datetime.now(timezone.utc)
-        delta = now_utc - review.edited_at
-        if delta < timedelta(hours=1):
-            minutes_left = 60 - int(delta.total_seconds() // 60)
+            try:
+                review = await db.reviews.get_one_with_id(id=review_id)
+            except ReviewNotFoundException:
+                raise ReviewNotFoundServiceException
+            if review.user_id != user_id:
+                raise ReviewNoRightsServiceException
+            delta = now_utc - review.edited_at
+            minutes_left = max(1, 60 - int(delta.total_seconds() // 60))
             raise ReviewEditConflictServiceException(
                 detail=f"Редактирование возможно только через {minutes_left} мин."
             )
 
-        await db.reviews.edit(review_data, exclude_unset=True, id=review_id)
+        if review.result != previous_result:
+            await db.review_stats.adjust(review.exam, previous_result, -1)
+            await db.review_stats.adjust(review.exam, review.result, 1)
         await db.commit()
+        await reviews_cache.invalidate(review.exam)
         return {"status": "Ok"}
 
     async def delete_review(self, db: DBDep, user_id: int, review_id: int):
-        try:
-            review = await db.reviews.get_one_with_id(id=review_id)
-        except ReviewNotFoundException:
-            raise ReviewNotFoundServiceException
-        if review.user_id != user_id:
+        # Статистику уменьшает только тот запрос, чей DELETE вернул строку;
+        # отзыв читаем лишь при неудаче, чтобы выбрать ошибку
+        review = await db.reviews.delete(id=review_id, user_id=user_id)
+        if review is None:
+            try:
+                await db.reviews.get_one_with_id(id=review_id)
+            except ReviewNotFoundException:
+                raise ReviewNotFoundServiceException
             raise ReviewNoRightsServiceException
 
-        await db.reviews.delete(id=review_id)
-        await db.commit()
+        await db.review_stats.adjust(review.exam, review.result, -1)
         await db.commit()
+        await reviews_cache.invalidate(review.exam)
         return {"status": "ok"}
 
     async def admin_get_reviews(
@@ -177,17 +303,27 @@ class ReviewsService:
             raise ReviewNotFoundServiceException
         return data
 
+    async def admin_search_reviews(
+        self,
+        text: str,
+        is_super: UserRoleDep,
+        db: DBDep,
+        pagination: PaginationDep,
+        cursor: str | None = None,
+    ) -> tuple[list[ReviewWithId], str | None]:
+        if not is_super:
+            raise AdminNoRightsServiceException
+        return await self.search_reviews(text, db, pagination, cursor)
+
     async def admin_delete_review(
         self, db: DBDep, is_super: UserRoleDep, review_id: int
     ):
-        try:
-            review = await db.reviews.get_one_with_id(id=review_id)
-        except ReviewNotFoundException:
-            raise ReviewNotFoundServiceException
-        if review is None:
-            raise ReviewNotFoundServiceException
         if not is_super:
             raise AdminNoRightsServiceException
-        await db.reviews.delete(id=review_id)
+        review = await db.reviews.delete(id=review_id)
+        if review is None:
+            raise ReviewNotFoundServiceException
+        await db.review_stats.adjust(review.exam, review.result, -1)
         await db.commit()
+        await reviews_cache.invalidate(review.exam)
         return {"status": "ok"}
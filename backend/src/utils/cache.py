@@ -0,0 +1,78 @@
+import time
+
+from redis.exceptions import RedisError
+
+from src.connectors.redis_connector import RedisManager
+
+
+class VersionedCache:
+    """
+    Кэш поверх Redis с версионированными ключами.
+    Каждый тег (например, тип экзамена) имеет свой счётчик версии. Запись под тегом
+    увеличивает счётчик, и все старые ключи этого тега перестают читаться, а затем
+    сами истекают по TTL. Ошибки Redis не ломают запрос: кэш просто пропускается.
+    """
+
+    def __init__(self, redis_manager: RedisManager, namespace: str, expire: int):
+        self.redis_manager = redis_manager
+        self.namespace = namespace
+        self.expire = expire
+
+    def _version_key(self, tag: str) -> str:
+        return f"{self.namespace}:{tag}:version"
+
+    async def _get_version(self, tag: str) -> str:
+        version = await self.redis_manager.get(self._version_key(tag))
+        if version is None:
+            # Счётчик начинается с текущего времени, а не с нуля: после потери
+            # данных Redis версии не повторяются и старые ETag не совпадут
+            await self.redis_manager.set_if_absent(
+                self._version_key(tag), str(time.time_ns())
+            )
+            version = await self.redis_manager.get(self._version_key(tag))
+        return version
+
+    def _data_key(self, tag: str, version: str, key: str) -> str:
+        return f"{self.namespace}:{tag}:v{version}:{key}"
+
+    async def get(self, tag: str, key: str) -> tuple[str | None, str | None]:
+        """
+        Возвращает (версия, значение). Версию нужно передать обратно в set:
+        если тег инвалидировали, пока данные читались из БД, запись уйдёт
+        в устаревшую версию и никогда не будет прочитана.
+        """
+        if self.redis_manager.redis is None:
+            return None, None
+        try:
+            version = await self._get_version(tag)
+            value = await self.redis_manager.get(self._data_key(tag, version, key))
+            return version, value
+        except RedisError:
+            return None, None
+
+    async def version(self, tag: str) -> str | None:
+        """Текущая версия тега; None, если Redis недоступен."""
+        if self.redis_manager.redis is None:
+            return None
+        try:
+            return await self._get_version(tag)
+        except RedisError:
+            return None
+
+    async def set(self, tag: str, version: str | None, key: str, value: str) -> None:
+        if self.redis_manager.redis is None or version is None:
+            return
+        try:
+            await self.redis_manager.set(
+                self._data_key(tag, version, key), value, expire=self.expire
+            )
+        except RedisError:
+            pass
+
+    async def invalidate(self, tag: str) -> None:
+        if self.redis_manager.redis is None:
+            return
+        try:
+            await self.redis_manager.incr(self._version_key(tag))
+        except RedisError:
+            pass
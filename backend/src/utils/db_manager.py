@@ -1,26 +1,94 @@
+from functools import cached_property
+
+from src.repositories.payment_outbox import PaymentOutboxRepository
+from src.repositories.payment_webhook_events import PaymentWebhookEventsRepository
 from src.repositories.products import ProductsRepository
 from src.repositories.purchases import PurchasesRepository
 from src.repositories.reviews import ReviewsRepository
+from src.repositories.review_stats import ReviewStatsRepository
 from src.repositories.users import UsersRepository
 
 
 class DBManager:
-    def __init__(self, session_factory):
+    """
+    Сессия открывается при первом обращении к репозиторию, репозитории создаются
+    по требованию. Запрос, который не трогает БД, не создаёт ни сессии, ни
+    соединения.
+    primary_session_factory задаётся для сессии на реплике: через primary идут
+    чтения, которыми заполняются общие кэши, чтобы отставание реплики не
+    попадало в кэш после инвалидации.
+    """
+
+    def __init__(self, session_factory, primary_session_factory=None):
         self.session_factory = session_factory
+        self.primary_session_factory = primary_session_factory
+        self._session = None
+        self._primary = None
 
     async def __aenter__(self):
-        self.session = self.session_factory()
-
-        self.users = UsersRepository(self.session)
-        self.reviews = ReviewsRepository(self.session)
-        self.products = ProductsRepository(self.session)
-        self.purchases = PurchasesRepository(self.session)
-
         return self
 
     async def __aexit__(self, *args):
-        await self.session.rollback()
-        await self.session.close()
+        if self._primary is not None:
+            await self._primary.__aexit__(*args)
+        if self._session is None:
+            return
+        # После commit или без единого запроса откатывать нечего
+        if self._session.in_transaction():
+            await self._session.rollback()
+        await self._session.close()
+
+    @property
+    def primary(self) -> "DBManager":
+        """Менеджер на основной БД; для сессии на основной БД - он сам."""
+        if self.primary_session_factory is None:
+            return self
+        if self._primary is None:
+            self._primary = DBManager(session_factory=self.primary_session_factory)
+        return self._primary
+
+    @property
+    def session(self):
+        if self._session is None:
+            self._session = self.session_factory()
+        return self._session
+
+    @cached_property
+    def users(self) -> UsersRepository:
+        return UsersRepository(self.session)
+
+    @cached_property
+    def reviews(self) -> ReviewsRepository:
+        return ReviewsRepository(self.session)
+
+    @cached_property
+    def review_stats(self) -> ReviewStatsRepository:
+        return ReviewStatsRepository(self.session)
+
+    @cached_property
+    def products(self) -> ProductsRepository:
+        # Каталог - общий кэш процесса, поэтому грузится только с основной БД
+        return ProductsRepository(
+            self.session, catalog_session=lambda: self.primary.session
+        )
+
+    @cached_property
+    def purchases(self) -> PurchasesRepository:
+        return PurchasesRepository(self.session)
+
+    @cached_property
+    def payment_outbox(self) -> PaymentOutboxRepository:
+        return PaymentOutboxRepository(self.session)
+
+    @cached_property
+    def payment_webhook_events(self) -> PaymentWebhookEventsRepository:
+        return PaymentWebhookEventsRepository(self.session)
 
     async def commit(self):
-        await self.session.commit()
+        if self._session is not None:
+            await self._session.commit()
+
+    async def rollback(self):
+        # Завершает транзакцию и возвращает соединение в пул до следующего запроса
+        if self._session is not None:
+            await self._session.rollback()
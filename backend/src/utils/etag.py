@@ -0,0 +1,42 @@
+import hashlib
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts) -> str:
+    """
+    Слабый ETag из версии данных (счётчик, max(дата)/count, отпечаток каталога),
+    а не из готового тела ответа: при совпадении тело даже не сериализуется.
+    """
+    raw = "\x1f".join(str(part) for part in parts)
+    digest = hashlib.blake2b(raw.encode("utf-8"), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    # Для If-None-Match используется слабое сравнение (RFC 9110, 13.1.2)
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in candidates
+
+
+def apply_etag(
+    request: Request,
+    response: Response,
+    etag: str | None,
+    cache_control: str = "no-cache",
+) -> Response | None:
+    """
+    Проставляет ETag и Cache-Control. Если клиент прислал совпадающий
+    If-None-Match, возвращает готовый ответ 304, который эндпоинт отдаёт как есть.
+    """
+    if etag is None:
+        return None
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
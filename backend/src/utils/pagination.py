@@ -0,0 +1,38 @@
+import base64
+from datetime import datetime
+
+
+def encode_cursor(created_at: datetime, object_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{object_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Разбирает курсор, выданный encode_cursor.
+    Бросает ValueError, если курсор повреждён или подделан.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        created_at_str, object_id_str = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at_str), int(object_id_str)
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def encode_rank_cursor(rank: float, object_id: int) -> str:
+    # repr даёт точное представление float, поэтому сравнение с ts_rank не теряет строк
+    raw = f"{rank!r}|{object_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_rank_cursor(cursor: str) -> tuple[float, int]:
+    """Разбирает курсор, выданный encode_rank_cursor. Бросает ValueError."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        rank_str, object_id_str = raw.rsplit("|", 1)
+        return float(rank_str), int(object_id_str)
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
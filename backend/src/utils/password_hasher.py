@@ -0,0 +1,81 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+
+class PasswordHasherOverloadedError(RuntimeError):
+    pass
+
+
+class PasswordHasher:
+    """
+    Выполняет bcrypt в отдельном пуле потоков, чтобы не блокировать event loop.
+    bcrypt отпускает GIL, поэтому потоки действительно работают параллельно.
+    Число ожидающих задач ограничено: при переполнении очереди сразу
+    бросается PasswordHasherOverloadedError вместо бесконечного ожидания.
+    """
+
+    def __init__(self, pwd_context, max_workers: int, max_pending: int):
+        self.pwd_context = pwd_context
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: ThreadPoolExecutor | None = None
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._total_seconds = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="password-hasher"
+            )
+        return self._executor
+
+    async def _run(self, func, *args):
+        if self._in_flight >= self.max_workers + self.max_pending:
+            self._rejected += 1
+            raise PasswordHasherOverloadedError
+        self._in_flight += 1
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                self._get_executor(), partial(func, *args)
+            )
+        except Exception:
+            # Ошибки считаются отдельно и не искажают среднее время
+            self._failed += 1
+            raise
+        finally:
+            self._in_flight -= 1
+        self._completed += 1
+        self._total_seconds += time.perf_counter() - started
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.pwd_context.hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(self.pwd_context.verify, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        """Метрики пула для /admin/metrics/password-hasher."""
+        return {
+            "workers": self.max_workers,
+            "in_flight": self._in_flight,
+            "queued": max(self._in_flight - self.max_workers, 0),
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "avg_seconds": (
+                self._total_seconds / self._completed if self._completed else 0.0
+            ),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
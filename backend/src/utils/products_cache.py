@@ -0,0 +1,94 @@
+import asyncio
+import hashlib
+import time
+from collections import Counter
+
+from redis.exceptions import RedisError
+
+from src.connectors.redis_connector import RedisManager
+from src.schemas.products import Product
+
+PRODUCTS_INVALIDATION_CHANNEL = "products:invalidate"
+LISTENER_RETRY_DELAY = 1
+LISTENER_MAX_RETRY_DELAY = 30
+
+
+class ProductsCatalogCache:
+    """
+    Каталог продуктов в памяти процесса, индексированный по slug и name.
+    Продуктов немного и меняются они редко, поэтому каталог грузится целиком
+    и живёт до истечения TTL или до явной инвалидации. Другие воркеры узнают
+    об изменениях через Redis pub/sub.
+    """
+
+    def __init__(self, expire: int):
+        self.expire = expire
+        self._by_field: dict[str, dict[str, Product]] = {}
+        self._loaded_at: float | None = None
+        # Отпечаток содержимого каталога: одинаков во всех воркерах при одних данных
+        self.version: str | None = None
+
+    def is_expired(self) -> bool:
+        return (
+            self._loaded_at is None or time.monotonic() - self._loaded_at > self.expire
+        )
+
+    def replace(self, products: list[Product]) -> None:
+        name_counts = Counter(p.name for p in products)
+        self._by_field = {
+            "slug": {p.slug: p for p in products},
+            # Имя не уникально в БД, поэтому неоднозначные имена не кэшируем
+            "name": {p.name: p for p in products if name_counts[p.name] == 1},
+        }
+        self._loaded_at = time.monotonic()
+        dumped = repr([p.model_dump() for p in sorted(products, key=lambda p: p.slug)])
+        digest = hashlib.blake2b(dumped.encode("utf-8"), digest_size=12)
+        self.version = digest.hexdigest()
+
+    def get(self, field: str, value) -> Product | None:
+        product = self._by_field.get(field, {}).get(value)
+        return product.model_copy() if product is not None else None
+
+    def all(self) -> list[Product]:
+        return [p.model_copy() for p in self._by_field.get("slug", {}).values()]
+
+    def invalidate(self) -> None:
+        self._by_field = {}
+        self._loaded_at = None
+        self.version = None
+
+    async def invalidate_everywhere(self, redis_manager: RedisManager) -> None:
+        self.invalidate()
+        if redis_manager.redis is None:
+            return
+        try:
+            await redis_manager.publish(PRODUCTS_INVALIDATION_CHANNEL, "1")
+        except RedisError as e:
+            print(f"WARNING: Failed to publish products cache invalidation: {e}")
+
+    async def listen_for_invalidation(self, redis_manager: RedisManager) -> None:
+        """
+        Слушает канал инвалидации до отмены задачи. После обрыва связи
+        переподписывается с экспоненциальной задержкой; пока подписки нет,
+        кэш всё равно обновляется по TTL.
+        """
+        delay = LISTENER_RETRY_DELAY
+        while True:
+            try:
+                pubsub = await redis_manager.subscribe(PRODUCTS_INVALIDATION_CHANNEL)
+            except RedisError as e:
+                print(f"WARNING: Products cache invalidation listener is down: {e}")
+            else:
+                # Пока подписки не было, сообщения могли потеряться
+                self.invalidate()
+                delay = LISTENER_RETRY_DELAY
+                try:
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self.invalidate()
+                except RedisError as e:
+                    print(f"WARNING: Products cache invalidation listener lost: {e}")
+                finally:
+                    await pubsub.aclose()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, LISTENER_MAX_RETRY_DELAY)
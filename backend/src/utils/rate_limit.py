@@ -0,0 +1,92 @@
+import re
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+from redis.exceptions import RedisError
+
+
+class RateLimit(NamedTuple):
+    capacity: int  # размер допустимого всплеска
+    period: float  # за сколько секунд bucket пополняется полностью
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.capacity / self.period
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    remaining: int
+    retry_after: float
+
+
+class RateLimitRule:
+    """
+    Лимит для маршрута: method и шаблон пути в формате FastAPI
+    ("/reviews/{exam_type}", "/assets/{path:path}"). method=None подходит
+    для любого метода.
+    """
+
+    def __init__(self, method: str | None, path: str, limit: RateLimit | None):
+        self.method = method
+        self.path = path
+        self.limit = limit
+        pattern = re.sub(r"\{[^/}]+:path\}", ".*", path)
+        pattern = re.sub(r"\{[^/}]+\}", "[^/]+", pattern)
+        self._regex = re.compile(f"^{pattern}$")
+
+    def matches(self, method: str, path: str) -> bool:
+        return (self.method is None or self.method == method) and bool(
+            self._regex.match(path)
+        )
+
+
+class LocalTokenBucket:
+    """Bucket в памяти процесса: запасной вариант, пока Redis недоступен."""
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def hit(self, key: str, limit: RateLimit) -> RateLimitResult:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key, (limit.capacity, now))
+        tokens = min(
+            limit.capacity, tokens + (now - updated_at) * limit.refill_per_second
+        )
+        allowed = tokens >= 1
+        retry_after = 0.0
+        if allowed:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / limit.refill_per_second
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.maxsize:
+            self._buckets.popitem(last=False)
+        return RateLimitResult(allowed, int(tokens), retry_after)
+
+
+class RateLimiter:
+    """
+    Token bucket в Redis (общий для всех воркеров) с откатом на локальный
+    bucket, если Redis не подключён или не отвечает.
+    """
+
+    def __init__(self, redis_manager, prefix: str = "ratelimit", local_maxsize=10000):
+        self.redis_manager = redis_manager
+        self.prefix = prefix
+        self.local = LocalTokenBucket(maxsize=local_maxsize)
+
+    async def hit(self, key: str, limit: RateLimit) -> RateLimitResult:
+        if self.redis_manager.redis is not None:
+            try:
+                return RateLimitResult(
+                    *await self.redis_manager.token_bucket(
+                        f"{self.prefix}:{key}", limit.capacity, limit.refill_per_second
+                    )
+                )
+            except RedisError as e:
+                print(f"WARNING (RateLimiter): Redis unavailable, local bucket: {e}")
+        return self.local.hit(key, limit)
@@ -0,0 +1,168 @@
+"""
+Сборка фронтенда для раздачи приложением:
+python -m src.utils.static_build [source] [dist]
+
+Файлы из assets/ получают копию с хешем содержимого в имени (style.3f2a9c1d.css),
+ссылки в HTML и CSS переписываются на эти имена. Для текстовых файлов заранее
+сжимаются варианты .br и .gz, чтобы воркеры не сжимали ответы на лету.
+Исходные имена тоже остаются в сборке: на них ссылается JS (пути считаются
+от страницы, поэтому их не переписываем), такие файлы отдаются с ревалидацией.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import posixpath
+import re
+import shutil
+from pathlib import Path, PurePosixPath
+from urllib.parse import quote, unquote
+
+from src.config import settings
+
+# brotli - зависимость проекта; запасной вариант только для локальной сборки
+# в окружении без неё: тогда собираются одни .gz
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MANIFEST_NAME = "static-manifest.json"
+FINGERPRINTED_DIR = "assets"
+SKIPPED_SUFFIXES = {".md"}
+COMPRESSIBLE_SUFFIXES = {".html", ".css", ".js", ".svg", ".json", ".txt", ".ico"}
+MIN_COMPRESS_SIZE = 256
+
+HTML_REF = re.compile(
+    r"""\b(?:src|href)\s*=\s*(?P<quote>["'])(?P<ref>[^"']+)(?P=quote)"""
+)
+CSS_REF = re.compile(r"""url\(\s*(?P<quote>["']?)(?P<ref>[^"')]+)(?P=quote)\s*\)""")
+REF_PATTERNS = {".html": HTML_REF, ".css": CSS_REF}
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:20]
+
+
+def fingerprinted_name(path: str, digest: str) -> str:
+    pure = PurePosixPath(path)
+    return str(pure.with_name(f"{pure.stem}.{digest[:8]}{pure.suffix}"))
+
+
+def resolve_ref(base_dir: str, ref_path: str) -> str | None:
+    """Путь файла сборки, на который указывает ссылка, или None для внешних ссылок."""
+    if not ref_path or ref_path.startswith(("#", "//", "data:", "mailto:", "tel:")):
+        return None
+    if "://" in ref_path:
+        return None
+    if ref_path.startswith("/"):
+        resolved = posixpath.normpath(ref_path.lstrip("/"))
+    else:
+        resolved = posixpath.normpath(posixpath.join(base_dir, ref_path))
+    if resolved.startswith(".."):
+        return None
+    return resolved
+
+
+def rewrite_refs(
+    text: str, pattern: re.Pattern, base_dir: str, hashed: dict[str, str]
+) -> str:
+    def replace(match: re.Match) -> str:
+        ref = match.group("ref")
+        ref_path, tail = re.match(r"([^?#]*)(.*)", ref).groups()
+        target = resolve_ref(base_dir, unquote(ref_path))
+        if target not in hashed:
+            return match.group(0)
+        last = ref_path.rsplit("/", 1)[-1]
+        new_last = PurePosixPath(hashed[target]).name
+        if unquote(last) != last:
+            new_last = quote(new_last)
+        new_ref = ref_path[: len(ref_path) - len(last)] + new_last + tail
+        start, end = match.span("ref")
+        offset = match.start()
+        whole = match.group(0)
+        return whole[: start - offset] + new_ref + whole[end - offset :]
+
+    return pattern.sub(replace, text)
+
+
+def compressed_variants(data: bytes) -> dict[str, bytes]:
+    variants = {"gzip": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(data, quality=11)
+    # Вариант нужен, только если он действительно меньше исходного файла
+    return {enc: body for enc, body in variants.items() if len(body) < len(data)}
+
+
+def build(source: Path, dist: Path) -> dict:
+    files: dict[str, bytes] = {
+        path.relative_to(source).as_posix(): path.read_bytes()
+        for path in sorted(source.rglob("*"))
+        if path.is_file() and path.suffix.lower() not in SKIPPED_SUFFIXES
+    }
+
+    # Сначала хешируются файлы без ссылок, затем CSS (ссылается на картинки),
+    # затем HTML (ссылается на всё остальное)
+    def stage(path: str) -> int:
+        return {".css": 1, ".html": 2}.get(PurePosixPath(path).suffix.lower(), 0)
+
+    hashed: dict[str, str] = {}
+    for path in sorted(files, key=stage):
+        pattern = REF_PATTERNS.get(PurePosixPath(path).suffix.lower())
+        if pattern is not None:
+            text = files[path].decode("utf-8")
+            base_dir = posixpath.dirname(path)
+            files[path] = rewrite_refs(text, pattern, base_dir, hashed).encode("utf-8")
+        if path.startswith(f"{FINGERPRINTED_DIR}/"):
+            hashed[path] = fingerprinted_name(path, content_hash(files[path]))
+
+    if dist.exists():
+        shutil.rmtree(dist)
+    manifest = {}
+    for path, data in files.items():
+        digest = content_hash(data)
+        outputs = [(path, False)]
+        if path in hashed:
+            outputs.append((hashed[path], True))
+        compressible = (
+            PurePosixPath(path).suffix.lower() in COMPRESSIBLE_SUFFIXES
+            and len(data) >= MIN_COMPRESS_SIZE
+        )
+        variants = compressed_variants(data) if compressible else {}
+        for out_path, immutable in outputs:
+            target = dist / out_path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(data)
+            for encoding, body in variants.items():
+                suffix = ".br" if encoding == "br" else ".gz"
+                target.with_name(target.name + suffix).write_bytes(body)
+            manifest[out_path] = {
+                "etag": digest,
+                "immutable": immutable,
+                "encodings": sorted(variants),
+            }
+
+    (dist / MANIFEST_NAME).write_text(
+        json.dumps(manifest, ensure_ascii=False, indent=1), encoding="utf-8"
+    )
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сборка статики фронтенда")
+    parser.add_argument("source", nargs="?", default=settings.FRONTEND_SOURCE_DIR)
+    parser.add_argument("dist", nargs="?", default=settings.FRONTEND_DIST_DIR)
+    args = parser.parse_args()
+    # Без исходников (например, образ без тома frontend) приложение стартует без сайта
+    if not Path(args.source).is_dir():
+        print(f"WARNING: Frontend sources not found in {args.source}, skipping build")
+        return
+    if brotli is None:
+        print("WARNING: brotli is not installed, only gzip variants are built")
+    manifest = build(Path(args.source), Path(args.dist))
+    print(f"Built {len(manifest)} static files into {args.dist}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import json
+import os
+from mimetypes import guess_type
+from pathlib import Path
+
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from src.utils.static_build import MANIFEST_NAME
+
+# Порядок предпочтения, если клиент принимает несколько кодировок
+ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+def accepted_encodings(accept_encoding: str) -> set[str]:
+    accepted = set()
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        quality = params.strip().removeprefix("q=")
+        try:
+            if params and float(quality) == 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(name.strip().lower())
+    return accepted
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    Раздаёт сборку src.utils.static_build по её манифесту: выбирает заранее
+    сжатый вариант по Accept-Encoding, ставит сильный ETag из хеша содержимого
+    и Cache-Control: immutable для файлов с хешем в имени. Range и If-Range
+    обрабатывает FileResponse.
+    """
+
+    def __init__(self, directory: str | os.PathLike):
+        super().__init__(directory=directory, html=True)
+        manifest_path = Path(directory) / MANIFEST_NAME
+        self.manifest: dict[str, dict] = json.loads(
+            manifest_path.read_text(encoding="utf-8")
+        )
+
+    def lookup(self, path: str) -> tuple[str, dict] | None:
+        key = path.replace(os.sep, "/").strip("/")
+        if key in ("", "."):
+            key = "index.html"
+        for candidate in (key, f"{key}/index.html"):
+            entry = self.manifest.get(candidate)
+            if entry is not None:
+                return candidate, entry
+        return None
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if scope["method"] not in ("GET", "HEAD"):
+            raise HTTPException(status_code=405)
+        found = self.lookup(path)
+        if found is None:
+            raise HTTPException(status_code=404)
+        key, entry = found
+
+        request_headers = Headers(scope=scope)
+        accepted = accepted_encodings(request_headers.get("accept-encoding", ""))
+        encoding = None
+        for candidate in ENCODING_SUFFIXES:
+            if candidate in accepted and candidate in entry["encodings"]:
+                encoding = candidate
+                break
+        file_path = os.path.join(self.directory, key)
+        # У каждого варианта своё представление, поэтому и свой сильный ETag
+        headers = {
+            "ETag": f'"{entry["etag"]}"',
+            "Cache-Control": (
+                IMMUTABLE_CACHE_CONTROL
+                if entry["immutable"]
+                else REVALIDATE_CACHE_CONTROL
+            ),
+        }
+        if entry["encodings"]:
+            headers["Vary"] = "Accept-Encoding"
+        if encoding is not None:
+            file_path += ENCODING_SUFFIXES[encoding]
+            headers["ETag"] = f'"{entry["etag"]}-{encoding}"'
+            headers["Content-Encoding"] = encoding
+
+        media_type = guess_type(key)[0] or "application/octet-stream"
+        response = FileResponse(file_path, headers=headers, media_type=media_type)
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
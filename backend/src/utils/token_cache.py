@@ -0,0 +1,44 @@
+import hashlib
+import time
+from collections import OrderedDict
+
+
+class TokenPayloadCache:
+    """
+    LRU уже проверенных JWT: sha256 токена -> payload.
+    Запись живёт не дольше поля exp самого токена, поэтому истёкший токен
+    никогда не будет отдан из кэша и пройдёт обычную проверку в jwt.decode.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._items: OrderedDict[tuple[str, str], tuple[float, dict]] = OrderedDict()
+
+    @staticmethod
+    def _key(token_type: str, token: str) -> tuple[str, str]:
+        return token_type, hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token_type: str, token: str) -> dict | None:
+        key = self._key(token_type, token)
+        item = self._items.get(key)
+        if item is None:
+            return None
+        expires_at, payload = item
+        if expires_at <= time.time():
+            del self._items[key]
+            return None
+        self._items.move_to_end(key)
+        return dict(payload)
+
+    def set(self, token_type: str, token: str, payload: dict) -> None:
+        expires_at = payload.get("exp")
+        if not isinstance(expires_at, (int, float)) or self.maxsize <= 0:
+            return
+        key = self._key(token_type, token)
+        self._items[key] = (expires_at, dict(payload))
+        self._items.move_to_end(key)
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        self._items.clear()
@@ -0,0 +1,75 @@
+import asyncio
+from abc import ABC, abstractmethod
+from contextlib import suppress
+
+from src.utils.db_manager import DBManager
+
+
+class QueueWorker(ABC):
+    """
+    Цикл фонового воркера над таблицей-очередью (см. QueueRepository):
+    забирает пачку задач, обрабатывает её и ждёт notify() или poll_interval.
+    """
+
+    queue: str = None  # имя репозитория очереди в DBManager
+
+    def __init__(
+        self,
+        session_factory,
+        batch_size: int,
+        poll_interval: float,
+        max_attempts: int,
+        lease: int,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.lease = lease
+        self._wakeup = asyncio.Event()
+
+    def notify(self) -> None:
+        """Будит воркер этого процесса сразу после записи новой задачи."""
+        self._wakeup.set()
+
+    def retry_in(self, attempts: int) -> float | None:
+        """Экспоненциальная задержка перед повтором или None, если попытки исчерпаны."""
+        if attempts >= self.max_attempts:
+            return None
+        return self.poll_interval * 2**attempts
+
+    async def run(self) -> None:
+        while True:
+            try:
+                processed = await self.process_batch()
+            except Exception as e:
+                print(f"ERROR ({type(self).__name__}): {e}")
+                processed = 0
+            if processed < self.batch_size:
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                self._wakeup.clear()
+
+    async def process_batch(self) -> int:
+        async with DBManager(session_factory=self.session_factory()) as db:
+            queue = getattr(db, self.queue)
+            expired = await queue.fail_expired(self.max_attempts)
+            if expired:
+                await self.on_expired(db, expired)
+            tasks = await queue.claim_batch(
+                limit=self.batch_size, lease=self.lease, max_attempts=self.max_attempts
+            )
+            await db.commit()
+        if tasks:
+            await self.process_tasks(tasks)
+        return len(tasks)
+
+    async def on_expired(self, db: DBManager, tasks: list) -> None:
+        """
+        Вызывается в транзакции claim для задач, которые fail_expired пометил
+        Failed, чтобы воркер мог отменить связанные с ними записи.
+        """
+
+    @abstractmethod
+    async def process_tasks(self, tasks: list) -> None:
+        """Обрабатывает забранную пачку и сама отмечает задачи mark_done/mark_failed."""
@@ -0,0 +1,84 @@
+import asyncio
+
+import httpx
+
+from src.config import settings
+from src.connectors.yookassa_connector import YooKassaClient
+from src.database import get_async_session_maker
+from src.init import yookassa_client
+from src.schemas.payments import PaymentOutboxTask
+from src.utils.db_manager import DBManager
+from src.workers.base import QueueWorker
+
+
+class PaymentOutboxWorker(QueueWorker):
+    """
+    Создаёт платежи в ЮKassa по задачам из таблицы payment_outbox.
+    Запускается внутри приложения (lifespan) или отдельным процессом:
+    python -m src.workers.payment_outbox
+    """
+
+    queue = "payment_outbox"
+
+    def __init__(self, session_factory, client: YooKassaClient, **kwargs):
+        super().__init__(session_factory, **kwargs)
+        self.client = client
+
+    async def on_expired(self, db: DBManager, tasks: list[PaymentOutboxTask]) -> None:
+        # Как и при окончательной ошибке: покупка не должна блокировать новую оплату
+        for task in tasks:
+            await db.purchases.set_status(task.payment_id, "Failed")
+
+    async def process_tasks(self, tasks: list[PaymentOutboxTask]) -> None:
+        await asyncio.gather(*(self.process_task(task) for task in tasks))
+
+    async def process_task(self, task: PaymentOutboxTask) -> None:
+        error, retryable, confirmation_url = None, True, None
+        try:
+            response = await self.client.create_payment(
+                task.payload, idempotence_key=task.payment_id
+            )
+            if response.status_code in (200, 201):
+                confirmation_url = response.json()["confirmation"]["confirmation_url"]
+            else:
+                error = f"ЮKassa error: {response.status_code}, {response.text}"
+                retryable = response.status_code >= 500 or response.status_code == 429
+        except (httpx.HTTPError, KeyError, ValueError) as e:
+            error = f"ЮKassa request failed: {e!r}"
+
+        retry_in = self.retry_in(task.attempts) if retryable else None
+        async with DBManager(session_factory=self.session_factory()) as db:
+            if confirmation_url is not None:
+                await db.purchases.set_confirmation_url(
+                    task.payment_id, confirmation_url
+                )
+                await db.payment_outbox.mark_done(task.id)
+            elif retry_in is not None:
+                await db.payment_outbox.mark_failed(task.id, error, retry_in=retry_in)
+            else:
+                # Покупка больше не блокирует повторную попытку оплаты
+                await db.purchases.set_status(task.payment_id, "Failed")
+                await db.payment_outbox.mark_failed(task.id, error, retry_in=None)
+            await db.commit()
+
+
+payment_outbox_worker = PaymentOutboxWorker(
+    session_factory=get_async_session_maker,
+    client=yookassa_client,
+    batch_size=settings.PAYMENT_OUTBOX_BATCH_SIZE,
+    poll_interval=settings.PAYMENT_OUTBOX_POLL_INTERVAL,
+    max_attempts=settings.PAYMENT_OUTBOX_MAX_ATTEMPTS,
+    lease=settings.PAYMENT_OUTBOX_LEASE_SECONDS,
+)
+
+
+async def main():
+    await yookassa_client.connect()
+    try:
+        await payment_outbox_worker.run()
+    finally:
+        await yookassa_client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
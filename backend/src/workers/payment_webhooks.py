@@ -0,0 +1,133 @@
+import asyncio
+from datetime import datetime
+
+import httpx
+
+from src.config import settings
+from src.connectors.yookassa_connector import YooKassaClient
+from src.database import get_async_session_maker
+from src.init import yookassa_client
+from src.schemas.payments import PaymentWebhookEvent
+from src.utils.db_manager import DBManager
+from src.workers.base import QueueWorker
+
+WEBHOOK_STATUSES = {
+    "payment.succeeded": "Paid",
+    "payment.canceled": "Canceled",
+}
+
+
+def parse_paid_at(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        print(f"Warning: Could not parse paid_at_str from webhook: {value}")
+        return None
+
+
+class PaymentWebhookWorker(QueueWorker):
+    """
+    Применяет сохранённые уведомления ЮKassa к покупкам. Пачка событий
+    обновляется одной транзакцией, подтверждения платежей (capture)
+    отправляются параллельно до неё.
+    Отдельный процесс: python -m src.workers.payment_webhooks
+    """
+
+    queue = "payment_webhook_events"
+
+    def __init__(self, session_factory, client: YooKassaClient, **kwargs):
+        super().__init__(session_factory, **kwargs)
+        self.client = client
+
+    async def capture(self, event: PaymentWebhookEvent) -> str | None:
+        """Подтверждает платёж; возвращает текст ошибки или None."""
+        try:
+            yookassa_payment_id = event.payload["object"]["id"]
+            # Ключ привязан к платежу, поэтому повторный capture безопасен
+            response = await self.client.capture_payment(
+                yookassa_payment_id, idempotence_key=f"capture:{yookassa_payment_id}"
+            )
+        except (httpx.HTTPError, KeyError, TypeError) as e:
+            return f"Capture request failed: {e!r}"
+        if response.status_code not in (200, 201):
+            return f"Failed to capture payment: {response.status_code}, {response.text}"
+        return None
+
+    async def process_tasks(self, tasks: list[PaymentWebhookEvent]) -> None:
+        to_capture = [t for t in tasks if t.event == "payment.waiting_for_capture"]
+        results = await asyncio.gather(
+            *(self.capture(t) for t in to_capture), return_exceptions=True
+        )
+        capture_errors = {
+            task.id: (
+                f"Capture failed: {result!r}"
+                if isinstance(result, Exception)
+                else result
+            )
+            for task, result in zip(to_capture, results)
+        }
+
+        async with DBManager(session_factory=self.session_factory()) as db:
+            for task in tasks:
+                error = capture_errors.get(task.id)
+                if error is None:
+                    error = await self.apply_isolated(db, task)
+                if error is None:
+                    await db.payment_webhook_events.mark_done(task.id)
+                else:
+                    await db.payment_webhook_events.mark_failed(
+                        task.id, error, retry_in=self.retry_in(task.attempts)
+                    )
+            await db.commit()
+
+    async def apply_isolated(
+        self, db: DBManager, task: PaymentWebhookEvent
+    ) -> str | None:
+        """
+        apply в точке сохранения: ошибка одного события откатывает только его,
+        остальные события пачки всё равно применяются и фиксируются.
+        """
+        try:
+            async with db.session.begin_nested():
+                return await self.apply(db, task)
+        except Exception as e:
+            return f"Apply failed: {e!r}"
+
+    async def apply(self, db: DBManager, task: PaymentWebhookEvent) -> str | None:
+        values = {"raw_webhook_data": task.payload}
+        status = WEBHOOK_STATUSES.get(task.event)
+        if status is not None:
+            values["status"] = status
+        elif task.event != "payment.waiting_for_capture":
+            # Необрабатываемые события сохранены в очереди и покупку не меняют
+            return None
+        if task.event == "payment.succeeded":
+            values["paid_at"] = parse_paid_at(task.payload["object"].get("paid_at"))
+        found = await db.purchases.update_from_webhook(task.payment_id, **values)
+        if not found:
+            return "Покупка не найдена"
+        return None
+
+
+payment_webhook_worker = PaymentWebhookWorker(
+    session_factory=get_async_session_maker,
+    client=yookassa_client,
+    batch_size=settings.PAYMENT_WEBHOOK_BATCH_SIZE,
+    poll_interval=settings.PAYMENT_OUTBOX_POLL_INTERVAL,
+    max_attempts=settings.PAYMENT_WEBHOOK_MAX_ATTEMPTS,
+    lease=settings.PAYMENT_OUTBOX_LEASE_SECONDS,
+)
+
+
+async def main():
+    await yookassa_client.connect()
+    try:
+        await payment_webhook_worker.run()
+    finally:
+        await yookassa_client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
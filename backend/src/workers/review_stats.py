@@ -0,0 +1,30 @@
+import asyncio
+
+from src.config import settings
+from src.database import get_async_session_maker
+from src.utils.db_manager import DBManager
+
+
+async def reconcile_review_stats(session_factory=get_async_session_maker) -> bool:
+    async with DBManager(session_factory=session_factory()) as db:
+        reconciled = await db.review_stats.reconcile()
+        await db.commit()
+    return reconciled
+
+
+async def run_review_stats_reconciler(interval: float) -> None:
+    """
+    Периодически пересчитывает review_score_counts по таблице reviews,
+    исправляя расхождения инкрементальных обновлений.
+    Отдельный процесс: python -m src.workers.review_stats
+    """
+    while True:
+        try:
+            await reconcile_review_stats()
+        except Exception as e:
+            print(f"ERROR (ReviewStatsReconciler): {e}")
+        await asyncio.sleep(interval)
+
+
+if __name__ == "__main__":
+    asyncio.run(run_review_stats_reconciler(settings.REVIEW_STATS_RECONCILE_SECONDS))
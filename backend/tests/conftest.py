@@ -11,7 +11,7 @@ from typing import AsyncGenerator
 # Импорты из src
 from src.config import settings
 from src.database import Base, get_engine_null_pool, get_async_session_maker_null_pool
-from src.dependencies.db import get_db
+from src.dependencies.db import get_db, get_db_read
 from src.main import app
 from src.models import *  # noqa: F403
 from src.schemas.users import UserAdd
@@ -83,7 +83,7 @@ async def setup_database(check_test_mode):
 async def register_user(setup_database):
     print("DEBUG (conftest): Starting register_user fixture", file=sys.stderr)
     try:
-        hashed_password = AuthService().hash_password("12345678")
+        hashed_password = await AuthService().hash_password("12345678")
         user_data = UserAdd(
             phone=PhoneNumber("+79282017042"), hashed_password=hashed_password
         )
@@ -118,6 +118,7 @@ async def db(register_user):
 
 
 app.dependency_overrides[get_db] = get_db_null_pool_dependency
+app.dependency_overrides[get_db_read] = get_db_null_pool_dependency
 
 
 @pytest.fixture(scope="session")
@@ -0,0 +1,93 @@
+import re
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from src.exceptions.db_exceptions import ObjectNotFoundException
+from src.repositories.purchases import PurchasesRepository
+from src.repositories.reviews import ReviewsRepository
+
+# Таблицы, у которых горячие запросы обязаны идти по индексу
+INDEXED_TABLES = ("reviews", "payments")
+SEQ_SCAN = re.compile(rf"Seq Scan on (?:{'|'.join(INDEXED_TABLES)})\b")
+
+
+async def reviews_by_exam(session):
+    await ReviewsRepository(session).get_all_filtered(limit=10, exam="ЕГЭ")
+
+
+async def reviews_by_exam_keyset(session):
+    cursor = (datetime.now(timezone.utc), 100)
+    await ReviewsRepository(session).get_all_filtered(
+        limit=10, cursor=cursor, exam="ЕГЭ"
+    )
+
+
+async def review_of_user(session):
+    # ReviewsService.create_review
+    await ReviewsRepository(session).get_one_or_none(exam="ЕГЭ", user_id=1)
+
+
+async def paid_purchase(session):
+    # Проверка покупки в ReviewsService.create_review
+    await PurchasesRepository(session).get_one(
+        product_slug="ege", user_id=1, status="Paid"
+    )
+
+
+async def bought_products(session):
+    await PurchasesRepository(session).get_bought_products(1)
+
+
+HOT_QUERIES = {
+    query.__name__: query
+    for query in (
+        reviews_by_exam,
+        reviews_by_exam_keyset,
+        review_of_user,
+        paid_purchase,
+        bought_products,
+    )
+}
+
+
+class RecordingSession:
+    """Сессия, которая запоминает выполненные репозиторием запросы."""
+
+    def __init__(self, session):
+        self.session = session
+        self.statements = []
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        return await self.session.execute(statement, *args, **kwargs)
+
+
+async def explain(db, query) -> str:
+    sql = query.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    result = await db.session.execute(text(f"EXPLAIN {sql}"))
+    return "\n".join(row[0] for row in result.all())
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+async def test_hot_query_uses_index(db, name):
+    # В тестовой БД таблицы почти пустые, и без этого планировщик
+    # всегда выбирает Seq Scan
+    await db.session.execute(text("SET LOCAL enable_seqscan = off"))
+    session = RecordingSession(db.session)
+    try:
+        await HOT_QUERIES[name](session)
+    except ObjectNotFoundException:
+        pass
+
+    assert session.statements
+    for statement in session.statements:
+        plan = await explain(db, statement)
+        # Bitmap Heap Scan тоже идёт по индексу, поэтому проверяется только
+        # отсутствие последовательного чтения индексированных таблиц
+        assert re.search(rf"\b(?:{'|'.join(INDEXED_TABLES)})\b", plan), plan
+        assert not SEQ_SCAN.search(plan), plan
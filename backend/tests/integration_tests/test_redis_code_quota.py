@@ -0,0 +1,56 @@
+from uuid import uuid4
+
+from src.config import settings
+from src.connectors.redis_connector import (
+    CODE_IP_RATE_LIMITED,
+    CODE_RATE_LIMITED,
+    CODE_STORED,
+    RedisManager,
+)
+
+
+async def acquire(manager: RedisManager, prefix: str, identifier: str, ip_limit: int):
+    return await manager.acquire_and_store_code(
+        limit_key=f"{prefix}:cooldown:{identifier}",
+        code_key=f"{prefix}:code:{identifier}",
+        quota_key=f"{prefix}:quota:{identifier}",
+        code="1234",
+        code_expire=60,
+        cooldown=60,
+        quota_limit=5,
+        quota_window=60,
+        ip_quota_key=f"{prefix}:quota:ip",
+        ip_quota_limit=ip_limit,
+    )
+
+
+async def test_rejected_code_requests_do_not_spend_ip_quota():
+    manager = RedisManager(host=settings.REDIS_HOST, port=settings.REDIS_PORT)
+    await manager.connect()
+    prefix = f"test:{uuid4().hex}"
+    try:
+        status, _ = await acquire(manager, prefix, "+79990000001", ip_limit=2)
+        assert status == CODE_STORED
+        # Кулдаун номера отклоняет повторы, и квота адреса не расходуется
+        for _ in range(3):
+            status, retry_after = await acquire(
+                manager, prefix, "+79990000001", ip_limit=2
+            )
+            assert status == CODE_RATE_LIMITED
+            assert retry_after > 0
+        assert await manager.redis.zcard(f"{prefix}:quota:ip") == 1
+
+        status, _ = await acquire(manager, prefix, "+79990000002", ip_limit=2)
+        assert status == CODE_STORED
+        status, retry_after = await acquire(manager, prefix, "+79990000003", ip_limit=2)
+        assert status == CODE_IP_RATE_LIMITED
+        assert retry_after > 0
+        # Отклонённый по квоте адреса запрос не сохраняет код и не ставит кулдаун
+        assert await manager.get(f"{prefix}:code:+79990000003") is None
+        assert await manager.ttl(f"{prefix}:cooldown:+79990000003") < 0
+        assert await manager.redis.zcard(f"{prefix}:quota:+79990000003") == 0
+    finally:
+        keys = [key async for key in manager.redis.scan_iter(f"{prefix}:*")]
+        if keys:
+            await manager.redis.delete(*keys)
+        await manager.close()
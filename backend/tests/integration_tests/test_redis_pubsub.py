@@ -0,0 +1,44 @@
+import asyncio
+
+from src.config import settings
+from src.connectors.redis_connector import RedisManager
+from src.schemas.products import Product
+from src.utils.products_cache import (
+    PRODUCTS_INVALIDATION_CHANNEL,
+    ProductsCatalogCache,
+)
+
+
+async def test_idle_invalidation_listener_outlives_socket_timeout():
+    manager = RedisManager(
+        host=settings.REDIS_HOST, port=settings.REDIS_PORT, socket_timeout=0.2
+    )
+    await manager.connect()
+    cache = ProductsCatalogCache(expire=60)
+    listener = asyncio.create_task(cache.listen_for_invalidation(manager))
+    try:
+        # Канал молчит в несколько раз дольше socket_timeout общего пула
+        await asyncio.sleep(1.0)
+        assert not listener.done()
+
+        cache.replace(
+            [
+                Product(
+                    name="ОГЭ",
+                    price=2000,
+                    download_link="https://example.com/oge",
+                    description="Тестовое описание",
+                    slug="oge",
+                )
+            ]
+        )
+        await manager.publish(PRODUCTS_INVALIDATION_CHANNEL, "1")
+        for _ in range(50):
+            if cache.is_expired():
+                break
+            await asyncio.sleep(0.05)
+        assert cache.is_expired()
+    finally:
+        listener.cancel()
+        await asyncio.gather(listener, return_exceptions=True)
+        await manager.close()
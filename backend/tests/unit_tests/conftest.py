@@ -0,0 +1,53 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.workers import base, payment_outbox, payment_webhooks
+
+
+class FakeDBManager:
+    """DBManager платёжных воркеров: все созданные экземпляры лежат в instances."""
+
+    instances: list["FakeDBManager"] = []
+
+    def __init__(self, session_factory):
+        self.purchases = AsyncMock()
+        self.purchases.update_from_webhook.return_value = True
+        self.payment_outbox = AsyncMock()
+        self.payment_webhook_events = AsyncMock()
+        for queue in (self.payment_outbox, self.payment_webhook_events):
+            queue.fail_expired.return_value = []
+            queue.claim_batch.return_value = []
+        self.commit = AsyncMock()
+        self.session = MagicMock()
+        self.session.begin_nested.return_value.__aexit__.return_value = False
+        FakeDBManager.instances.append(self)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    FakeDBManager.instances = []
+    for module in (base, payment_outbox, payment_webhooks):
+        monkeypatch.setattr(module, "DBManager", FakeDBManager)
+    return FakeDBManager
+
+
+@pytest.fixture
+def make_worker():
+    def make(worker_cls, client, max_attempts: int = 3):
+        return worker_cls(
+            session_factory=MagicMock(),
+            client=client,
+            batch_size=10,
+            poll_interval=1.0,
+            max_attempts=max_attempts,
+            lease=60,
+        )
+
+    return make
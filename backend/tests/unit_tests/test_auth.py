@@ -12,7 +12,6 @@ from src.schemas.users import (
     CodeInput,
     RegistrationInput,
     SetNewPasswordAfterResetInput,
-    UserWithHashedPassword,
     User,
 )
 from src.exceptions.service_exceptions import (
@@ -28,6 +27,14 @@ from src.exceptions.service_exceptions import (
     AuthCodeNotVerifiedServiceException,
 )
 from src.exceptions.db_exceptions import UserNotFoundException
+from src.connectors.redis_connector import (
+    CODE_NOT_FOUND,
+    CODE_INVALID,
+    CODE_VERIFIED,
+    CODE_STORED,
+    CODE_RATE_LIMITED,
+    CODE_IP_RATE_LIMITED,
+)
 from src.dependencies.db import DBDep
 from src.utils.db_manager import DBManager
 from src.repositories.users import UsersRepository
@@ -97,8 +104,7 @@ async def test_send_phone_code_success(auth_service: AuthService):
     phone_str = "+79991234567"
     parsed_phone_obj = phonenumbers.parse(phone_str, "RU")
     action = "registration"
-    auth_service.redis.ttl.return_value = 0
-    auth_service.redis.set.return_value = None
+    auth_service.redis.acquire_and_store_code.return_value = (CODE_STORED, 0)
     with mock.patch.object(
         auth_service, "test_send_sms", new_callable=mock.AsyncMock
     ) as mock_send_sms:
@@ -107,19 +113,16 @@ async def test_send_phone_code_success(auth_service: AuthService):
         expected_e164 = phonenumbers.format_number(
             parsed_phone_obj, phonenumbers.PhoneNumberFormat.E164
         )
-        auth_service.redis.ttl.assert_called_once_with(
-            f"rate_limit_{action}:{expected_e164}"
-        )
-        auth_service.redis.set.assert_any_call(
-            f"rate_limit_{action}:{expected_e164}", "1", expire=120
-        )
-        args_list = auth_service.redis.set.call_args_list
-        code_set_call = next(
-            call for call in args_list if call[0][0] == f"{action}:code:{expected_e164}"
+        auth_service.redis.acquire_and_store_code.assert_called_once()
+        code_call = auth_service.redis.acquire_and_store_code.call_args
+        assert code_call.kwargs["limit_key"] == f"rate_limit_{action}:{expected_e164}"
+        assert code_call.kwargs["code_key"] == f"{action}:code:{expected_e164}"
+        assert len(code_call.kwargs["code"]) == 4
+        assert code_call.kwargs["code_expire"] == 120
+        assert code_call.kwargs["cooldown"] == 120
+        mock_send_sms.assert_called_once_with(
+            expected_e164, int(code_call.kwargs["code"])
         )
-        assert len(code_set_call[0][1]) == 4
-        assert code_set_call[1]["expire"] == 120
-        mock_send_sms.assert_called_once_with(expected_e164, mock.ANY)
 
 
 @pytest.mark.asyncio
@@ -127,8 +130,16 @@ async def test_send_phone_code_rate_limited(auth_service: AuthService):
     phone_str = "+79991234567"
     parsed_phone_obj = phonenumbers.parse(phone_str, "RU")
     action = "registration"
-    auth_service.redis.ttl.return_value = 60
-    with pytest.raises(AuthRateLimitServiceException) as exc_info:
+    auth_service.redis.acquire_and_store_code.return_value = (
+        CODE_RATE_LIMITED,
+        60,
+    )
+    with (
+        mock.patch.object(
+            auth_service, "test_send_sms", new_callable=mock.AsyncMock
+        ) as mock_send_sms,
+        pytest.raises(AuthRateLimitServiceException) as exc_info,
+    ):
         await auth_service.send_phone_code(parsed_phone_obj, action)
     assert "Отправить код снова вы можете не ранее, чем через 60 секунд." in str(
         exc_info.value
@@ -136,34 +147,28 @@ async def test_send_phone_code_rate_limited(auth_service: AuthService):
     expected_e164 = phonenumbers.format_number(
         parsed_phone_obj, phonenumbers.PhoneNumberFormat.E164
     )
-    auth_service.redis.ttl.assert_called_once_with(
-        f"rate_limit_{action}:{expected_e164}"
-    )
+    code_call = auth_service.redis.acquire_and_store_code.call_args
+    assert code_call.kwargs["limit_key"] == f"rate_limit_{action}:{expected_e164}"
+    mock_send_sms.assert_not_called()
 
 
 @pytest.mark.asyncio
 async def test_send_email_code_success(auth_service: AuthService):
     email_str = "test@example.com"
     action = "registration"
-    auth_service.redis.ttl.return_value = 0
-    auth_service.redis.set.return_value = None
+    auth_service.redis.acquire_and_store_code.return_value = (CODE_STORED, 0)
     with mock.patch.object(
         auth_service, "test_send_mail", new_callable=mock.AsyncMock
     ) as mock_send_mail:
         result = await auth_service.send_email_code(email_str, action)
         assert result == {"status": "Ok"}
-        auth_service.redis.ttl.assert_called_once_with(
-            f"rate_limit_{action}:{email_str}"
-        )
-        auth_service.redis.set.assert_any_call(
-            f"rate_limit_{action}:{email_str}", "1", expire=120
-        )
-        args_list = auth_service.redis.set.call_args_list
-        assert len(args_list) == 2
-        code_set_call = args_list[1]
-        assert code_set_call[0][0] == f"{action}:code:{email_str}"
-        assert len(code_set_call[0][1]) == 4
-        assert code_set_call[1]["expire"] == 120
+        auth_service.redis.acquire_and_store_code.assert_called_once()
+        code_call = auth_service.redis.acquire_and_store_code.call_args
+        assert code_call.kwargs["limit_key"] == f"rate_limit_{action}:{email_str}"
+        assert code_call.kwargs["code_key"] == f"{action}:code:{email_str}"
+        assert code_call.kwargs["quota_key"] == f"quota_{action}:{email_str}"
+        assert len(code_call.kwargs["code"]) == 4
+        assert code_call.kwargs["code_expire"] == 120
         mock_send_mail.assert_called_once()
 
 
@@ -171,13 +176,30 @@ async def test_send_email_code_success(auth_service: AuthService):
 async def test_send_email_code_rate_limited(auth_service: AuthService):
     email_str = "test@example.com"
     action = "registration"
-    auth_service.redis.ttl.return_value = 30
+    auth_service.redis.acquire_and_store_code.return_value = (
+        CODE_RATE_LIMITED,
+        30,
+    )
     with pytest.raises(AuthRateLimitServiceException) as exc_info:
         await auth_service.send_email_code(email_str, action)
     assert "Отправить код снова вы можете не ранее, чем через 30 секунд." in str(
         exc_info.value
     )
-    auth_service.redis.ttl.assert_called_once_with(f"rate_limit_{action}:{email_str}")
+    auth_service.redis.acquire_and_store_code.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_send_email_code_passes_ip_quota_to_script(auth_service: AuthService):
+    email_str = "test@example.com"
+    action = "registration"
+    auth_service.redis.acquire_and_store_code.return_value = (CODE_IP_RATE_LIMITED, 45)
+    with pytest.raises(AuthRateLimitServiceException) as exc_info:
+        await auth_service.send_email_code(email_str, action, client_ip="10.0.0.1")
+    assert "Слишком много запросов кода с вашего адреса" in str(exc_info.value)
+    # Квота IP проверяется тем же скриптом, что и кулдаун, а не отдельным запросом
+    code_call = auth_service.redis.acquire_and_store_code.call_args
+    assert code_call.kwargs["ip_quota_key"] == f"quota_{action}:ip:10.0.0.1"
+    auth_service.redis.sliding_window_hit.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -191,11 +213,13 @@ async def test_send_registration_email_code_new_user(
         auth_service, "send_email_code", new_callable=mock.AsyncMock
     ) as mock_send_email_code_method:
         mock_send_email_code_method.return_value = {"status": "Ok"}
-        result = await auth_service.send_registration_email_code(data, mock_db_dep)
+        result = await auth_service.send_registration_email_code(
+            data, mock_db_dep, client_ip="10.0.0.1"
+        )
         assert result == {"status": "Ok"}
         mock_db_dep.users.get_one_or_none.assert_called_once_with(email=data.email)
         mock_send_email_code_method.assert_called_once_with(
-            data.email, action="registration"
+            data.email, action="registration", client_ip="10.0.0.1"
         )
 
 
@@ -229,14 +253,16 @@ async def test_send_registration_phone_code_new_user(
     ):
         _ = mock_validate
         mock_send_phone_code_method.return_value = {"status": "Ok"}
-        result = await auth_service.send_registration_phone_code(data, mock_db_dep)
+        result = await auth_service.send_registration_phone_code(
+            data, mock_db_dep, client_ip="10.0.0.1"
+        )
         assert result == {"status": "Ok"}
         expected_e164 = phonenumbers.format_number(
             parsed_phone_obj, phonenumbers.PhoneNumberFormat.E164
         )
         mock_db_dep.users.get_one_or_none.assert_called_once_with(phone=expected_e164)
         mock_send_phone_code_method.assert_called_once_with(
-            parsed_phone_obj, "registration"
+            parsed_phone_obj, "registration", "10.0.0.1"
         )
 
 
@@ -286,7 +312,9 @@ async def test_send_reset_phone_code_user_exists(
             parsed_phone_obj, phonenumbers.PhoneNumberFormat.E164
         )
         mock_db_dep.users.get_one.assert_called_once_with(phone=expected_e164)
-        mock_send_phone_code_method.assert_called_once_with(parsed_phone_obj, "reset")
+        mock_send_phone_code_method.assert_called_once_with(
+            parsed_phone_obj, "reset", None
+        )
 
 
 @pytest.mark.asyncio
@@ -315,9 +343,7 @@ async def test_verify_code_phone_success(auth_service: AuthService):
     parsed_phone_obj = phonenumbers.parse(phone_str, "RU")
     code_to_verify = 1234  # Передаем int
     action = "registration"
-    stored_code_on_redis = "1234"
-    auth_service.redis.get.return_value = stored_code_on_redis.encode("utf-8")
-    auth_service.redis.set.return_value = None
+    auth_service.redis.verify_and_mark.return_value = CODE_VERIFIED
     # Передаем code_to_verify (int) вместо объекта CodeInput
     result = await auth_service.verify_code_phone(
         parsed_phone_obj, code_to_verify, action
@@ -326,9 +352,11 @@ async def test_verify_code_phone_success(auth_service: AuthService):
     expected_e164 = phonenumbers.format_number(
         parsed_phone_obj, phonenumbers.PhoneNumberFormat.E164
     )
-    auth_service.redis.get.assert_called_once_with(f"{action}:code:{expected_e164}")
-    auth_service.redis.set.assert_called_once_with(
-        f"{action}:code_verified:{expected_e164}", "true", expire=300
+    auth_service.redis.verify_and_mark.assert_called_once_with(
+        f"{action}:code:{expected_e164}",
+        f"{action}:code_verified:{expected_e164}",
+        "1234",
+        expire=300,
     )
 
 
@@ -337,8 +365,8 @@ async def test_verify_code_phone_invalid_code(auth_service: AuthService):
     phone_str = "+79031112244"
     parsed_phone_obj = phonenumbers.parse(phone_str, "RU")
     code_input_val = 1234  # Валидное значение для CodeInput
-    stored_code_on_redis = "5678"  # Код, который якобы сохранен в Redis (не совпадает)
-    auth_service.redis.get.return_value = stored_code_on_redis.encode("utf-8")
+    # Код, который якобы сохранен в Redis, не совпадает
+    auth_service.redis.verify_and_mark.return_value = CODE_INVALID
 
     with pytest.raises(
         AuthCodeInvalidServiceException, match="Неверный код подтверждения"
@@ -355,13 +383,18 @@ async def test_verify_code_phone_code_not_found(auth_service: AuthService):
     parsed_phone_obj = phonenumbers.parse(phone_str, "RU")
     code_input = CodeInput(code="1234")
     action = "registration"
-    auth_service.redis.get.return_value = None
+    auth_service.redis.verify_and_mark.return_value = CODE_NOT_FOUND
     with pytest.raises(AuthCodeExpiredServiceException):
         await auth_service.verify_code_phone(parsed_phone_obj, code_input, action)
     expected_e164 = phonenumbers.format_number(
         parsed_phone_obj, phonenumbers.PhoneNumberFormat.E164
     )
-    auth_service.redis.get.assert_called_once_with(f"{action}:code:{expected_e164}")
+    auth_service.redis.verify_and_mark.assert_called_once_with(
+        f"{action}:code:{expected_e164}",
+        f"{action}:code_verified:{expected_e164}",
+        mock.ANY,
+        expire=300,
+    )
 
 
 @pytest.mark.asyncio
@@ -651,9 +684,7 @@ async def test_verify_reset_code_phone_success(auth_service: AuthService):
     parsed_phone_obj = phonenumbers.parse(phone_str, "RU")
     code_to_verify = 1234  # Передаем int
     action = "reset"
-    stored_code_on_redis = "1234"
-    auth_service.redis.get.return_value = stored_code_on_redis.encode("utf-8")
-    auth_service.redis.set.return_value = None
+    auth_service.redis.verify_and_mark.return_value = CODE_VERIFIED
 
     # Передаем code_to_verify (int) вместо объекта CodeInput
     result = await auth_service.verify_code_phone(
@@ -663,9 +694,11 @@ async def test_verify_reset_code_phone_success(auth_service: AuthService):
     expected_e164 = phonenumbers.format_number(
         parsed_phone_obj, phonenumbers.PhoneNumberFormat.E164
     )
-    auth_service.redis.get.assert_called_once_with(f"reset:code:{expected_e164}")
-    auth_service.redis.set.assert_called_once_with(
-        f"reset:code_verified:{expected_e164}", "true", expire=300
+    auth_service.redis.verify_and_mark.assert_called_once_with(
+        f"reset:code:{expected_e164}",
+        f"reset:code_verified:{expected_e164}",
+        "1234",
+        expire=300,
     )
 
 
@@ -675,8 +708,8 @@ async def test_verify_reset_code_phone_invalid(auth_service: AuthService):
     phone_str = "+79001234500"
     parsed_phone_obj = phonenumbers.parse(phone_str, "RU")
     code_input_val = 1234  # Валидное значение
-    stored_code_on_redis = "0000"  # Невалидный или несовпадающий код в Redis
-    auth_service.redis.get.return_value = stored_code_on_redis.encode("utf-8")
+    # Невалидный или несовпадающий код в Redis
+    auth_service.redis.verify_and_mark.return_value = CODE_INVALID
 
     with pytest.raises(
         AuthCodeInvalidServiceException, match="Неверный код подтверждения"
@@ -700,19 +733,8 @@ async def test_set_new_password_after_reset_phone_success(
         new_password_repeat=new_password,  # Добавляем new_password_repeat
     )
     parsed_phone_obj = phonenumbers.parse(phone_str_input, None)
-    mock_user_instance = UserWithHashedPassword(
-        id=1,
-        phone=PhoneNumber(phone_str_e164),
-        email=None,
-        hashed_password="old_hash",
-        is_super_user=False,
-    )
 
     auth_service.redis.get.return_value = b"true"  # Мокаем, что код верифицирован
-    # Сначала сбрасываем side_effect, установленный в фикстуре mock_db_dep
-    mock_db_dep.users.get_one.side_effect = None
-    # Теперь устанавливаем return_value, чтобы пользователь был найден
-    mock_db_dep.users.get_one.return_value = mock_user_instance
     mock_db_dep.users.edit.return_value = None
 
     with (
@@ -725,7 +747,6 @@ async def test_set_new_password_after_reset_phone_success(
         mock.patch.object(
             auth_service, "hash_password", return_value="new_hashed_password"
         ) as mock_hash_pass,
-        mock.patch.object(auth_service.redis, "delete") as mock_redis_delete,
     ):
         result = await auth_service.set_password_after_reset(data, mock_db_dep)
 
@@ -733,14 +754,53 @@ async def test_set_new_password_after_reset_phone_success(
         mock_validate.assert_called_once_with(str(data.phone))
         mock_validate_pass.assert_called_once_with(new_password)
         mock_hash_pass.assert_called_once_with(new_password)
-        mock_db_dep.users.get_one.assert_called_once_with(phone=phone_str_e164)
-        mock_db_dep.users.edit.assert_called_once()
-
-        # Проверяем удаление ключей из Redis
-        expected_key_verified = f"reset:code_verified:{phone_str_e164}"
-        expected_key_code = f"reset:code:{phone_str_e164}"
-        mock_redis_delete.assert_any_call(expected_key_verified)
-        mock_redis_delete.assert_any_call(expected_key_code)
+        # Пароль меняется одним UPDATE по телефону, без предварительного SELECT
+        mock_db_dep.users.get_one.assert_not_called()
+        mock_db_dep.users.edit.assert_awaited_once_with(
+            data={"hashed_password": "new_hashed_password"}, phone=phone_str_e164
+        )
+        mock_db_dep.commit.assert_awaited_once()
+
+        # Оба ключа сброса удаляются одним запросом
+        auth_service.redis.delete_many.assert_awaited_once_with(
+            f"reset:code_verified:{phone_str_e164}", f"reset:code:{phone_str_e164}"
+        )
+
+
+# Тест для AuthService.set_password_after_reset - Пользователь не найден
+@pytest.mark.asyncio
+async def test_set_new_password_after_reset_user_not_found(
+    auth_service: AuthService, mock_db_dep: DBDep
+):
+    phone_str_input = "tel:+7-955-555-44-35"
+    new_password = "newStrongPassword1!"
+    data = SetNewPasswordAfterResetInput(
+        phone=phone_str_input,
+        new_password=new_password,
+        new_password_repeat=new_password,
+    )
+    parsed_phone_obj = phonenumbers.parse(phone_str_input, None)
+    auth_service.redis.get.return_value = b"true"
+    # Настоящий репозиторий: UPDATE не затронул ни одной строки
+    session = mock.AsyncMock()
+    session.execute.return_value = mock.Mock(rowcount=0)
+    mock_db_dep.users = UsersRepository(session)
+
+    with (
+        mock.patch.object(
+            auth_service, "validate_russian_phone", return_value=parsed_phone_obj
+        ),
+        mock.patch.object(auth_service, "validate_password_strength"),
+        mock.patch.object(
+            auth_service, "hash_password", return_value="new_hashed_password"
+        ),
+    ):
+        with pytest.raises(UserNotFoundAuthServiceException):
+            await auth_service.set_password_after_reset(data, mock_db_dep)
+
+    session.execute.assert_awaited_once()
+    mock_db_dep.commit.assert_not_awaited()
+    auth_service.redis.delete_many.assert_not_awaited()
 
 
 # Тест для AuthService.set_password_after_reset - Код не верифицирован
@@ -0,0 +1,62 @@
+from unittest import mock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.repositories.base import chunked
+from src.repositories.products import ProductsRepository
+from src.repositories.reviews import ReviewsRepository
+
+
+def test_chunked_splits_without_losing_rows():
+    assert list(chunked([1, 2, 3, 4, 5], 2)) == [[1, 2], [3, 4], [5]]
+    assert list(chunked([], 2)) == []
+
+
+@pytest.fixture
+def session():
+    session = mock.AsyncMock()
+    session.execute.return_value = mock.Mock(rowcount=2)
+    return session
+
+
+@pytest.mark.asyncio
+async def test_add_bulk_runs_one_executemany_per_chunk(session):
+    rows = [{"name": f"p{i}", "slug": f"p{i}"} for i in range(5)]
+
+    await ProductsRepository(session).add_bulk(rows, chunk_size=2)
+
+    assert session.execute.await_count == 3
+    assert [len(call.args[1]) for call in session.execute.await_args_list] == [2, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_upsert_bulk_updates_all_fields_except_key(session):
+    rows = [{"slug": "a", "price": 1}, {"slug": "b", "price": 2}]
+
+    await ProductsRepository(session).upsert_bulk(
+        rows, conflict_keys=["slug"], chunk_size=10
+    )
+
+    stmt = session.execute.await_args.args[0]
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (slug) DO UPDATE SET price = excluded.price" in sql
+
+
+@pytest.mark.asyncio
+async def test_edit_bulk_binds_key_separately(session):
+    await ReviewsRepository(session).edit_bulk(
+        [{"id": 1, "result": 80}, {"id": 2, "result": 90}], chunk_size=10
+    )
+
+    stmt, params = session.execute.await_args.args
+    assert params == [{"_id": 1, "_result": 80}, {"_id": 2, "_result": 90}]
+    assert "WHERE reviews.id = :_id" in str(stmt)
+
+
+@pytest.mark.asyncio
+async def test_delete_bulk_sums_rowcount(session):
+    deleted = await ReviewsRepository(session).delete_bulk([1, 2, 3, 4], chunk_size=2)
+
+    assert deleted == 4
+    assert session.execute.await_count == 2
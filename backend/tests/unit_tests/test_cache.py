@@ -0,0 +1,73 @@
+import pytest
+from unittest import mock
+from redis.exceptions import RedisError
+
+from src.connectors.redis_connector import RedisManager
+from src.utils.cache import VersionedCache
+
+
+@pytest.fixture
+def redis_manager_mock():
+    manager = mock.AsyncMock(spec=RedisManager)
+    manager.redis = mock.Mock()
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_versioned_cache_get_miss_returns_version(redis_manager_mock):
+    redis_manager_mock.get.side_effect = ["3", None]
+    cache = VersionedCache(redis_manager_mock, namespace="reviews", expire=60)
+
+    version, value = await cache.get("ЕГЭ", "1:5:")
+
+    assert version == "3"
+    assert value is None
+    redis_manager_mock.get.assert_any_call("reviews:ЕГЭ:version")
+    redis_manager_mock.get.assert_any_call("reviews:ЕГЭ:v3:1:5:")
+
+
+@pytest.mark.asyncio
+async def test_versioned_cache_set_uses_read_version(redis_manager_mock):
+    cache = VersionedCache(redis_manager_mock, namespace="reviews", expire=60)
+
+    await cache.set("ОГЭ", "0", "1:5:", "[]")
+
+    redis_manager_mock.set.assert_called_once_with(
+        "reviews:ОГЭ:v0:1:5:", "[]", expire=60
+    )
+
+
+@pytest.mark.asyncio
+async def test_versioned_cache_invalidate_bumps_version(redis_manager_mock):
+    cache = VersionedCache(redis_manager_mock, namespace="reviews", expire=60)
+
+    await cache.invalidate("ЕГЭ")
+
+    redis_manager_mock.incr.assert_called_once_with("reviews:ЕГЭ:version")
+
+
+@pytest.mark.asyncio
+async def test_versioned_cache_redis_error_is_a_miss(redis_manager_mock):
+    redis_manager_mock.get.side_effect = RedisError()
+    cache = VersionedCache(redis_manager_mock, namespace="reviews", expire=60)
+
+    assert await cache.get("ЕГЭ", "1:5:") == (None, None)
+
+
+@pytest.mark.asyncio
+async def test_versioned_cache_seeds_missing_version(redis_manager_mock):
+    redis_manager_mock.get.side_effect = [None, "1760000000000000000"]
+    cache = VersionedCache(redis_manager_mock, namespace="reviews", expire=60)
+
+    assert await cache.version("ЕГЭ") == "1760000000000000000"
+    key, seed = redis_manager_mock.set_if_absent.call_args.args
+    assert key == "reviews:ЕГЭ:version"
+    assert int(seed) > 0
+
+
+@pytest.mark.asyncio
+async def test_versioned_cache_version_without_redis(redis_manager_mock):
+    redis_manager_mock.redis = None
+    cache = VersionedCache(redis_manager_mock, namespace="reviews", expire=60)
+
+    assert await cache.version("ЕГЭ") is None
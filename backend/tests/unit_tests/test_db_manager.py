@@ -0,0 +1,68 @@
+import pytest
+from unittest import mock
+
+from src.utils.db_manager import DBManager
+
+
+@pytest.fixture
+def session_factory():
+    session = mock.AsyncMock()
+    session.in_transaction = mock.Mock(return_value=False)
+    return mock.Mock(return_value=session)
+
+
+@pytest.mark.asyncio
+async def test_db_manager_without_queries_opens_no_session(session_factory):
+    async with DBManager(session_factory=session_factory) as db:
+        await db.commit()
+
+    session_factory.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_db_manager_shares_one_lazy_session(session_factory):
+    async with DBManager(session_factory=session_factory) as db:
+        assert db.users.session is db.reviews.session
+        assert db.users is db.users
+
+    session_factory.assert_called_once()
+    session = session_factory.return_value
+    session.rollback.assert_not_called()
+    session.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_db_manager_rolls_back_open_transaction(session_factory):
+    session = session_factory.return_value
+    session.in_transaction.return_value = True
+
+    async with DBManager(session_factory=session_factory) as db:
+        _ = db.purchases
+
+    session.rollback.assert_awaited_once()
+    session.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_db_manager_primary_is_self_without_replica(session_factory):
+    async with DBManager(session_factory=session_factory) as db:
+        assert db.primary is db
+        assert db.products.catalog_session() is db.session
+
+
+@pytest.mark.asyncio
+async def test_replica_manager_loads_catalog_from_primary(session_factory):
+    primary_session = mock.AsyncMock()
+    primary_session.in_transaction = mock.Mock(return_value=False)
+    primary_factory = mock.Mock(return_value=primary_session)
+
+    async with DBManager(
+        session_factory=session_factory, primary_session_factory=primary_factory
+    ) as db:
+        products = db.products
+        primary_factory.assert_not_called()
+        assert products.catalog_session() is primary_session
+        assert db.reviews.session is session_factory.return_value
+
+    primary_session.close.assert_awaited_once()
+    session_factory.return_value.close.assert_awaited_once()
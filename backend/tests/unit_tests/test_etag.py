@@ -0,0 +1,58 @@
+from unittest import mock
+
+import pytest
+
+from src.utils.etag import apply_etag, etag_matches, make_etag
+
+
+def make_request(if_none_match: str | None = None):
+    request = mock.Mock()
+    request.headers = {"if-none-match": if_none_match} if if_none_match else {}
+    return request
+
+
+def test_make_etag_is_weak_and_stable():
+    etag = make_etag("reviews", "ЕГЭ", "3", 1, None)
+
+    assert etag.startswith('W/"')
+    assert etag == make_etag("reviews", "ЕГЭ", "3", 1, None)
+    assert etag != make_etag("reviews", "ЕГЭ", "4", 1, None)
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, False),
+        ("*", True),
+        ('W/"abc"', True),
+        ('"abc"', True),
+        ('W/"other", W/"abc"', True),
+        ('W/"other"', False),
+    ],
+)
+def test_etag_matches_uses_weak_comparison(header, expected):
+    assert etag_matches(header, 'W/"abc"') is expected
+
+
+def test_apply_etag_returns_304_on_match():
+    response = mock.Mock(headers={})
+
+    not_modified = apply_etag(make_request('W/"abc"'), response, 'W/"abc"')
+
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == 'W/"abc"'
+    assert response.headers == {}
+
+
+def test_apply_etag_sets_headers_on_miss():
+    response = mock.Mock(headers={})
+
+    assert apply_etag(make_request('W/"old"'), response, 'W/"abc"', "private") is None
+    assert response.headers == {"ETag": 'W/"abc"', "Cache-Control": "private"}
+
+
+def test_apply_etag_without_etag():
+    response = mock.Mock(headers={})
+
+    assert apply_etag(make_request("*"), response, None) is None
+    assert response.headers == {}
@@ -0,0 +1,78 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from src.repositories.mappers import base
+from src.repositories.mappers.mappers import (
+    PurchasesMapper,
+    ReviewsIdMapper,
+    UsersMapper,
+)
+
+
+@pytest.fixture
+def strict_mode(monkeypatch):
+    def set_mode(validate: bool):
+        monkeypatch.setattr(
+            base, "settings", SimpleNamespace(DB_MAPPER_VALIDATE=validate)
+        )
+
+    return set_mode
+
+
+def user_row(**overrides):
+    row = dict(
+        id=1,
+        is_super_user=False,
+        name="Иван",
+        surname=None,
+        phone="+79282017042",
+        email="user@example.com",
+        grade=11,
+        hashed_password="hash",
+    )
+    row.update(overrides)
+    return SimpleNamespace(**row)
+
+
+def test_trusted_mapping_matches_validation(strict_mode):
+    row = user_row()
+
+    strict_mode(True)
+    validated = UsersMapper.map_to_domain_entity(row)
+    strict_mode(False)
+    trusted = UsersMapper.map_to_domain_entity(row)
+
+    assert trusted == validated
+    assert trusted.model_dump() == validated.model_dump()
+    assert trusted.model_fields_set == validated.model_fields_set
+
+
+def test_trusted_mapping_skips_field_validation(strict_mode):
+    now = datetime.now(timezone.utc)
+    row = SimpleNamespace(
+        id=1,
+        user_id=2,
+        exam="ЕГЭ",
+        result=-1,  # нарушает ge=0, но строке из своей БД мы доверяем
+        review="ok",
+        created_at=now,
+        edited_at=now,
+    )
+
+    strict_mode(False)
+    review = ReviewsIdMapper.map_to_domain_entity(row)
+
+    assert review.result == -1
+    assert review.created_at is now
+
+
+def test_mapper_columns_follow_schema_fields():
+    user_columns = {column.key for column in UsersMapper.columns()}
+    purchase_columns = {column.key for column in PurchasesMapper.columns()}
+
+    assert "hashed_password" not in user_columns
+    assert {"id", "phone", "email"} <= user_columns
+    assert "raw_webhook_data" not in purchase_columns
+    assert "payment_id" in purchase_columns
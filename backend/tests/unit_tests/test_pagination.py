@@ -0,0 +1,39 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from src.utils.pagination import (
+    encode_cursor,
+    decode_cursor,
+    encode_rank_cursor,
+    decode_rank_cursor,
+)
+
+
+def test_cursor_roundtrip():
+    created_at = datetime(2025, 5, 15, 19, 5, 31, 951935, tzinfo=timezone.utc)
+    cursor = encode_cursor(created_at, 42)
+
+    assert isinstance(cursor, str)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, 42)
+
+
+@pytest.mark.parametrize("cursor", ["", "не курсор", "bm90LWEtY3Vyc29y"])
+def test_decode_cursor_invalid(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_rank_cursor_roundtrip_is_exact():
+    rank = 0.1 + 0.2
+    cursor = encode_rank_cursor(rank, 7)
+
+    assert "=" not in cursor
+    assert decode_rank_cursor(cursor) == (rank, 7)
+
+
+@pytest.mark.parametrize("cursor", ["", "не курсор", "bm90LWEtY3Vyc29y"])
+def test_decode_rank_cursor_invalid(cursor):
+    with pytest.raises(ValueError):
+        decode_rank_cursor(cursor)
@@ -0,0 +1,73 @@
+import asyncio
+import threading
+
+import pytest
+from unittest import mock
+
+from src.exceptions.service_exceptions import AdminNoRightsServiceException
+from src.services import auth as auth_service
+from src.services.auth import AuthService
+from src.utils.password_hasher import PasswordHasher, PasswordHasherOverloadedError
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_runs_in_worker_thread():
+    pwd_context = mock.Mock()
+    pwd_context.hash.side_effect = lambda password: threading.current_thread().name
+    hasher = PasswordHasher(pwd_context, max_workers=1, max_pending=0)
+
+    thread_name = await hasher.hash("Password123!")
+
+    assert thread_name.startswith("password-hasher")
+    assert hasher.stats()["completed"] == 1
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_rejects_when_queue_is_full():
+    release = threading.Event()
+    pwd_context = mock.Mock()
+    pwd_context.verify.side_effect = lambda *args: release.wait(5)
+    hasher = PasswordHasher(pwd_context, max_workers=1, max_pending=1)
+
+    running = [
+        asyncio.create_task(hasher.verify("Password123!", "hash")) for _ in range(2)
+    ]
+    await asyncio.sleep(0)
+    with pytest.raises(PasswordHasherOverloadedError):
+        await hasher.verify("Password123!", "hash")
+
+    release.set()
+    assert await asyncio.gather(*running) == [True, True]
+    assert hasher.stats()["rejected"] == 1
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_counts_failures_separately():
+    pwd_context = mock.Mock()
+    pwd_context.hash.side_effect = [ValueError("bad salt"), "hash"]
+    hasher = PasswordHasher(pwd_context, max_workers=1, max_pending=0)
+
+    with pytest.raises(ValueError):
+        await hasher.hash("Password123!")
+    assert await hasher.hash("Password123!") == "hash"
+
+    stats = hasher.stats()
+    assert stats["completed"] == 1
+    assert stats["failed"] == 1
+    assert stats["in_flight"] == 0
+    hasher.shutdown()
+
+
+def test_password_hasher_stats_are_admin_only(monkeypatch):
+    hasher = PasswordHasher(mock.Mock(), max_workers=2, max_pending=4)
+    monkeypatch.setattr(auth_service, "password_hasher", hasher)
+
+    with pytest.raises(AdminNoRightsServiceException):
+        AuthService().get_password_hasher_stats(is_super=False)
+
+    stats = AuthService().get_password_hasher_stats(is_super=True)
+    assert stats.workers == 2
+    assert stats.failed == 0
+    assert stats.avg_seconds == 0.0
@@ -0,0 +1,99 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from src.schemas.payments import PaymentOutboxTask
+from src.workers import base
+from src.workers.payment_outbox import PaymentOutboxWorker
+
+
+@pytest.fixture
+def outbox_worker(make_worker):
+    def make(response: httpx.Response, max_attempts: int = 3):
+        client = MagicMock()
+        client.create_payment = AsyncMock(return_value=response)
+        return make_worker(PaymentOutboxWorker, client, max_attempts)
+
+    return make
+
+
+def make_task(attempts: int = 1) -> PaymentOutboxTask:
+    return PaymentOutboxTask(id=7, payment_id="pay-1", payload={}, attempts=attempts)
+
+
+@pytest.mark.asyncio
+async def test_worker_stores_confirmation_url(fake_db, outbox_worker):
+    response = httpx.Response(
+        200, json={"confirmation": {"confirmation_url": "https://pay.test/1"}}
+    )
+    worker = outbox_worker(response)
+
+    await worker.process_task(make_task())
+
+    worker.client.create_payment.assert_awaited_once_with({}, idempotence_key="pay-1")
+    db = fake_db.instances[0]
+    db.purchases.set_confirmation_url.assert_awaited_once_with(
+        "pay-1", "https://pay.test/1"
+    )
+    db.payment_outbox.mark_done.assert_awaited_once_with(7)
+    db.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_worker_reschedules_retryable_error(fake_db, outbox_worker):
+    worker = outbox_worker(httpx.Response(503, text="busy"))
+
+    await worker.process_task(make_task(attempts=2))
+
+    db = fake_db.instances[0]
+    db.payment_outbox.mark_failed.assert_awaited_once()
+    assert db.payment_outbox.mark_failed.await_args.kwargs["retry_in"] == 4.0
+    db.purchases.set_status.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_worker_fails_purchase_on_client_error(fake_db, outbox_worker):
+    worker = outbox_worker(httpx.Response(400, text="bad request"))
+
+    await worker.process_task(make_task())
+
+    db = fake_db.instances[0]
+    db.purchases.set_status.assert_awaited_once_with("pay-1", "Failed")
+    assert db.payment_outbox.mark_failed.await_args.kwargs["retry_in"] is None
+
+
+@pytest.mark.asyncio
+async def test_worker_fails_purchase_of_abandoned_last_attempt(
+    fake_db, outbox_worker, monkeypatch
+):
+    # Воркер забрал последнюю попытку и упал: аренда истекла, отчёта нет
+    expired = make_task(attempts=3)
+
+    def make_db(session_factory):
+        db = fake_db(session_factory)
+        db.payment_outbox.fail_expired.return_value = [expired]
+        return db
+
+    monkeypatch.setattr(base, "DBManager", make_db)
+    worker = outbox_worker(httpx.Response(500))
+
+    assert await worker.process_batch() == 0
+
+    db = fake_db.instances[0]
+    db.payment_outbox.fail_expired.assert_awaited_once_with(3)
+    db.purchases.set_status.assert_awaited_once_with("pay-1", "Failed")
+    db.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_worker_claims_without_expired_tasks(fake_db, outbox_worker):
+    worker = outbox_worker(httpx.Response(500))
+
+    await worker.process_batch()
+
+    db = fake_db.instances[0]
+    db.payment_outbox.claim_batch.assert_awaited_once_with(
+        limit=10, lease=60, max_attempts=3
+    )
+    db.purchases.set_status.assert_not_awaited()
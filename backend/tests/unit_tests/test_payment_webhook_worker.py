@@ -0,0 +1,94 @@
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from src.schemas.payments import PaymentWebhookEvent
+from src.workers.payment_webhooks import PaymentWebhookWorker, parse_paid_at
+
+
+@pytest.fixture
+def webhook_worker(make_worker):
+    def make(capture_status: int = 200):
+        client = MagicMock()
+        client.capture_payment = AsyncMock(return_value=httpx.Response(capture_status))
+        return make_worker(PaymentWebhookWorker, client)
+
+    return make
+
+
+def make_event(task_id: int, event: str, **obj) -> PaymentWebhookEvent:
+    payload = {"event": event, "object": {"id": "yk-1", **obj}}
+    return PaymentWebhookEvent(
+        id=task_id,
+        event_key=f"{event}:yk-1",
+        event=event,
+        payment_id="pay-1",
+        payload=payload,
+        attempts=1,
+    )
+
+
+@pytest.mark.asyncio
+async def test_webhook_worker_applies_batch_in_one_transaction(fake_db, webhook_worker):
+    worker = webhook_worker()
+    events = [
+        make_event(1, "payment.waiting_for_capture"),
+        make_event(2, "payment.succeeded", paid_at="2026-10-18T10:00:00.123Z"),
+    ]
+
+    await worker.process_tasks(events)
+
+    worker.client.capture_payment.assert_awaited_once_with(
+        "yk-1", idempotence_key="capture:yk-1"
+    )
+    assert len(fake_db.instances) == 1
+    db = fake_db.instances[0]
+    succeeded = db.purchases.update_from_webhook.await_args_list[1]
+    assert succeeded.kwargs["status"] == "Paid"
+    assert succeeded.kwargs["raw_webhook_data"] == events[1].payload
+    assert db.payment_webhook_events.mark_done.await_count == 2
+    db.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_webhook_worker_retries_failed_capture(fake_db, webhook_worker):
+    worker = webhook_worker(capture_status=503)
+
+    await worker.process_tasks([make_event(1, "payment.waiting_for_capture")])
+
+    db = fake_db.instances[0]
+    db.purchases.update_from_webhook.assert_not_awaited()
+    assert db.payment_webhook_events.mark_failed.await_args.kwargs["retry_in"] == 2.0
+
+
+@pytest.mark.asyncio
+async def test_webhook_worker_fails_only_the_broken_events(fake_db, webhook_worker):
+    worker = webhook_worker()
+    no_object_id = make_event(1, "payment.waiting_for_capture")
+    del no_object_id.payload["object"]["id"]
+    worker.apply = AsyncMock(side_effect=[None, RuntimeError("db error")])
+
+    await worker.process_tasks(
+        [
+            no_object_id,
+            make_event(2, "payment.succeeded"),
+            make_event(3, "payment.canceled"),
+        ]
+    )
+
+    worker.client.capture_payment.assert_not_awaited()
+    db = fake_db.instances[0]
+    db.payment_webhook_events.mark_done.assert_awaited_once_with(2)
+    failed = db.payment_webhook_events.mark_failed.await_args_list
+    assert [call.args[0] for call in failed] == [1, 3]
+    db.commit.assert_awaited_once()
+
+
+def test_parse_paid_at():
+    paid_at = parse_paid_at("2026-10-18T10:00:00.123Z")
+    assert paid_at == datetime(2026, 10, 18, 10, 0, 0, 123000, tzinfo=timezone.utc)
+    assert parse_paid_at("2026-10-18T13:00:00+03:00") == paid_at.replace(microsecond=0)
+    assert parse_paid_at("garbage") is None
+    assert parse_paid_at(None) is None
@@ -0,0 +1,165 @@
+import asyncio
+from unittest import mock
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from src.schemas.products import Product
+from src.utils import products_cache
+from src.utils.products_cache import ProductsCatalogCache
+
+
+def make_product(slug: str, name: str) -> Product:
+    return Product(
+        name=name,
+        price=2000,
+        download_link=f"https://example.com/{slug}",
+        description="Тестовое описание",
+        slug=slug,
+    )
+
+
+def test_products_cache_indexes_by_slug_and_name():
+    cache = ProductsCatalogCache(expire=60)
+    assert cache.is_expired()
+
+    cache.replace([make_product("oge", "ОГЭ"), make_product("ege", "ЕГЭ")])
+
+    assert not cache.is_expired()
+    assert cache.get("slug", "oge").name == "ОГЭ"
+    assert cache.get("name", "ЕГЭ").slug == "ege"
+    assert cache.get("slug", "missing") is None
+
+
+def test_products_cache_skips_ambiguous_names():
+    cache = ProductsCatalogCache(expire=60)
+    cache.replace([make_product("ege", "ЕГЭ"), make_product("ege-2", "ЕГЭ")])
+
+    assert cache.get("name", "ЕГЭ") is None
+    assert cache.get("slug", "ege-2").slug == "ege-2"
+
+
+def test_products_cache_invalidate():
+    cache = ProductsCatalogCache(expire=60)
+    cache.replace([make_product("oge", "ОГЭ")])
+
+    cache.invalidate()
+
+    assert cache.is_expired()
+    assert cache.get("slug", "oge") is None
+
+
+def test_products_cache_version_follows_content():
+    cache = ProductsCatalogCache(expire=60)
+    cache.replace([make_product("oge", "ОГЭ"), make_product("ege", "ЕГЭ")])
+    version = cache.version
+
+    cache.replace([make_product("ege", "ЕГЭ"), make_product("oge", "ОГЭ")])
+    assert cache.version == version
+
+    cache.replace([make_product("oge", "ОГЭ 2026"), make_product("ege", "ЕГЭ")])
+    assert cache.version != version
+
+    assert sorted(p.slug for p in cache.all()) == ["ege", "oge"]
+
+    cache.invalidate()
+    assert cache.version is None
+    assert cache.all() == []
+
+
+class FakePubSub:
+    def __init__(self, messages, error=None):
+        self.messages = messages
+        self.error = error
+        self.closed = False
+
+    async def listen(self):
+        for message in self.messages:
+            yield message
+        if self.error is not None:
+            raise self.error
+
+    async def aclose(self):
+        self.closed = True
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(products_cache.asyncio, "sleep", fake_sleep)
+    return delays
+
+
+@pytest.mark.asyncio
+async def test_listener_backs_off_while_redis_is_down(sleeps):
+    manager = mock.Mock()
+    manager.subscribe = mock.AsyncMock(
+        side_effect=[ConnectionError()] * 6 + [asyncio.CancelledError()]
+    )
+
+    with pytest.raises(asyncio.CancelledError):
+        await ProductsCatalogCache(expire=60).listen_for_invalidation(manager)
+
+    assert sleeps == [1, 2, 4, 8, 16, 30]
+
+
+@pytest.mark.asyncio
+async def test_listener_resubscribes_after_lost_connection(sleeps):
+    lost = FakePubSub([{"type": "subscribe"}], error=ConnectionError())
+    restored = FakePubSub([{"type": "subscribe"}])
+    manager = mock.Mock()
+    manager.subscribe = mock.AsyncMock(
+        side_effect=[ConnectionError(), lost, restored, asyncio.CancelledError()]
+    )
+
+    with pytest.raises(asyncio.CancelledError):
+        await ProductsCatalogCache(expire=60).listen_for_invalidation(manager)
+
+    assert lost.closed and restored.closed
+    # Задержка сбрасывается после успешной подписки
+    assert sleeps == [1, 1, 1]
+
+
+@pytest.mark.asyncio
+async def test_listener_invalidates_cache_after_subscribing(sleeps):
+    # Сообщения, отправленные до подписки, потеряны, поэтому кэш сбрасывается
+    cache = ProductsCatalogCache(expire=60)
+    cache.replace([make_product("ege", "ЕГЭ")])
+    manager = mock.Mock()
+    manager.subscribe = mock.AsyncMock(
+        side_effect=[FakePubSub([{"type": "subscribe"}]), asyncio.CancelledError()]
+    )
+
+    with pytest.raises(asyncio.CancelledError):
+        await cache.listen_for_invalidation(manager)
+
+    assert cache.is_expired()
+
+
+@pytest.mark.asyncio
+async def test_listener_invalidates_cache_on_message(sleeps):
+    cache = ProductsCatalogCache(expire=60)
+
+    class LoadedPubSub(FakePubSub):
+        async def listen(self):
+            # Каталог загружен уже после подписки, сбросить его должно сообщение
+            cache.replace([make_product("ege", "ЕГЭ")])
+            async for message in super().listen():
+                yield message
+
+    manager = mock.Mock()
+    manager.subscribe = mock.AsyncMock(
+        side_effect=[
+            LoadedPubSub([{"type": "message", "data": "1"}]),
+            asyncio.CancelledError(),
+        ]
+    )
+
+    with pytest.raises(asyncio.CancelledError):
+        await cache.listen_for_invalidation(manager)
+
+    assert cache.is_expired()
@@ -0,0 +1,85 @@
+from unittest import mock
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from redis.exceptions import RedisError
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from src.middlewares.rate_limit import RateLimitMiddleware
+from src.utils.rate_limit import (
+    LocalTokenBucket,
+    RateLimit,
+    RateLimiter,
+    RateLimitRule,
+)
+
+
+def test_local_bucket_allows_burst_then_blocks():
+    bucket = LocalTokenBucket()
+    limit = RateLimit(capacity=2, period=60)
+
+    results = [bucket.hit("k", limit) for _ in range(3)]
+
+    assert [r.allowed for r in results] == [True, True, False]
+    assert results[1].remaining == 0
+    assert 0 < results[2].retry_after <= 30
+
+
+def test_rule_matches_path_template():
+    rule = RateLimitRule("GET", "/reviews/{exam_type}", RateLimit(1, 1))
+
+    assert rule.matches("GET", "/reviews/ege")
+    assert not rule.matches("POST", "/reviews/ege")
+    assert not rule.matches("GET", "/reviews/ege/stats")
+
+
+def test_rule_path_converter_matches_nested_paths():
+    rule = RateLimitRule("GET", "/assets/{path:path}", None)
+
+    assert rule.matches("GET", "/assets/img/avatar.3f2a9c1d.jpg")
+    assert not rule.matches("GET", "/reviews/ege")
+
+
+@pytest.mark.asyncio
+async def test_limiter_falls_back_to_local_bucket_on_redis_error():
+    redis_manager = mock.Mock()
+    redis_manager.token_bucket = mock.AsyncMock(side_effect=RedisError("down"))
+    limiter = RateLimiter(redis_manager)
+
+    result = await limiter.hit("k", RateLimit(1, 60))
+
+    assert result.allowed
+    assert not (await limiter.hit("k", RateLimit(1, 60))).allowed
+
+
+@pytest.mark.asyncio
+async def test_middleware_sets_headers_and_returns_429():
+    async def ok(request):
+        return PlainTextResponse("ok")
+
+    app = Starlette(routes=[Route("/limited", ok), Route("/free", ok)])
+    limiter = RateLimiter(mock.Mock(redis=None))
+    app.add_middleware(
+        RateLimitMiddleware,
+        limiter=limiter,
+        rules=[
+            RateLimitRule("GET", "/limited", RateLimit(1, 60)),
+            RateLimitRule(None, "/free", None),
+        ],
+    )
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        first = await client.get("/limited")
+        second = await client.get("/limited")
+        free = await client.get("/free")
+
+    assert first.status_code == 200
+    assert first.headers["X-RateLimit-Remaining"] == "0"
+    assert second.status_code == 429
+    assert int(second.headers["Retry-After"]) >= 1
+    assert free.status_code == 200
+    assert "X-RateLimit-Limit" not in free.headers
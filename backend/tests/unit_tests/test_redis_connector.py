@@ -0,0 +1,94 @@
+from unittest import mock
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from src.connectors.redis_connector import RedisManager
+
+
+class FakePipeline:
+    def __init__(self):
+        self.commands = []
+        self.executed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    def set(self, key, value, ex=None):
+        self.commands.append(("set", key, value, ex))
+
+    async def execute(self):
+        self.executed = True
+
+
+@pytest.fixture
+def manager():
+    manager = RedisManager(host="localhost", port=6379)
+    manager.redis = mock.AsyncMock()
+    manager.redis.pipeline = mock.Mock(return_value=FakePipeline())
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_mset_with_expire_uses_one_pipeline(manager):
+    await manager.mset({"a": "1", "b": "2"}, expire=60)
+
+    pipe = manager.redis.pipeline.return_value
+    assert pipe.executed
+    assert pipe.commands == [("set", "a", "1", 60), ("set", "b", "2", 60)]
+    manager.redis.mset.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_is_not_executed_on_error(manager):
+    with pytest.raises(RuntimeError):
+        async with manager.pipeline() as pipe:
+            pipe.set("a", "1")
+            raise RuntimeError
+
+    assert not manager.redis.pipeline.return_value.executed
+
+
+@pytest.mark.asyncio
+async def test_multi_key_helpers_skip_empty_input(manager):
+    assert await manager.mget() == []
+    await manager.mset({})
+    await manager.delete_many()
+
+    manager.redis.mget.assert_not_awaited()
+    manager.redis.delete.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_pubsub_uses_client_without_socket_timeout(monkeypatch):
+    created = []
+
+    def fake_redis(**kwargs):
+        client = mock.MagicMock()
+        client.ping = mock.AsyncMock()
+        client.pubsub = mock.Mock(return_value=mock.AsyncMock())
+        created.append((kwargs, client))
+        return client
+
+    monkeypatch.setattr("src.connectors.redis_connector.redis.Redis", fake_redis)
+    manager = RedisManager(host="localhost", port=6379, socket_timeout=0.5)
+
+    await manager.connect()
+    await manager.subscribe("channel")
+
+    (pool_kwargs, pool_client), (pubsub_kwargs, pubsub_client) = created
+    assert pool_kwargs["connection_pool"].connection_kwargs["socket_timeout"] == 0.5
+    assert pubsub_kwargs["socket_timeout"] is None
+    pubsub_client.pubsub.assert_called_once()
+    pool_client.pubsub.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_subscribe_without_connection_raises_redis_error():
+    manager = RedisManager(host="localhost", port=6379)
+
+    with pytest.raises(ConnectionError):
+        await manager.subscribe("channel")
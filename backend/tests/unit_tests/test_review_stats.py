@@ -0,0 +1,151 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+from src.exceptions.db_exceptions import ReviewNotFoundException
+from src.exceptions.service_exceptions import (
+    ReviewNoRightsServiceException,
+    ReviewNotFoundServiceException,
+)
+from src.repositories.review_stats import ReviewStatsRepository
+from src.schemas.reviews import ReviewAddRequest, ReviewPatch, ReviewWithId
+from src.services import reviews as reviews_service
+from src.services.reviews import ReviewsService
+
+
+@pytest.mark.asyncio
+async def test_review_stats_are_computed_from_distribution():
+    session = mock.AsyncMock()
+    session.execute.return_value = mock.Mock(
+        all=mock.Mock(
+            return_value=[
+                SimpleNamespace(result=4, count=3),
+                SimpleNamespace(result=5, count=1),
+            ]
+        )
+    )
+
+    stats = await ReviewStatsRepository(session).get("ОГЭ")
+
+    assert stats.count == 4
+    assert stats.average == 4.25
+    assert stats.distribution == {4: 3, 5: 1}
+
+
+@pytest.mark.asyncio
+async def test_review_stats_without_reviews():
+    session = mock.AsyncMock()
+    session.execute.return_value = mock.Mock(all=mock.Mock(return_value=[]))
+
+    stats = await ReviewStatsRepository(session).get("ЕГЭ")
+
+    assert stats.count == 0
+    assert stats.average is None
+    assert stats.distribution == {}
+
+
+@pytest.fixture
+def reviews_cache(monkeypatch):
+    cache = mock.AsyncMock()
+    monkeypatch.setattr(reviews_service, "reviews_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def db():
+    return mock.AsyncMock()
+
+
+def make_review(user_id: int = 1) -> ReviewWithId:
+    now = datetime.now(timezone.utc)
+    return ReviewWithId(
+        id=10,
+        user_id=user_id,
+        exam="ЕГЭ",
+        result=90,
+        review="text",
+        created_at=now,
+        edited_at=now,
+    )
+
+
+@pytest.mark.asyncio
+async def test_create_review_increments_stats(db, reviews_cache):
+    db.reviews.get_one_or_none.return_value = None
+
+    await ReviewsService().create_review(
+        db, 1, ReviewAddRequest(exam="ЕГЭ", result=90, review="text")
+    )
+
+    db.review_stats.adjust.assert_awaited_once_with("ЕГЭ", 90, 1)
+    db.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_edit_review_without_result_change_keeps_stats(db, reviews_cache):
+    db.reviews.edit.return_value = (make_review(), 90)
+
+    await ReviewsService().edit_review(db, 1, 10, ReviewPatch(review="new"))
+
+    db.review_stats.adjust.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_delete_review_decrements_deleted_row(db, reviews_cache):
+    db.reviews.delete.return_value = make_review()
+
+    await ReviewsService().delete_review(db, 1, 10)
+
+    db.reviews.delete.assert_awaited_once_with(id=10, user_id=1)
+    db.review_stats.adjust.assert_awaited_once_with("ЕГЭ", 90, -1)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_delete_does_not_decrement(db, reviews_cache):
+    # Строку уже удалил параллельный запрос: DELETE ничего не вернул
+    db.reviews.delete.return_value = None
+    db.reviews.get_one_with_id.side_effect = ReviewNotFoundException
+
+    with pytest.raises(ReviewNotFoundServiceException):
+        await ReviewsService().delete_review(db, 1, 10)
+
+    db.review_stats.adjust.assert_not_awaited()
+    db.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_delete_review_of_another_user(db, reviews_cache):
+    db.reviews.delete.return_value = None
+    db.reviews.get_one_with_id.return_value = make_review(user_id=2)
+
+    with pytest.raises(ReviewNoRightsServiceException):
+        await ReviewsService().delete_review(db, 1, 10)
+
+    db.review_stats.adjust.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_admin_delete_adjusts_only_when_row_deleted(db, reviews_cache):
+    db.reviews.delete.return_value = None
+
+    with pytest.raises(ReviewNotFoundServiceException):
+        await ReviewsService().admin_delete_review(db, True, 10)
+    db.review_stats.adjust.assert_not_awaited()
+
+    db.reviews.delete.return_value = make_review()
+    await ReviewsService().admin_delete_review(db, True, 10)
+    db.review_stats.adjust.assert_awaited_once_with("ЕГЭ", 90, -1)
+
+
+@pytest.mark.asyncio
+async def test_reconcile_locks_reviews_before_snapshot():
+    session = mock.AsyncMock()
+    session.execute.return_value = mock.Mock(scalar=mock.Mock(return_value=True))
+
+    assert await ReviewStatsRepository(session).reconcile()
+
+    statements = [str(c.args[0]) for c in session.execute.await_args_list]
+    assert statements[1] == "LOCK TABLE reviews IN SHARE MODE"
+    assert statements[2].startswith("INSERT INTO review_score_counts")
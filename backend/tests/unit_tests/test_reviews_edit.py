@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+import pytest
+
+from src.exceptions.db_exceptions import ReviewNotFoundException
+from src.exceptions.service_exceptions import (
+    ReviewEditConflictServiceException,
+    ReviewNoRightsServiceException,
+)
+from src.schemas.reviews import ReviewPatch, ReviewWithId
+from src.services import reviews as reviews_service
+from src.services.reviews import ReviewsService
+
+
+def make_review(user_id: int = 1, edited_ago: timedelta = timedelta(hours=2)):
+    now = datetime.now(timezone.utc)
+    return ReviewWithId(
+        id=10,
+        user_id=user_id,
+        exam="ЕГЭ",
+        result=90,
+        review="text",
+        created_at=now - edited_ago,
+        edited_at=now - edited_ago,
+    )
+
+
+@pytest.fixture(autouse=True)
+def reviews_cache(monkeypatch):
+    cache = mock.AsyncMock()
+    monkeypatch.setattr(reviews_service, "reviews_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def db():
+    return mock.AsyncMock()
+
+
+@pytest.mark.asyncio
+async def test_edit_review_is_a_single_update(db, reviews_cache):
+    db.reviews.edit.return_value = (make_review(), 80)
+
+    await ReviewsService().edit_review(db, 1, 10, ReviewPatch(review="new"))
+
+    db.reviews.get_one_with_id.assert_not_awaited()
+    assert db.reviews.edit.await_args.kwargs["user_id"] == 1
+    db.commit.assert_awaited_once()
+    reviews_cache.invalidate.assert_awaited_once_with("ЕГЭ")
+    assert [c.args for c in db.review_stats.adjust.await_args_list] == [
+        ("ЕГЭ", 80, -1),
+        ("ЕГЭ", 90, 1),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_edit_review_of_another_user(db):
+    db.reviews.edit.side_effect = ReviewNotFoundException
+    db.reviews.get_one_with_id.return_value = make_review(user_id=2)
+
+    with pytest.raises(ReviewNoRightsServiceException):
+        await ReviewsService().edit_review(db, 1, 10, ReviewPatch(review="new"))
+    db.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_edit_review_too_soon(db):
+    db.reviews.edit.side_effect = ReviewNotFoundException
+    db.reviews.get_one_with_id.return_value = make_review(
+        edited_ago=timedelta(minutes=10)
+    )
+
+    with pytest.raises(ReviewEditConflictServiceException):
+        await ReviewsService().edit_review(db, 1, 10, ReviewPatch(review="new"))
@@ -0,0 +1,71 @@
+from unittest import mock
+
+import pytest
+
+from src.dependencies.auth import PaginationParams
+from src.services import reviews as reviews_service
+from src.services.reviews import ReviewsService
+
+
+@pytest.fixture
+def reviews_cache(monkeypatch):
+    cache = mock.AsyncMock()
+    monkeypatch.setattr(reviews_service, "reviews_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def db():
+    db = mock.AsyncMock()
+    db.reviews.get_all_filtered.return_value = []
+    db.primary.reviews.get_all_filtered.return_value = []
+    return db
+
+
+@pytest.mark.asyncio
+async def test_cache_miss_is_filled_from_primary(reviews_cache, db):
+    reviews_cache.get.return_value = ("5", None)
+
+    await ReviewsService().get_reviews("ege", db, PaginationParams(page=1))
+
+    db.primary.reviews.get_all_filtered.assert_awaited_once()
+    db.reviews.get_all_filtered.assert_not_awaited()
+    reviews_cache.set.assert_awaited_once()
+    assert reviews_cache.set.await_args.args[:2] == ("ЕГЭ", "5")
+
+
+@pytest.mark.asyncio
+async def test_miss_after_issued_etag_reads_primary(reviews_cache, db):
+    # ETag выдан по версии, прочитанной до сбоя Redis
+    reviews_cache.get.return_value = (None, None)
+
+    await ReviewsService().get_reviews(
+        "ege", db, PaginationParams(page=1), etag_issued=True
+    )
+
+    db.primary.reviews.get_all_filtered.assert_awaited_once()
+    db.reviews.get_all_filtered.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_without_redis_and_etag_reads_replica(reviews_cache, db):
+    reviews_cache.get.return_value = (None, None)
+
+    await ReviewsService().get_reviews(
+        "ege", db, PaginationParams(page=1), etag_issued=False
+    )
+
+    db.reviews.get_all_filtered.assert_awaited_once()
+    db.primary.reviews.get_all_filtered.assert_not_awaited()
+    reviews_cache.set.assert_awaited_once()
+    assert reviews_cache.set.await_args.args[1] is None
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_skips_database(reviews_cache, db):
+    reviews_cache.get.return_value = ("5", "[]")
+
+    assert await ReviewsService().get_reviews("ege", db, PaginationParams(page=1)) == []
+
+    db.primary.reviews.get_all_filtered.assert_not_awaited()
+    db.reviews.get_all_filtered.assert_not_awaited()
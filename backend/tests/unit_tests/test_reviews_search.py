@@ -0,0 +1,77 @@
+from datetime import datetime, timezone
+from unittest import mock
+
+import pytest
+
+from src.dependencies.auth import PaginationParams
+from src.exceptions.service_exceptions import (
+    AdminNoRightsServiceException,
+    ReviewCursorInvalidServiceException,
+)
+from src.schemas.reviews import ReviewWithId
+from src.services.reviews import ReviewsService
+from src.utils.pagination import decode_rank_cursor, encode_rank_cursor
+
+
+def make_review(review_id: int) -> ReviewWithId:
+    now = datetime.now(timezone.utc)
+    return ReviewWithId(
+        id=review_id,
+        user_id=1,
+        exam="ЕГЭ",
+        result=90,
+        review="отличный учитель",
+        created_at=now,
+        edited_at=now,
+    )
+
+
+@pytest.fixture
+def db():
+    return mock.AsyncMock()
+
+
+@pytest.mark.asyncio
+async def test_full_page_returns_rank_cursor(db):
+    db.reviews.search.return_value = [(make_review(5), 0.5), (make_review(3), 0.25)]
+
+    reviews, next_cursor = await ReviewsService().search_reviews(
+        "учитель", db, PaginationParams(page=1, per_page=2), exam_from_api="ege"
+    )
+
+    assert [review.id for review in reviews] == [5, 3]
+    assert decode_rank_cursor(next_cursor) == (0.25, 3)
+    db.reviews.search.assert_awaited_once_with("учитель", 2, None, exam="ЕГЭ")
+
+
+@pytest.mark.asyncio
+async def test_cursor_is_passed_as_keyset(db):
+    db.reviews.search.return_value = [(make_review(2), 0.1)]
+
+    reviews, next_cursor = await ReviewsService().search_reviews(
+        "учитель",
+        db,
+        PaginationParams(page=1, per_page=2),
+        cursor=encode_rank_cursor(0.25, 3),
+    )
+
+    assert next_cursor is None
+    db.reviews.search.assert_awaited_once_with("учитель", 2, (0.25, 3))
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor(db):
+    with pytest.raises(ReviewCursorInvalidServiceException):
+        await ReviewsService().search_reviews(
+            "учитель", db, PaginationParams(page=1, per_page=2), cursor="не курсор"
+        )
+    db.reviews.search.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_admin_search_requires_super(db):
+    with pytest.raises(AdminNoRightsServiceException):
+        await ReviewsService().admin_search_reviews(
+            "учитель", False, db, PaginationParams(page=1, per_page=2)
+        )
+    db.reviews.search.assert_not_awaited()
@@ -0,0 +1,116 @@
+import gzip
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.routing import Mount
+
+from src.utils.static_build import build
+from src.utils.static_files import PrecompressedStaticFiles, accepted_encodings
+
+CSS = "body { background: url('../img/logo.png'); }\n" * 20
+
+
+@pytest.fixture
+def dist(tmp_path):
+    source = tmp_path / "frontend"
+    (source / "assets" / "css").mkdir(parents=True)
+    (source / "assets" / "img").mkdir()
+    (source / "pages").mkdir()
+    (source / "assets" / "img" / "logo.png").write_bytes(b"\x89PNG" + bytes(512))
+    (source / "assets" / "css" / "style.css").write_text(CSS, encoding="utf-8")
+    (source / "pages" / "page.html").write_text(
+        '<link rel="stylesheet" href="../assets/css/style.css">'
+        '<img src="https://example.com/x.png">',
+        encoding="utf-8",
+    )
+    (source / "index.html").write_text("<p>главная</p>", encoding="utf-8")
+    (source / "README.md").write_text("не раздаётся", encoding="utf-8")
+    manifest = build(source, tmp_path / "dist")
+    return tmp_path / "dist", manifest
+
+
+def hashed_path(manifest, prefix):
+    return next(
+        path
+        for path, entry in manifest.items()
+        if path.startswith(prefix) and entry["immutable"]
+    )
+
+
+def test_build_fingerprints_and_rewrites_references(dist):
+    dist_dir, manifest = dist
+    logo = hashed_path(manifest, "assets/img/logo.")
+    css = hashed_path(manifest, "assets/css/style.")
+
+    assert "README.md" not in manifest
+    assert not manifest["pages/page.html"]["immutable"]
+    assert manifest["assets/css/style.css"]["etag"] == manifest[css]["etag"]
+    assert logo.rsplit("/", 1)[-1] in (dist_dir / css).read_text(encoding="utf-8")
+    page = (dist_dir / "pages/page.html").read_text(encoding="utf-8")
+    assert f'href="../{css}"' in page
+    assert 'src="https://example.com/x.png"' in page
+    # Картинки уже сжаты, текст сжимается заранее
+    assert manifest[logo]["encodings"] == []
+    assert "gzip" in manifest[css]["encodings"]
+    compressed = (dist_dir / f"{css}.gz").read_bytes()
+    assert gzip.decompress(compressed) == (dist_dir / css).read_bytes()
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("gzip, br", {"gzip", "br"}),
+        ("br;q=0, gzip;q=0.5", {"gzip"}),
+        ("identity", {"identity"}),
+    ],
+)
+def test_accepted_encodings(header, expected):
+    assert accepted_encodings(header) == expected
+
+
+@pytest.mark.asyncio
+async def test_serves_precompressed_immutable_files(dist):
+    dist_dir, manifest = dist
+    css = hashed_path(manifest, "assets/css/style.")
+    # Ссылки в CSS переписаны на имена с хешем в обеих копиях
+    built_css = (dist_dir / css).read_text(encoding="utf-8")
+    assert (dist_dir / "assets/css/style.css").read_text(encoding="utf-8") == built_css
+    app = Starlette(routes=[Mount("/", PrecompressedStaticFiles(directory=dist_dir))])
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        response = await client.get(f"/{css}", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["cache-control"].endswith("immutable")
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.text == built_css
+        etag = response.headers["etag"]
+        assert etag == f'"{manifest[css]["etag"]}-gzip"'
+
+        response = await client.get(
+            f"/{css}", headers={"Accept-Encoding": "gzip", "If-None-Match": etag}
+        )
+        assert response.status_code == 304
+
+        # brotli - зависимость проекта, поэтому вариант .br есть и выбирается первым
+        response = await client.get(f"/{css}", headers={"Accept-Encoding": "gzip, br"})
+        assert response.headers["content-encoding"] == "br"
+        assert response.text == built_css
+
+        response = await client.get(
+            "/assets/css/style.css",
+            headers={"Accept-Encoding": "identity", "Range": "bytes=0-3"},
+        )
+        assert response.status_code == 206
+        assert response.content == built_css.encode()[:4]
+        assert response.headers["cache-control"] == "no-cache"
+
+        response = await client.get("/")
+        assert response.status_code == 200
+        assert "главная" in response.text
+
+        response = await client.get("/README.md")
+        assert response.status_code == 404
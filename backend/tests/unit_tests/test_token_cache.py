@@ -0,0 +1,35 @@
+import time
+
+from src.utils.token_cache import TokenPayloadCache
+
+
+def test_token_cache_hit_returns_copy():
+    cache = TokenPayloadCache(maxsize=10)
+    payload = {"id": 1, "is_super_user": False, "exp": time.time() + 60}
+    cache.set("access", "token", payload)
+
+    cached = cache.get("access", "token")
+    cached["id"] = 2
+
+    assert cache.get("access", "token") == payload
+    assert cache.get("refresh", "token") is None
+
+
+def test_token_cache_evicts_expired_tokens():
+    cache = TokenPayloadCache(maxsize=10)
+    cache.set("access", "token", {"id": 1, "exp": time.time() - 1})
+
+    assert cache.get("access", "token") is None
+
+
+def test_token_cache_is_bounded_lru():
+    cache = TokenPayloadCache(maxsize=2)
+    exp = time.time() + 60
+    cache.set("access", "a", {"id": 1, "exp": exp})
+    cache.set("access", "b", {"id": 2, "exp": exp})
+    cache.get("access", "a")
+    cache.set("access", "c", {"id": 3, "exp": exp})
+
+    assert cache.get("access", "a") is not None
+    assert cache.get("access", "b") is None
+    assert cache.get("access", "c") is not None
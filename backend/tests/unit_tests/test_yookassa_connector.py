@@ -0,0 +1,66 @@
+import httpx
+import pytest
+
+from src.connectors.yookassa_connector import YooKassaClient
+
+
+def make_client(handler, retries: int = 2) -> YooKassaClient:
+    return YooKassaClient(
+        base_url="https://yookassa.test/v3/payments",
+        shop_id="shop",
+        secret_key="secret",
+        timeout=1.0,
+        connect_timeout=1.0,
+        max_connections=1,
+        max_keepalive_connections=1,
+        retries=retries,
+        retry_backoff=0,
+        transport=httpx.MockTransport(handler),
+    )
+
+
+@pytest.mark.asyncio
+async def test_yookassa_client_reuses_one_client_and_sends_idempotence_key():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200, json={"id": "p1"})
+
+    client = make_client(handler)
+    await client.connect()
+    http_client = client.client
+
+    await client.create_payment({"amount": {}}, idempotence_key="key-1")
+    await client.capture_payment("p1", idempotence_key="key-2")
+
+    assert client.client is http_client
+    assert [r.headers["Idempotence-Key"] for r in seen] == ["key-1", "key-2"]
+    assert seen[1].url.path == "/v3/payments/p1/capture"
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_yookassa_client_retries_server_errors():
+    statuses = iter([503, 500, 201])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(next(statuses))
+
+    client = make_client(handler, retries=2)
+    response = await client.create_payment({}, idempotence_key="key")
+
+    assert response.status_code == 201
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_yookassa_client_returns_last_response_when_retries_exhausted():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(502)
+
+    client = make_client(handler, retries=1)
+    response = await client.create_payment({}, idempotence_key="key")
+
+    assert response.status_code == 502
+    await client.close()
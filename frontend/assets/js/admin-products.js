@@ -110,11 +110,10 @@ async function loadProducts() {
     }
 
     try {
+        // Без Content-Type GET не требует preflight; ETag проверяет сам браузер
         const response = await fetch('http://localhost:7777/admin/products', {
             credentials: 'include',
-            headers: {
-                'Content-Type': 'application/json'
-            }
+            cache: 'no-cache'
         });
 
         if (!response.ok) {
@@ -4,10 +4,11 @@ document.addEventListener('DOMContentLoaded', async function() {
 
     async function loadMainPageReviews() {
         try {
-            // Загружаем по одному отзыву каждого типа
+            // Загружаем по одному отзыву каждого типа.
+            // cache: 'no-cache' - браузер переспрашивает сервер по ETag и при 304 берёт ответ из кэша
             const [ogeResponse, egeResponse] = await Promise.all([
-                fetch('http://localhost:7777/reviews/oge?page=1&per_page=1', {credentials: 'include'}),
-                fetch('http://localhost:7777/reviews/ege?page=1&per_page=1', {credentials: 'include'})
+                fetch('http://localhost:7777/reviews/oge?page=1&per_page=1', {credentials: 'include', cache: 'no-cache'}),
+                fetch('http://localhost:7777/reviews/ege?page=1&per_page=1', {credentials: 'include', cache: 'no-cache'})
             ]);
 
             // Проверяем на случай, если оба вернули 404
@@ -3,6 +3,27 @@ function clearPlaceholder(input) {
     input.placeholder = '';
 }
 
+async function waitForPaymentUrl(paymentId, attempts = 6) {
+    for (let i = 0; i < attempts; i++) {
+        const response = await fetch(`http://localhost:7777/payments/${paymentId}/status?wait=10`, {
+            credentials: 'include',
+            headers: { 'Accept': 'application/json' }
+        });
+        const data = await response.json();
+
+        if (!response.ok) {
+            throw new Error(data.detail || `Ошибка сервера: ${response.status}`);
+        }
+        if (data.payment_url) {
+            return data.payment_url;
+        }
+        if (data.status === 'Failed') {
+            throw new Error('Не удалось создать платеж, попробуйте ещё раз');
+        }
+    }
+    throw new Error('Не удалось получить ссылку для оплаты');
+}
+
 async function handlePayment(product_slug) {
     // Находим кнопку по product_slug
     const paymentButton = document.querySelector(`.payment-button[data-product-slug="${product_slug}"]`);
@@ -81,12 +102,11 @@ async function handlePayment(product_slug) {
             }
         }
 
-        if (!data?.payment_url) {
-            throw new Error('Не удалось получить ссылку для оплаты');
-        }
+        // Ссылку на оплату создаёт фоновый воркер, дожидаемся её
+        const paymentUrl = data?.payment_url || await waitForPaymentUrl(data.payment_id);
 
         // Открытие платежной страницы
-        window.location.href = data.payment_url;
+        window.location.href = paymentUrl;
 
     } catch (error) {
         console.error('Ошибка платежа:', error);
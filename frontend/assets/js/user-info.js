@@ -91,11 +91,10 @@ async function saveUserInfo(data) {
 // Функция для загрузки информации о пользователе
 async function loadUserInfo() {
     try {
+        // Без Content-Type GET не требует preflight; ETag проверяет сам браузер
         const response = await fetch('http://localhost:7777/me/info', {
             credentials: 'include',
-            headers: {
-                'Content-Type': 'application/json'
-            }
+            cache: 'no-cache'
         });
 
         if (!response.ok) {
@@ -72,11 +72,10 @@ async function loadPurchases() {
     }
 
     try {
+        // Без Content-Type GET не требует preflight; ETag проверяет сам браузер
         const response = await fetch('http://localhost:7777/me/purchases', {
             credentials: 'include',
-            headers: {
-                'Content-Type': 'application/json'
-            }
+            cache: 'no-cache'
         });
 
         if (!response.ok) {